@@ -1,6 +1,18 @@
-from datetime import datetime
-
-from flask import Flask, jsonify, redirect, render_template, request, url_for
+import csv
+import io
+import os
+import time
+
+import click
+from flask import (
+    Flask,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
 from flask_login import (
     LoginManager,
     current_user,
@@ -12,18 +24,68 @@ from flask_migrate import Migrate
 from waitress import serve
 
 from utils.auth import authenticate_user, register_user
+from utils.compression import CompressionMiddleware
 from utils.env_variables import EnvVariable
+from utils.export import EXPORT_FORMATS, csv_chunks, iter_batches, ndjson_chunks
 from utils.helpers import (
+    CACHE_TTLS,
+    RATING_PLATFORMS,
     fetch_imdb_genres,
     fetch_imdb_rating,
+    fetch_ratings_parallel,
     fetch_rt_rating,
     fetch_tmdb_rating,
+    genres_cache_entry,
+    get_lookup_stats,
+    iter_search_movies,
+    rating_cache_entry,
     search_movies_parallel,
 )
-from utils.models import Movie, User, WatchlistEntry, db
+from utils.imdb_import import (
+    InvalidImport,
+    import_imdb_csv,
+    start_import_completion,
+)
+from utils.json_provider import FastJSONProvider, dumps
+from utils.models import User, db
 from utils.objects import Response
+from utils.ratings_refresh import create_refresher
+from utils.ratings_store import (
+    get_stored_genres,
+    get_stored_rating,
+    get_stored_ratings,
+    storable_ratings,
+    store_genres,
+    store_ratings,
+)
+from utils.sessions import PublicResponseSessionInterface
+from utils.watchlist import (
+    RELEVANCE_SORT,
+    InvalidCursor,
+    InvalidFields,
+    apply_cursor,
+    apply_sort,
+    build_watchlist_query,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    listing_columns,
+    normalize_sort,
+    parse_fields,
+    watchlist_genres,
+    watchlist_ids,
+    with_window_total,
+)
+from utils.watchlist_store import (
+    ALREADY_LISTED,
+    add_movie_to_watchlist,
+    add_movies_to_watchlist,
+    remove_movie_from_watchlist,
+)
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+app.session_interface = PublicResponseSessionInterface()
 app.config["SECRET_KEY"] = EnvVariable.SECRET_KEY.value
 app.config["SQLALCHEMY_DATABASE_URI"] = EnvVariable.DATABASE_URL.value
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
@@ -31,6 +93,24 @@ app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 db.init_app(app)
 migrate = Migrate(app, db)
 
+# gzip/brotli for JSON, HTML and CSV responses; waitress sends bodies as they are
+if EnvVariable.COMPRESSION_ENABLED.value:
+    app.wsgi_app = CompressionMiddleware(
+        app.wsgi_app,
+        min_size=EnvVariable.COMPRESSION_MIN_SIZE.value,
+        gzip_level=EnvVariable.COMPRESSION_GZIP_LEVEL.value,
+        brotli_quality=EnvVariable.COMPRESSION_BROTLI_QUALITY.value,
+    )
+
+# Maximum number of movies accepted by the batch ratings endpoint
+MAX_BATCH_RATINGS = 100
+
+# Newline-delimited JSON, used for streamed responses
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# Background refresh of stale stored ratings (started when enabled)
+ratings_refresher = create_refresher()
+
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = "login"
@@ -61,12 +141,57 @@ def ping():
     return "pong"
 
 
+@app.route("/api/cache/stats", methods=["GET"])
+@login_required
+def cache_stats():
+    """
+    Counters for the upstream lookup cache and request coalescing.
+    Returns: {"cache": {"hits": ..., "misses": ...}, "coalescing": {"executions": ..., "collapsed": ...}}
+    """
+    return Response(response=get_lookup_stats())
+
+
+@app.route("/api/ratings/refresh/stats", methods=["GET"])
+@login_required
+def ratings_refresh_stats():
+    """Progress of the background ratings refresh in this process."""
+    return Response(response=ratings_refresher.stats())
+
+
+@app.cli.command("refresh-ratings")
+@click.option("--once", is_flag=True, help="Refresh a single batch and exit.")
+@click.option("--batch-size", type=int, help="Movies to refresh per batch.")
+def refresh_ratings_command(once, batch_size):
+    """Refresh stale movie ratings, most watchlisted movies first."""
+    if batch_size:
+        ratings_refresher.batch_size = batch_size
+
+    if once:
+        result = ratings_refresher.run_once()
+        click.echo(
+            f"Refreshed {result['refreshed']} of {result['movies']} movies "
+            f"({result['failed']} failed)"
+        )
+        return
+
+    click.echo("Refreshing stale ratings, press Ctrl+C to stop")
+    try:
+        ratings_refresher.run(app)
+    except KeyboardInterrupt:
+        ratings_refresher.stop()
+
+
 @app.route("/api/movies/search", methods=["POST"])
 def search_movies():
     """
     Search for movies and return metadata only (no ratings).
     Accepts: {"movies": [{"query": "The Matrix 1999"}, ...]}
     Returns: {"movies": [{"id": "tt0133093", "query": "...", "title": "...", "year": 1999, "logo_url": "..."}], "errors": [...]}
+
+    With "Accept: application/x-ndjson" the results are streamed instead, one JSON
+    object per line as each lookup finishes:
+    {"type": "movie", "movie": {...}} / {"type": "error", "error": {...}}
+    followed by {"type": "done", "movies": <count>, "errors": <count>}
     """
     if not request.json or "movies" not in request.json:
         return Response(
@@ -81,10 +206,34 @@ def search_movies():
             status=400,
         )
 
+    if _wants_ndjson():
+        return app.response_class(
+            _stream_search_results(queries),
+            mimetype=NDJSON_MIMETYPE,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     result = search_movies_parallel(queries)
     return Response(response={"movies": result["movies"], "errors": result["errors"]})
 
 
+def _wants_ndjson():
+    """Check whether the client asked for a streamed NDJSON response."""
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def _stream_search_results(queries):
+    """Yield search results as NDJSON lines in completion order."""
+    counts = {"movie": 0, "error": 0}
+    for kind, data in iter_search_movies(queries):
+        counts[kind] += 1
+        yield dumps({"type": kind, kind: data}) + "\n"
+    yield dumps(
+        {"type": "done", "movies": counts["movie"], "errors": counts["error"]}
+    ) + "\n"
+
+
 @app.route("/api/movies/<movie_id>/rating/<platform>", methods=["GET"])
 def get_movie_rating(movie_id, platform):
     """
@@ -93,12 +242,21 @@ def get_movie_rating(movie_id, platform):
     Query params for tmdb: title, year
     Query params for rt: title, year
     Returns: {"rating": 8.7, "page_url": "...", ...}
+    Ratings recently stored on the Movie row are served without a lookup.
+    Responses are cacheable until the stored rating or cache entry expires
+    and answer If-None-Match / If-Modified-Since with a 304.
     """
     platform = platform.lower()
 
+    if platform in RATING_PLATFORMS:
+        stored = get_stored_rating(movie_id, platform)
+        if stored is not None:
+            return _cached_response(stored.value, stored)
+
     if platform == "imdb":
         result = fetch_imdb_rating(movie_id)
-        return Response(response=result)
+        store_ratings({movie_id: {platform: result}})
+        return _cached_response(result, rating_cache_entry(platform, movie_id, None))
 
     elif platform == "tmdb":
         title = request.args.get("title", "")
@@ -109,7 +267,10 @@ def get_movie_rating(movie_id, platform):
                 status=400,
             )
         result = fetch_tmdb_rating(title, year)
-        return Response(response=result)
+        _store_looked_up_rating(movie_id, platform, result, title, year)
+        return _cached_response(
+            result, rating_cache_entry(platform, movie_id, title, year)
+        )
 
     elif platform == "rt":
         title = request.args.get("title", "")
@@ -120,7 +281,10 @@ def get_movie_rating(movie_id, platform):
                 status=400,
             )
         result = fetch_rt_rating(title, year)
-        return Response(response=result)
+        _store_looked_up_rating(movie_id, platform, result, title, year)
+        return _cached_response(
+            result, rating_cache_entry(platform, movie_id, title, year)
+        )
 
     else:
         return Response(
@@ -131,6 +295,127 @@ def get_movie_rating(movie_id, platform):
         )
 
 
+def _store_looked_up_rating(movie_id, platform, result, title, year):
+    """Write a title-based lookup back if it was made for the stored movie."""
+    movies = [{"id": movie_id, "title": title, "year": year}]
+    store_ratings(storable_ratings({movie_id: {platform: result}}, movies))
+
+
+def _cached_response(result, entry=None, max_age=0):
+    """
+    JSON response with HTTP caching headers, made conditional on the request.
+    With the CacheEntry the result came from, Last-Modified is when it was
+    stored, max-age what is left of its TTL and stale-while-revalidate what
+    is left of its grace period. Otherwise clients may keep the result for
+    max_age seconds, or must revalidate when 0. The ETag is a body hash.
+    """
+    response = Response(response=result)
+    response.add_etag()
+    if entry is not None:
+        now = time.time()
+        response.last_modified = entry.stored_at
+        response.cache_control.public = True
+        response.cache_control.max_age = max(0, int(entry.expires_at - now))
+        if entry.grace:
+            response.cache_control.stale_while_revalidate = max(
+                0, int(entry.stale_until - max(now, entry.expires_at))
+            )
+    elif max_age:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@app.route("/api/movies/ratings", methods=["POST"])
+def get_movie_ratings_batch():
+    """
+    Get ratings for multiple movies from multiple platforms in one request.
+    Accepts: {"movies": [{"id": "tt0133093", "title": "The Matrix", "year": 1999}, ...],
+              "platforms": ["imdb", "tmdb", "rt"]}  (platforms optional, defaults to all)
+    Returns: {"ratings": {"tt0133093": {"imdb": {...}, "tmdb": {...}, "rt": {...}}}, "errors": [...]}
+    """
+    if not request.json or "movies" not in request.json:
+        return Response(
+            response={"error": "Request must include 'movies' array"},
+            status=400,
+        )
+
+    movies = request.json["movies"]
+    if not isinstance(movies, list):
+        return Response(
+            response={"error": "'movies' must be an array"},
+            status=400,
+        )
+
+    if len(movies) > MAX_BATCH_RATINGS:
+        return Response(
+            response={
+                "error": f"At most {MAX_BATCH_RATINGS} movies can be rated per request"
+            },
+            status=400,
+        )
+
+    platforms = request.json.get("platforms", list(RATING_PLATFORMS))
+    if not isinstance(platforms, list):
+        return Response(
+            response={"error": "'platforms' must be an array"},
+            status=400,
+        )
+
+    platforms = list(dict.fromkeys(p.lower() for p in platforms if isinstance(p, str)))
+    unknown = [p for p in platforms if p not in RATING_PLATFORMS]
+    if unknown:
+        return Response(
+            response={
+                "error": f"Unknown platform: {', '.join(unknown)}. Supported: imdb, tmdb, rt"
+            },
+            status=400,
+        )
+
+    # TMDb and RT lookups are title based, IMDb only needs the id
+    needs_title = any(p in ("tmdb", "rt") for p in platforms)
+    valid_movies = []
+    errors = []
+    for movie in movies:
+        if not isinstance(movie, dict) or not movie.get("id"):
+            errors.append({"id": None, "error": "id is required"})
+            continue
+        if not isinstance(movie["id"], str):
+            errors.append({"id": None, "error": "id must be a string"})
+            continue
+        title = movie.get("title") or ""
+        if not isinstance(title, str):
+            errors.append({"id": movie["id"], "error": "title must be a string"})
+            continue
+        if needs_title and not title:
+            errors.append({"id": movie["id"], "error": "title is required"})
+            continue
+        try:
+            year = int(movie["year"]) if movie.get("year") else None
+        except (TypeError, ValueError):
+            year = None
+        valid_movies.append({"id": movie["id"], "title": title, "year": year})
+
+    # Serve recently stored ratings from the Movie table, look up the rest
+    ratings = get_stored_ratings([m["id"] for m in valid_movies], platforms)
+    lookups = {}
+    for movie in valid_movies:
+        missing = [p for p in platforms if p not in ratings.get(movie["id"], {})]
+        if missing:
+            lookups.setdefault(tuple(missing), []).append(movie)
+
+    for missing, movies_to_fetch in lookups.items():
+        result = fetch_ratings_parallel(movies_to_fetch, list(missing))
+        store_ratings(storable_ratings(result["ratings"], movies_to_fetch))
+        for movie_id, movie_ratings in result["ratings"].items():
+            ratings.setdefault(movie_id, {}).update(movie_ratings)
+        errors.extend(result["errors"])
+
+    return Response(response={"ratings": ratings, "errors": errors})
+
+
 @app.route("/", methods=["GET"])
 @app.route("/ranklist", methods=["GET"])
 def index():
@@ -149,90 +434,176 @@ def get_watchlist():
     - genre: Filter by genre (e.g., "Action")
     - year_start, year_end: Filter by year range
     - min_rating: Minimum IMDB rating
-    - search: Search in title
-    - sort_by: "imdb", "rt_tomatometer", "rt_popcornmeter", "added_at", "year", "title"
+    - min_average: Minimum average score across platforms
+    - search: Search in title (words match as prefixes, e.g. "matr rel")
+    - sort_by: "imdb", "rt_tomatometer", "rt_popcornmeter", "added_at", "year",
+      "title", "average_score", or "relevance" (the default when searching;
+      pages only, no cursor)
     - sort_order: "asc" or "desc" (default: "desc")
     - page, per_page: Pagination (default: page=1, per_page=50)
+    - cursor: next_cursor from a previous response; continues after that
+      row instead of using page (stays fast on deep pages)
+    - include_total: "false" skips counting matches (total and pages are null)
+    - fields: Comma separated movie fields to return (e.g. "title,year");
+      "id" is always included (default: every field)
     """
     # Get query parameters
-    genre = request.args.get("genre")
-    year_start = request.args.get("year_start", type=int)
-    year_end = request.args.get("year_end", type=int)
-    min_rating = request.args.get("min_rating", type=float)
     search = request.args.get("search")
-    sort_by = request.args.get("sort_by", "added_at")
-    sort_order = request.args.get("sort_order", "desc")
+    sort_by, sort_order = normalize_sort(
+        request.args.get("sort_by"), request.args.get("sort_order", "desc"), search
+    )
+    cursor = request.args.get("cursor")
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 50, type=int)
-
-    # Base query: join WatchlistEntry with Movie for current user
-    query = (
-        db.session.query(WatchlistEntry, Movie)
-        .join(Movie, WatchlistEntry.movie_id == Movie.id)
-        .filter(WatchlistEntry.user_id == current_user.id)
+    include_total = request.args.get("include_total", "true").lower() not in (
+        "false",
+        "0",
+        "no",
+    )
+    try:
+        fields = parse_fields(request.args.get("fields"))
+    except InvalidFields as e:
+        return jsonify({"error": str(e)}), 400
+
+    query = build_watchlist_query(
+        current_user.id,
+        columns=listing_columns(fields, sort_by),
+        **_watchlist_filters(),
     )
 
-    # Apply filters
-    if genre:
-        # JSON contains check for genres array
-        query = query.filter(Movie.genres.contains([genre]))
-
-    if year_start:
-        query = query.filter(Movie.year >= year_start)
-
-    if year_end:
-        query = query.filter(Movie.year <= year_end)
-
-    if min_rating:
-        query = query.filter(Movie.imdb_rating >= min_rating)
-
-    if search:
-        query = query.filter(Movie.title.ilike(f"%{search}%"))
-
-    # Apply sorting
-    sort_column_map = {
-        "imdb": Movie.imdb_rating,
-        "rt_tomatometer": Movie.rt_tomatometer,
-        "rt_popcornmeter": Movie.rt_popcornmeter,
-        "added_at": WatchlistEntry.added_at,
-        "year": Movie.year,
-        "title": Movie.title,
-    }
-
-    sort_column = sort_column_map.get(sort_by, WatchlistEntry.added_at)
-
-    if sort_order == "asc":
-        query = query.order_by(sort_column.asc().nullslast())
+    # Apply sorting and pagination
+    filtered = query
+    query = apply_sort(query, sort_by, sort_order)
+    page = max(page, 1)
+    per_page = max(1, min(per_page, 100))  # Cap at 100
+    total = None
+    if cursor:
+        # Cursors carry the total counted with the first page
+        try:
+            after_value, after_id, total = decode_cursor(cursor, sort_by, sort_order)
+        except InvalidCursor as e:
+            return jsonify({"error": str(e)}), 400
+        query = apply_cursor(query, sort_by, sort_order, after_value, after_id)
     else:
-        query = query.order_by(sort_column.desc().nullsfirst())
-
-    # Get total count before pagination
-    total = query.count()
-
-    # Apply pagination
-    per_page = min(per_page, 100)  # Cap at 100
-    offset = (page - 1) * per_page
-    results = query.offset(offset).limit(per_page).all()
+        if include_total:
+            query = with_window_total(query)
+        query = query.offset((page - 1) * per_page)
+
+    # Fetch one extra row to know whether there is a next page
+    rows = db.session.execute(query.limit(per_page + 1)).all()
+    if not include_total:
+        total = None
+    elif not cursor:
+        if rows:
+            total = rows[0].total
+        else:
+            # Past the last page (or nothing matches): no row to read it from
+            total = count_rows(filtered) if page > 1 else 0
+
+    results = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page and sort_by != RELEVANCE_SORT:
+        last_row = results[-1]
+        next_cursor = encode_cursor(
+            sort_by, sort_order, last_row.sort_value, last_row.entry_id, total
+        )
 
-    # Build response
-    movies = []
-    for entry, movie in results:
-        movie_dict = movie.to_dict()
-        movie_dict["added_at"] = entry.added_at.isoformat() if entry.added_at else None
-        movie_dict["average_score"] = movie.calculate_average_score()
-        movies.append(movie_dict)
+    # Rows start with the requested fields; dates are encoded by jsonify
+    movies = [dict(zip(fields, row)) for row in results]
 
     return jsonify(
         {
             "movies": movies,
             "total": total,
-            "page": page,
+            "page": None if cursor else page,
             "per_page": per_page,
-            "pages": (total + per_page - 1) // per_page,
+            "pages": (
+                (total + per_page - 1) // per_page if total is not None else None
+            ),
+            "next_cursor": next_cursor,
         }
     )
 
 
+def _watchlist_filters():
+    """build_watchlist_query() filters from the request's query params."""
+    return {
+        "genre": request.args.get("genre"),
+        "year_start": request.args.get("year_start", type=int),
+        "year_end": request.args.get("year_end", type=int),
+        "min_rating": request.args.get("min_rating", type=float),
+        "search": request.args.get("search"),
+        "min_average": request.args.get("min_average", type=float),
+    }
+
+
+@app.route("/api/watchlist/export", methods=["GET"])
+@login_required
+def export_watchlist():
+    """
+    Download the user's whole watchlist, streamed as it is read.
+    Query params:
+    - format: "csv" (default) or "ndjson" (one JSON object per line)
+    - genre, year_start, year_end, min_rating, min_average, search, sort_by,
+      sort_order, fields: as for GET /api/watchlist
+    CSV lists genres comma separated; missing values are empty.
+    """
+    export_format = request.args.get("format", "csv").lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": "format must be 'csv' or 'ndjson'"}), 400
+    try:
+        fields = parse_fields(request.args.get("fields"))
+    except InvalidFields as e:
+        return jsonify({"error": str(e)}), 400
+    sort_by, sort_order = normalize_sort(
+        request.args.get("sort_by"),
+        request.args.get("sort_order", "desc"),
+        request.args.get("search"),
+    )
+
+    query = build_watchlist_query(
+        current_user.id,
+        columns=listing_columns(fields, sort_by),
+        **_watchlist_filters(),
+    )
+    batches = iter_batches(db.session, apply_sort(query, sort_by, sort_order))
+    if export_format == "csv":
+        chunks = csv_chunks(fields, batches)
+    else:
+        chunks = ndjson_chunks(fields, batches)
+
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    return app.response_class(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f'attachment; filename="watchlist.{extension}"',
+            "Cache-Control": "private, no-store",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@app.route("/api/watchlist/ids", methods=["GET"])
+@login_required
+def get_watchlist_ids():
+    """
+    Get the ids of all movies in the user's watchlist.
+    Returns: { ids: ["tt0133093", ...], version: 3 }
+    The ETag follows the user's watchlist version: sending it back in
+    If-None-Match gets an empty 304 until the watchlist changes.
+    """
+    version = current_user.watchlist_version
+    etag = f"watchlist-{current_user.id}-{version}"
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify({"ids": watchlist_ids(current_user.id), "version": version})
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
 @app.route("/api/watchlist", methods=["POST"])
 @login_required
 def add_to_watchlist():
@@ -263,71 +634,10 @@ def add_to_watchlist():
     if not movie_id:
         return jsonify({"success": False, "error": "movie_id is required"}), 400
 
-    # Check if already in watchlist
-    existing = WatchlistEntry.query.filter_by(
-        user_id=current_user.id, movie_id=movie_id
-    ).first()
-    if existing:
-        return jsonify({"success": False, "error": "Movie already in watchlist"}), 409
-
-    # Get or create the movie
-    movie = Movie.query.get(movie_id)
-    if not movie:
-        # Create new movie record
-        title = data.get("title")
-        if not title:
-            return jsonify({"success": False, "error": "title is required"}), 400
-
-        movie = Movie(
-            id=movie_id,
-            title=title,
-            year=data.get("year"),
-            logo_url=data.get("logo_url"),
-            backdrop_url=data.get("backdrop_url"),
-            backdrop_url_hd=data.get("backdrop_url_hd"),
-            imdb_rating=data.get("imdb_rating"),
-            imdb_page_url=data.get("imdb_page_url"),
-            tmdb_rating=data.get("tmdb_rating"),
-            tmdb_page_url=data.get("tmdb_page_url"),
-            rt_tomatometer=data.get("rt_tomatometer"),
-            rt_popcornmeter=data.get("rt_popcornmeter"),
-            rt_page_url=data.get("rt_page_url"),
-            genres=data.get("genres"),
-            ratings_updated_at=datetime.utcnow(),
-        )
-        db.session.add(movie)
-    else:
-        # Update existing movie with any new data
-        if data.get("imdb_rating") is not None:
-            movie.imdb_rating = data.get("imdb_rating")
-        if data.get("imdb_page_url"):
-            movie.imdb_page_url = data.get("imdb_page_url")
-        if data.get("tmdb_rating") is not None:
-            movie.tmdb_rating = data.get("tmdb_rating")
-        if data.get("tmdb_page_url"):
-            movie.tmdb_page_url = data.get("tmdb_page_url")
-        if data.get("rt_tomatometer") is not None:
-            movie.rt_tomatometer = data.get("rt_tomatometer")
-        if data.get("rt_popcornmeter") is not None:
-            movie.rt_popcornmeter = data.get("rt_popcornmeter")
-        if data.get("rt_page_url"):
-            movie.rt_page_url = data.get("rt_page_url")
-        if data.get("backdrop_url"):
-            movie.backdrop_url = data.get("backdrop_url")
-        if data.get("backdrop_url_hd"):
-            movie.backdrop_url_hd = data.get("backdrop_url_hd")
-        if data.get("genres"):
-            movie.genres = data.get("genres")
-        movie.ratings_updated_at = datetime.utcnow()
-
-    # Create watchlist entry
-    entry = WatchlistEntry(user_id=current_user.id, movie_id=movie_id)
-    db.session.add(entry)
-    db.session.commit()
-
-    movie_dict = movie.to_dict()
-    movie_dict["added_at"] = entry.added_at.isoformat()
-    movie_dict["average_score"] = movie.calculate_average_score()
+    movie_dict, error = add_movie_to_watchlist(current_user.id, movie_id, data)
+    if error:
+        status = 409 if error == ALREADY_LISTED else 400
+        return jsonify({"success": False, "error": error}), status
 
     return jsonify({"success": True, "movie": movie_dict})
 
@@ -336,16 +646,9 @@ def add_to_watchlist():
 @login_required
 def remove_from_watchlist(movie_id):
     """Remove a movie from the user's watchlist."""
-    entry = WatchlistEntry.query.filter_by(
-        user_id=current_user.id, movie_id=movie_id
-    ).first()
-
-    if not entry:
+    if not remove_movie_from_watchlist(current_user.id, movie_id):
         return jsonify({"success": False, "error": "Movie not in watchlist"}), 404
 
-    db.session.delete(entry)
-    db.session.commit()
-
     return jsonify({"success": True})
 
 
@@ -364,57 +667,10 @@ def add_bulk_to_watchlist():
     if not isinstance(movies_data, list):
         return jsonify({"success": False, "error": "movies must be an array"}), 400
 
-    added = []
-    skipped = []
-    errors = []
-
-    for movie_data in movies_data:
-        movie_id = movie_data.get("movie_id")
-        if not movie_id:
-            errors.append({"movie_id": None, "error": "movie_id is required"})
-            continue
-
-        # Check if already in watchlist
-        existing = WatchlistEntry.query.filter_by(
-            user_id=current_user.id, movie_id=movie_id
-        ).first()
-        if existing:
-            skipped.append(movie_id)
-            continue
-
-        # Get or create the movie
-        movie = Movie.query.get(movie_id)
-        if not movie:
-            title = movie_data.get("title")
-            if not title:
-                errors.append({"movie_id": movie_id, "error": "title is required"})
-                continue
-
-            movie = Movie(
-                id=movie_id,
-                title=title,
-                year=movie_data.get("year"),
-                logo_url=movie_data.get("logo_url"),
-                backdrop_url=movie_data.get("backdrop_url"),
-                backdrop_url_hd=movie_data.get("backdrop_url_hd"),
-                imdb_rating=movie_data.get("imdb_rating"),
-                imdb_page_url=movie_data.get("imdb_page_url"),
-                tmdb_rating=movie_data.get("tmdb_rating"),
-                tmdb_page_url=movie_data.get("tmdb_page_url"),
-                rt_tomatometer=movie_data.get("rt_tomatometer"),
-                rt_popcornmeter=movie_data.get("rt_popcornmeter"),
-                rt_page_url=movie_data.get("rt_page_url"),
-                genres=movie_data.get("genres"),
-                ratings_updated_at=datetime.utcnow(),
-            )
-            db.session.add(movie)
-
-        # Create watchlist entry
-        entry = WatchlistEntry(user_id=current_user.id, movie_id=movie_id)
-        db.session.add(entry)
-        added.append(movie_id)
-
-    db.session.commit()
+    result = add_movies_to_watchlist(current_user.id, movies_data)
+    added = result["added"]
+    skipped = result["skipped"]
+    errors = result["errors"]
 
     return jsonify(
         {
@@ -428,26 +684,63 @@ def add_bulk_to_watchlist():
     )
 
 
-@app.route("/api/watchlist/genres", methods=["GET"])
+@app.route("/api/watchlist/import", methods=["POST"])
 @login_required
-def get_watchlist_genres():
-    """Get all unique genres from user's watchlist for filter dropdown."""
-    # Query all movies in user's watchlist
-    movies = (
-        db.session.query(Movie.genres)
-        .join(WatchlistEntry, WatchlistEntry.movie_id == Movie.id)
-        .filter(WatchlistEntry.user_id == current_user.id)
-        .filter(Movie.genres.isnot(None))
-        .all()
+def import_watchlist():
+    """
+    Add the titles of an IMDb CSV export (ratings, watchlist or list) to the
+    user's watchlist. Send the file as multipart "file" or as a text/csv body.
+    Rows are read and stored a batch at a time. Titles with a Const (IMDb
+    id) are added at once. Searching for rows with only a title and looking
+    up the ratings of new movies continue in the background.
+    Returns: { success, rows, added_count, skipped_count, ratings_pending,
+    searches_pending, errors, errors_count }
+    """
+    upload = request.files.get("file")
+    if upload is not None:
+        stream = upload.stream
+    elif request.mimetype == "text/csv":
+        stream = request.stream
+    else:
+        return (
+            jsonify({"success": False, "error": "CSV file or text/csv body required"}),
+            400,
+        )
+
+    lines = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        result = import_imdb_csv(current_user.id, lines)
+    except (InvalidImport, csv.Error) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    if result["created"] or result["to_search"]:
+        start_import_completion(
+            app,
+            current_user.id,
+            result["created"],
+            result["to_search"],
+            ratings_refresher,
+        )
+
+    return jsonify(
+        {
+            "success": True,
+            "rows": result["rows"],
+            "added_count": result["added"],
+            "skipped_count": result["skipped"],
+            "ratings_pending": len(result["created"]),
+            "searches_pending": len(result["to_search"]),
+            "errors": result["errors"],
+            "errors_count": result["errors_count"],
+        }
     )
 
-    # Collect all unique genres
-    all_genres = set()
-    for (genres,) in movies:
-        if genres and isinstance(genres, list):
-            all_genres.update(genres)
 
-    return jsonify({"genres": sorted(all_genres)})
+@app.route("/api/watchlist/genres", methods=["GET"])
+@login_required
+def get_watchlist_genres():
+    """Get all unique genres from user's watchlist for filter dropdown."""
+    return jsonify({"genres": watchlist_genres(current_user.id)})
 
 
 @app.route("/api/movies/<movie_id>/genres", methods=["GET"])
@@ -455,9 +748,16 @@ def get_movie_genres(movie_id):
     """
     Get genres for a specific movie from IMDB.
     Returns: { genres: ["Action", "Sci-Fi", ...] }
+    Cacheable like the rating endpoint.
     """
+    result = get_stored_genres(movie_id)
+    if result is not None:
+        # Stored genres are kept for good, so they last as long as cached ones
+        return _cached_response(result, max_age=CACHE_TTLS["imdb_genres"])
+
     result = fetch_imdb_genres(movie_id)
-    return Response(response=result)
+    store_genres(movie_id, result.get("genres"))
+    return _cached_response(result, genres_cache_entry(movie_id))
 
 
 # Auth page routes
@@ -523,6 +823,12 @@ def api_auth_status():
 
 
 if __name__ == "__main__":
+    # With the reloader, only the child process that serves requests refreshes
+    if EnvVariable.RATINGS_REFRESH_ENABLED.value and (
+        not EnvVariable.FLASK_DEBUG.value or os.environ.get("WERKZEUG_RUN_MAIN")
+    ):
+        ratings_refresher.start(app)
+
     if EnvVariable.FLASK_DEBUG.value:
         app.run(
             host="0.0.0.0",
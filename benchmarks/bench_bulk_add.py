@@ -0,0 +1,125 @@
+"""
+Benchmark adding a ranklist to a watchlist: per-movie queries vs set-based.
+
+Seeds a temporary SQLite database whose catalog already holds half of the
+movies, then adds --sizes movies to a fresh user's watchlist with the
+previous per-movie loop (an entry lookup and Movie.query.get per movie)
+and with add_movies_to_watchlist. Reports time and statements executed.
+
+Usage: python benchmarks/bench_bulk_add.py [--sizes 1000 10000]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DB_DIR = tempfile.mkdtemp(prefix="bench-bulk-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from sqlalchemy import event  # noqa: E402
+
+from app import app  # noqa: E402
+from utils.models import Movie, User, WatchlistEntry, db  # noqa: E402
+from utils.watchlist_store import add_movies_to_watchlist  # noqa: E402
+
+
+def ranklist(prefix: str, size: int) -> list:
+    return [
+        {
+            "movie_id": f"{prefix}{i:08d}",
+            "title": f"Movie {i}",
+            "year": 1950 + i % 75,
+            "imdb_rating": 5 + i % 50 / 10,
+            "genres": ["Drama", "Comedy"] if i % 2 else ["Action"],
+        }
+        for i in range(size)
+    ]
+
+
+def seed_catalog(movies: list):
+    """Store every other movie, as if other users had added them."""
+    db.session.execute(
+        db.insert(Movie),
+        [{"id": m["movie_id"], "title": m["title"]} for m in movies[::2]],
+    )
+    db.session.commit()
+
+
+def create_user(email: str) -> int:
+    user = User(email=email)
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+def legacy_add(user_id: int, movies_data: list):
+    """The previous POST /api/watchlist/bulk loop."""
+    for movie_data in movies_data:
+        movie_id = movie_data["movie_id"]
+        existing = WatchlistEntry.query.filter_by(
+            user_id=user_id, movie_id=movie_id
+        ).first()
+        if existing:
+            continue
+        movie = db.session.get(Movie, movie_id)
+        if not movie:
+            movie = Movie(
+                id=movie_id,
+                title=movie_data["title"],
+                year=movie_data.get("year"),
+                imdb_rating=movie_data.get("imdb_rating"),
+                genres=movie_data.get("genres"),
+                ratings_updated_at=datetime.utcnow(),
+            )
+            db.session.add(movie)
+        db.session.add(WatchlistEntry(user_id=user_id, movie_id=movie_id))
+    db.session.commit()
+
+
+def measure(fn, *args):
+    statements = []
+
+    def record(conn, cursor, statement, *rest):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        started = time.perf_counter()
+        fn(*args)
+        elapsed = (time.perf_counter() - started) * 1000
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    return elapsed, len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    with app.app_context():
+        print(f"{'movies':>8}{'strategy':>12}{'ms':>10}{'statements':>12}")
+        for size in args.sizes:
+            for strategy, fn in (
+                ("per-movie", legacy_add),
+                ("set-based", add_movies_to_watchlist),
+            ):
+                movies = ranklist(f"{strategy[:3]}{size}-", size)
+                seed_catalog(movies)
+                user_id = create_user(f"{strategy}-{size}@example.com")
+                elapsed, statements = measure(fn, user_id, movies)
+                assert WatchlistEntry.query.filter_by(user_id=user_id).count() == size
+                print(f"{size:>8}{strategy:>12}{elapsed:>10.1f}{statements:>12}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        shutil.rmtree(DB_DIR, ignore_errors=True)
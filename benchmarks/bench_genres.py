@@ -0,0 +1,164 @@
+"""
+Benchmark genre filtering and the genre dropdown: JSON column vs movie_genres.
+
+Seeds a temporary SQLite database with a catalog of --movies movies, each
+tagged with a few genres, and a watchlist of --watchlist of them. Then times
+the previous JSON-based queries (LIKE scan over movies.genres, loading every
+genres array into Python) against the indexed movie_genres queries.
+
+Usage: python benchmarks/bench_genres.py [--movies 100000] [--watchlist 20000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DB_DIR = tempfile.mkdtemp(prefix="bench-genres-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from app import app  # noqa: E402
+from utils.models import (  # noqa: E402
+    Movie,
+    User,
+    WatchlistEntry,
+    db,
+    sync_movie_genres,
+)
+from utils.watchlist import build_watchlist_query, watchlist_genres  # noqa: E402
+
+GENRES = [
+    "Action",
+    "Adventure",
+    "Animation",
+    "Biography",
+    "Comedy",
+    "Crime",
+    "Documentary",
+    "Drama",
+    "Family",
+    "Fantasy",
+    "Film-Noir",
+    "History",
+    "Horror",
+    "Music",
+    "Musical",
+    "Mystery",
+    "Romance",
+    "Sci-Fi",
+    "Short",
+    "Sport",
+    "Thriller",
+    "War",
+    "Western",
+]
+
+
+def seed(movies: int, watchlist: int) -> int:
+    rng = random.Random(42)
+    user = User(email="bench@example.com")
+    db.session.add(user)
+    db.session.commit()
+
+    rows = [
+        {
+            "id": f"tt{i:08d}",
+            "title": f"Movie {i}",
+            "genres": rng.sample(GENRES, rng.randint(1, 3)),
+        }
+        for i in range(movies)
+    ]
+    connection = db.session.connection()
+    for start in range(0, movies, 5000):
+        chunk = rows[start : start + 5000]
+        db.session.execute(db.insert(Movie), chunk)
+        sync_movie_genres(connection, {row["id"]: row["genres"] for row in chunk})
+
+    watched = rng.sample(rows, watchlist)
+    db.session.execute(
+        db.insert(WatchlistEntry),
+        [{"user_id": user.id, "movie_id": row["id"]} for row in watched],
+    )
+    db.session.commit()
+    return user.id
+
+
+def json_filter_count(user_id: int, genre: str) -> int:
+    # What the JSON contains() filter compiled to on SQLite
+    json_text = db.cast(Movie.genres, db.String)
+    return build_watchlist_query(user_id).filter(json_text.like(f'%"{genre}"%')).count()
+
+
+def json_dropdown(user_id: int) -> list:
+    rows = (
+        db.session.query(Movie.genres)
+        .join(WatchlistEntry, WatchlistEntry.movie_id == Movie.id)
+        .filter(WatchlistEntry.user_id == user_id)
+        .filter(Movie.genres.isnot(None))
+        .all()
+    )
+    all_genres = set()
+    for (genres,) in rows:
+        all_genres.update(genres)
+    return sorted(all_genres)
+
+
+def timed(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--movies", type=int, default=100000)
+    parser.add_argument("--watchlist", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with app.app_context():
+        started = time.perf_counter()
+        user_id = seed(args.movies, args.watchlist)
+        print(
+            f"Seeded {args.movies} movies, {args.watchlist} on the watchlist "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+        print(f"{'query':<26}{'json ms':>10}{'indexed ms':>12}{'match':>8}")
+        for genre in ("Action", "Film-Noir"):
+            json_ms, json_count = timed(
+                lambda: json_filter_count(user_id, genre), args.repeat
+            )
+            indexed_ms, indexed_count = timed(
+                lambda: build_watchlist_query(user_id, genre=genre).count(),
+                args.repeat,
+            )
+            print(
+                f"{'filter ' + genre:<26}{json_ms:>10.1f}{indexed_ms:>12.1f}"
+                f"{str(json_count == indexed_count):>8}"
+            )
+
+        json_ms, json_genres = timed(lambda: json_dropdown(user_id), args.repeat)
+        indexed_ms, indexed_genres = timed(
+            lambda: watchlist_genres(user_id), args.repeat
+        )
+        print(
+            f"{'genre dropdown':<26}{json_ms:>10.1f}{indexed_ms:>12.1f}"
+            f"{str(json_genres == indexed_genres):>8}"
+        )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        shutil.rmtree(DB_DIR, ignore_errors=True)
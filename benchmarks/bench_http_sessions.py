@@ -0,0 +1,126 @@
+"""
+Benchmark bare requests.get against the pooled provider sessions.
+
+Starts a local keep-alive stub server, replays a ranklist-sized burst of
+lookups through both clients and reports new connections (handshakes) and
+latency. A per-connection delay stands in for the TCP+TLS handshake cost
+of the real upstream hosts.
+
+Usage: python benchmarks/bench_http_sessions.py [--requests 400] [--workers 10]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.api.session import create_session  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    handshake_delay = 0.0
+
+    def setup(self):
+        super().setup()
+        self.server.count_connection()
+        time.sleep(self.handshake_delay)
+
+    def do_GET(self):
+        body = b'{"rating": 8.7}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def count_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def reset(self):
+        with self._lock:
+            self.connections = 0
+
+
+def run(get, url, total, workers):
+    latencies = []
+
+    def call(i):
+        start = time.perf_counter()
+        get(f"{url}/title/get-ratings?tconst=tt{i:07d}").json()
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(call, range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "total_s": elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=10)
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    StubHandler.handshake_delay = args.handshake_ms / 1000
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    session = create_session(timeout=5, pool_maxsize=args.workers)
+    clients = [
+        ("requests.get", lambda u: requests.get(u, timeout=5)),
+        ("pooled session", session.get),
+    ]
+
+    print(
+        f"{args.requests} requests, {args.workers} workers, "
+        f"{args.handshake_ms:.0f} ms simulated handshake"
+    )
+    print(
+        f"{'client':<16}{'handshakes':>12}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+    )
+    for name, get in clients:
+        server.reset()
+        stats = run(get, url, args.requests, args.workers)
+        print(
+            f"{name:<16}{server.connections:>12}{stats['total_s']:>10.2f}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+        )
+
+    session.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark importing IMDb CSV exports of increasing size into a watchlist.
+
+Writes an IMDb ratings export with --sizes rows to a temporary file and
+imports it for a fresh user in a temporary SQLite database with
+import_imdb_csv(), as POST /api/watchlist/import does. Every row has a
+Const, so no searches are made. Reports seconds, rows per second and the
+peak memory traced during the import; peak memory should stay flat as
+the file grows.
+
+Usage: python benchmarks/bench_imdb_import.py [--sizes 1000 10000 50000]
+"""
+
+import argparse
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DB_DIR = tempfile.mkdtemp(prefix="bench-import-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from app import app  # noqa: E402
+from utils.imdb_import import import_imdb_csv  # noqa: E402
+from utils.models import User, db  # noqa: E402
+
+HEADER = [
+    "Const",
+    "Your Rating",
+    "Date Rated",
+    "Title",
+    "Original Title",
+    "URL",
+    "Title Type",
+    "IMDb Rating",
+    "Runtime (mins)",
+    "Year",
+    "Genres",
+    "Num Votes",
+    "Release Date",
+    "Directors",
+]
+
+
+def write_export(path: str, rows: int):
+    with open(path, "w", newline="", encoding="utf-8-sig") as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADER)
+        for i in range(rows):
+            movie_id = f"tt{i:08d}"
+            writer.writerow(
+                [
+                    movie_id,
+                    1 + i % 10,
+                    "2024-01-01",
+                    f"Movie {i}",
+                    f"Movie {i}",
+                    f"https://www.imdb.com/title/{movie_id}/",
+                    "Movie",
+                    5 + i % 50 / 10,
+                    90 + i % 60,
+                    1950 + i % 75,
+                    "Drama, Comedy" if i % 2 else "Action",
+                    1000 + i,
+                    "2000-01-01",
+                    "Some Director",
+                ]
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}{'seconds':>9}{'rows/s':>9}{'peak KiB':>10}")
+    with app.app_context():
+        for size in args.sizes:
+            path = os.path.join(DB_DIR, f"ratings-{size}.csv")
+            write_export(path, size)
+            user = User(email=f"bench{size}@example.com")
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+
+            with open(path, encoding="utf-8-sig", newline="") as lines:
+                tracemalloc.start()
+                started = time.perf_counter()
+                result = import_imdb_csv(user_id, lines)
+                elapsed = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+            assert result["added"] + result["skipped"] == size, result
+            print(f"{size:>8}{elapsed:>9.2f}{size / elapsed:>9.0f}{peak / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        shutil.rmtree(DB_DIR, ignore_errors=True)
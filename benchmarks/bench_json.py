@@ -0,0 +1,109 @@
+"""
+Benchmark JSON serialization of a 100-movie watchlist page.
+
+Builds the GET /api/watchlist response body for --movies movies and encodes
+it with the stdlib json.dumps (the previous utils.objects.Response), Flask's
+default provider (the previous jsonify) and the app's FastJSONProvider, with
+orjson and with its stdlib fallback. Reports microseconds per page and size.
+
+Usage: python benchmarks/bench_json.py [--movies 100] [--iterations 2000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from utils import json_provider  # noqa: E402
+from utils.json_provider import FastJSONProvider  # noqa: E402
+from utils.models import Movie  # noqa: E402
+
+
+def watchlist_page(size: int) -> dict:
+    """A page as get_watchlist() returns it."""
+    added = datetime(2024, 1, 1, 12, 30)
+    movies = []
+    for i in range(size):
+        movie = Movie(
+            id=f"tt{i:07d}",
+            title=f"Movie {i}",
+            year=1950 + i % 75,
+            logo_url=f"https://m.media-amazon.com/images/M/{i}.jpg",
+            backdrop_url=f"https://image.tmdb.org/t/p/w780/{i}.jpg",
+            backdrop_url_hd=f"https://image.tmdb.org/t/p/original/{i}.jpg",
+            imdb_rating=5 + i % 50 / 10,
+            imdb_page_url=f"https://www.imdb.com/title/tt{i:07d}/",
+            tmdb_rating=5.5 + i % 40 / 10,
+            tmdb_page_url=f"https://www.themoviedb.org/movie/{i}",
+            rt_tomatometer=4 + i % 60 / 10,
+            rt_popcornmeter=6 + i % 30 / 10,
+            rt_page_url=f"https://www.rottentomatoes.com/m/movie_{i}",
+            genres=["Drama", "Comedy"] if i % 2 else ["Action"],
+            average_score=7.3,
+            created_at=added,
+            ratings_updated_at=added + timedelta(minutes=i),
+        )
+        movie_dict = movie.to_dict()
+        movie_dict["added_at"] = (added + timedelta(hours=i)).isoformat()
+        movies.append(movie_dict)
+    return {
+        "movies": movies,
+        "total": size,
+        "page": 1,
+        "per_page": size,
+        "pages": 1,
+        "next_cursor": None,
+    }
+
+
+def measure(encode, page: dict, iterations: int):
+    encode(page)  # warm up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        body = encode(page)
+    elapsed = time.perf_counter() - started
+    return elapsed / iterations * 1e6, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--movies", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    flask_default = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    page = watchlist_page(args.movies)
+
+    strategies = [
+        ("json.dumps", lambda obj: json.dumps(obj).encode()),
+        ("flask default", lambda obj: flask_default.response(obj).get_data()),
+    ]
+    if json_provider.orjson is not None:
+        strategies.append(("orjson", lambda obj: fast.response(obj).get_data()))
+
+    def fallback(obj):
+        with patch.object(json_provider, "orjson", None):
+            return fast.response(obj).get_data()
+
+    strategies.append(("stdlib fallback", fallback))
+
+    print(f"{args.movies} movies per page, {args.iterations} iterations")
+    print(f"{'encoder':<18}{'us/page':>10}{'bytes':>10}")
+    with app.app_context():
+        for name, encode in strategies:
+            per_page, size = measure(encode, page, args.iterations)
+            print(f"{name:<18}{per_page:>10.1f}{size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark peak memory of streaming a watchlist export against building it whole.
+
+Seeds a temporary SQLite database with one user per --sizes entry, each
+with a watchlist of that many movies, then exports every watchlist as CSV
+two ways: fetching all rows and joining the CSV (what paging through the
+whole list amounts to), and streaming it through iter_batches() and
+csv_chunks() as GET /api/watchlist/export does. Reports seconds and the
+peak memory traced during each export; streaming should stay flat.
+
+Usage: python benchmarks/bench_watchlist_export.py [--sizes 1000 10000 50000]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DB_DIR = tempfile.mkdtemp(prefix="bench-export-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from app import app  # noqa: E402
+from utils.export import csv_chunks, iter_batches  # noqa: E402
+from utils.models import Movie, User, WatchlistEntry, db  # noqa: E402
+from utils.watchlist import (  # noqa: E402
+    apply_sort,
+    build_watchlist_query,
+    listing_columns,
+    parse_fields,
+)
+
+
+def seed(sizes: list) -> dict:
+    """Users by watchlist size; larger watchlists include the smaller ones."""
+    start = datetime(2020, 1, 1)
+    movies = [
+        {
+            "id": f"tt{i:08d}",
+            "title": f"Movie {i}",
+            "year": 1950 + i % 75,
+            "backdrop_url": f"https://image.tmdb.org/t/p/w780/{i}.jpg",
+            "imdb_rating": 5 + i % 50 / 10,
+            "imdb_page_url": f"https://www.imdb.com/title/tt{i:08d}/",
+            "rt_tomatometer": 4 + i % 60 / 10,
+            "genres": ["Drama", "Comedy"] if i % 2 else ["Action"],
+            "created_at": start,
+        }
+        for i in range(max(sizes))
+    ]
+    db.session.execute(db.insert(Movie), movies)
+
+    users = {}
+    for size in sizes:
+        user = User(email=f"bench{size}@example.com")
+        db.session.add(user)
+        db.session.flush()
+        users[size] = user.id
+        db.session.execute(
+            db.insert(WatchlistEntry),
+            [
+                {
+                    "user_id": user.id,
+                    "movie_id": movie["id"],
+                    "added_at": start + timedelta(minutes=i),
+                }
+                for i, movie in enumerate(movies[:size])
+            ],
+        )
+    db.session.commit()
+    return users
+
+
+def export_query(user_id: int, fields: list):
+    query = build_watchlist_query(user_id, columns=listing_columns(fields, "added_at"))
+    return apply_sort(query, "added_at", "desc")
+
+
+def build_whole(user_id: int, fields: list) -> int:
+    rows = db.session.execute(export_query(user_id, fields)).all()
+    return len("".join(csv_chunks(fields, [rows])))
+
+
+def stream(user_id: int, fields: list) -> int:
+    batches = iter_batches(db.session, export_query(user_id, fields))
+    return sum(len(chunk) for chunk in csv_chunks(fields, batches))
+
+
+def measure(export, user_id: int, fields: list):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = export(user_id, fields)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    with app.app_context():
+        started = time.perf_counter()
+        users = seed(sorted(args.sizes))
+        print(f"Seeded {len(users)} watchlists in {time.perf_counter() - started:.1f}s")
+
+        fields = parse_fields()
+        print(
+            f"{'strategy':<12}{'entries':>9}{'seconds':>9}{'peak KiB':>10}{'chars':>11}"
+        )
+        for size, user_id in users.items():
+            for name, export in (("whole", build_whole), ("streamed", stream)):
+                elapsed, peak, chars = measure(export, user_id, fields)
+                print(f"{name:<12}{size:>9}{elapsed:>9.2f}{peak:>10.0f}{chars:>11}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        shutil.rmtree(DB_DIR, ignore_errors=True)
@@ -0,0 +1,156 @@
+"""
+Benchmark listing watchlist pages as ORM objects against Core column rows.
+
+Seeds a temporary SQLite database with one user whose watchlist holds
+--entries fully rated movies, then builds and serializes pages of
+--per-page movies three ways: hydrating (WatchlistEntry, Movie) objects and
+calling Movie.to_dict() (the previous GET /api/watchlist), selecting every
+field as Core rows, and selecting only --fields. Reports the median
+milliseconds per page and the peak memory traced while building one.
+
+Usage: python benchmarks/bench_watchlist_fields.py [--entries 20000]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DB_DIR = tempfile.mkdtemp(prefix="bench-fields-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from app import app  # noqa: E402
+from utils.json_provider import dumpb  # noqa: E402
+from utils.models import Movie, User, WatchlistEntry, db  # noqa: E402
+from utils.watchlist import (  # noqa: E402
+    apply_sort,
+    build_watchlist_query,
+    listing_columns,
+    parse_fields,
+    with_window_total,
+)
+
+
+def seed(entries: int) -> int:
+    user = User(email="bench@example.com")
+    db.session.add(user)
+    db.session.commit()
+
+    start = datetime(2020, 1, 1)
+    movies = []
+    watchlist = []
+    for i in range(entries):
+        movie_id = f"tt{i:08d}"
+        movies.append(
+            {
+                "id": movie_id,
+                "title": f"Movie {i}",
+                "year": 1950 + i % 75,
+                "logo_url": f"https://m.media-amazon.com/images/M/{i}.jpg",
+                "backdrop_url": f"https://image.tmdb.org/t/p/w780/{i}.jpg",
+                "backdrop_url_hd": f"https://image.tmdb.org/t/p/original/{i}.jpg",
+                "imdb_rating": 5 + i % 50 / 10,
+                "imdb_page_url": f"https://www.imdb.com/title/{movie_id}/",
+                "tmdb_rating": 5.5 + i % 40 / 10,
+                "tmdb_page_url": f"https://www.themoviedb.org/movie/{i}",
+                "rt_tomatometer": 4 + i % 60 / 10,
+                "rt_popcornmeter": 6 + i % 30 / 10,
+                "rt_page_url": f"https://www.rottentomatoes.com/m/movie_{i}",
+                "genres": ["Drama", "Comedy"] if i % 2 else ["Action"],
+                "average_score": 7.3,
+                "created_at": start,
+                "ratings_updated_at": start + timedelta(minutes=i),
+            }
+        )
+        watchlist.append(
+            {
+                "user_id": user.id,
+                "movie_id": movie_id,
+                "added_at": start + timedelta(minutes=i),
+            }
+        )
+    db.session.execute(db.insert(Movie), movies)
+    db.session.execute(db.insert(WatchlistEntry), watchlist)
+    db.session.commit()
+    return user.id
+
+
+def orm_page(user_id: int, per_page: int, page: int) -> bytes:
+    query = with_window_total(
+        apply_sort(build_watchlist_query(user_id), "added_at", "desc")
+    )
+    rows = query.offset((page - 1) * per_page).limit(per_page).all()
+    movies = []
+    for entry, movie, _total in rows:
+        movie_dict = movie.to_dict()
+        movie_dict["added_at"] = entry.added_at.isoformat() if entry.added_at else None
+        movies.append(movie_dict)
+    body = dumpb({"movies": movies})
+    db.session.expunge_all()  # as the request teardown would
+    return body
+
+
+def core_page(user_id: int, per_page: int, page: int, fields: list) -> bytes:
+    query = build_watchlist_query(user_id, columns=listing_columns(fields, "added_at"))
+    query = with_window_total(apply_sort(query, "added_at", "desc"))
+    rows = db.session.execute(query.offset((page - 1) * per_page).limit(per_page)).all()
+    return dumpb({"movies": [dict(zip(fields, row)) for row in rows]})
+
+
+def measure(build, repeat: int):
+    build()  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = build()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--per-page", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--fields", default="title,year,imdb_rating")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    with app.app_context():
+        started = time.perf_counter()
+        user_id = seed(args.entries)
+        print(
+            f"Seeded {args.entries} watchlist entries "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+        every_field = parse_fields()
+        some_fields = parse_fields(args.fields)
+        strategies = [
+            ("orm to_dict", lambda n: orm_page(user_id, n, 2)),
+            ("core all fields", lambda n: core_page(user_id, n, 2, every_field)),
+            (f"core {args.fields}", lambda n: core_page(user_id, n, 2, some_fields)),
+        ]
+        print(f"{'strategy':<32}{'per_page':>9}{'ms':>9}{'peak KiB':>10}{'bytes':>10}")
+        for per_page in args.per_page:
+            for name, build in strategies:
+                elapsed, peak, size = measure(lambda: build(per_page), args.repeat)
+                print(f"{name:<32}{per_page:>9}{elapsed:>9.1f}{peak:>10.0f}{size:>10}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        shutil.rmtree(DB_DIR, ignore_errors=True)
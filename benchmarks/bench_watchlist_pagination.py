@@ -0,0 +1,138 @@
+"""
+Benchmark OFFSET pagination against keyset (cursor) pagination of a watchlist.
+
+Seeds a temporary SQLite database with one user whose watchlist holds
+--entries movies, then times fetching a page at increasing depths with
+both strategies for each sort column. OFFSET latency grows with the page
+number; cursor latency should stay flat.
+
+Usage: python benchmarks/bench_watchlist_pagination.py [--entries 100000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DB_DIR = tempfile.mkdtemp(prefix="bench-watchlist-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from app import app  # noqa: E402
+from utils.models import Movie, User, WatchlistEntry, db  # noqa: E402
+from utils.watchlist import (  # noqa: E402
+    apply_cursor,
+    apply_sort,
+    build_watchlist_query,
+    listing_columns,
+    parse_fields,
+)
+
+
+def seed(entries: int) -> int:
+    rng = random.Random(42)
+    user = User(email="bench@example.com")
+    db.session.add(user)
+    db.session.commit()
+
+    start = datetime(2020, 1, 1)
+    movies = []
+    watchlist = []
+    for i in range(entries):
+        movie_id = f"tt{i:08d}"
+        movies.append(
+            {
+                "id": movie_id,
+                "title": f"Movie {rng.randrange(entries // 4)}",
+                "year": rng.choice([None, *range(1950, 2025)]),
+                "imdb_rating": rng.choice([None, *[x / 10 for x in range(10, 100)]]),
+                "rt_tomatometer": rng.choice([None, *[x / 10 for x in range(101)]]),
+                "rt_popcornmeter": rng.choice([None, *[x / 10 for x in range(101)]]),
+            }
+        )
+        watchlist.append(
+            {
+                "user_id": user.id,
+                "movie_id": movie_id,
+                "added_at": start + timedelta(minutes=rng.randrange(entries)),
+            }
+        )
+    db.session.execute(db.insert(Movie), movies)
+    db.session.execute(db.insert(WatchlistEntry), watchlist)
+    db.session.commit()
+    return user.id
+
+
+def time_query(query, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        db.session.execute(query).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--sort-by",
+        nargs="+",
+        default=["added_at", "imdb", "title"],
+        help="Sort columns to benchmark",
+    )
+    args = parser.parse_args()
+
+    with app.app_context():
+        started = time.perf_counter()
+        user_id = seed(args.entries)
+        print(
+            f"Seeded {args.entries} watchlist entries "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+        last_page = max(1, -(-args.entries // args.per_page))
+        pages = sorted(
+            {min(page, last_page) for page in (1, 10, 100, last_page // 2 or 1)}
+            | {last_page}
+        )
+        print(f"{'sort':<16}{'page':>8}{'offset ms':>12}{'cursor ms':>12}")
+        for sort_by in args.sort_by:
+            for sort_order in ("desc", "asc"):
+                # Selected as GET /api/watchlist does, every field plus the
+                # entry_id and sort_value columns cursors are built from
+                columns = listing_columns(parse_fields(), sort_by)
+                base = apply_sort(
+                    build_watchlist_query(user_id, columns=columns), sort_by, sort_order
+                )
+                for page in pages:
+                    offset = (page - 1) * args.per_page
+                    offset_query = base.offset(offset).limit(args.per_page)
+                    cursor_query = base.limit(args.per_page)
+                    if offset:
+                        # The row just before the page, as the cursor would hold
+                        row = db.session.execute(base.offset(offset - 1).limit(1)).one()
+                        cursor_query = apply_cursor(
+                            base, sort_by, sort_order, row.sort_value, row.entry_id
+                        ).limit(args.per_page)
+
+                    print(
+                        f"{sort_by + ' ' + sort_order:<16}{page:>8}"
+                        f"{time_query(offset_query, args.repeat):>12.1f}"
+                        f"{time_query(cursor_query, args.repeat):>12.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        shutil.rmtree(DB_DIR, ignore_errors=True)
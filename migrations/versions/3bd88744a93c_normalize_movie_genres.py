@@ -0,0 +1,99 @@
+"""Normalize movie genres into genres and movie_genres tables
+
+Revision ID: 3bd88744a93c
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+import json
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3bd88744a93c"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade():
+    # The app creates missing tables on startup, so they may already exist
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if "genres" not in tables:
+        op.create_table(
+            "genres",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(length=100), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("name"),
+        )
+
+    if "movie_genres" not in tables:
+        op.create_table(
+            "movie_genres",
+            sa.Column("movie_id", sa.String(length=20), nullable=False),
+            sa.Column("genre_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["genre_id"], ["genres.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["movie_id"], ["movies.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("movie_id", "genre_id"),
+        )
+
+    indexes = {index["name"] for index in inspector.get_indexes("movie_genres")}
+    if "ix_movie_genres_genre_id_movie_id" not in indexes:
+        op.create_index(
+            "ix_movie_genres_genre_id_movie_id",
+            "movie_genres",
+            ["genre_id", "movie_id"],
+        )
+
+    if "movies" in tables:
+        backfill_movie_genres(op.get_bind())
+
+
+def backfill_movie_genres(bind):
+    """Copy movies.genres JSON arrays into movie_genres for unlinked movies."""
+    meta = sa.MetaData()
+    movies = sa.Table("movies", meta, sa.Column("id"), sa.Column("genres"))
+    genres = sa.Table("genres", meta, sa.Column("id"), sa.Column("name"))
+    movie_genres = sa.Table(
+        "movie_genres", meta, sa.Column("movie_id"), sa.Column("genre_id")
+    )
+
+    linked = sa.select(movie_genres.c.movie_id).where(
+        movie_genres.c.movie_id == movies.c.id
+    )
+    rows = bind.execute(
+        sa.select(movies.c.id, movies.c.genres).where(
+            movies.c.genres.isnot(None), ~sa.exists(linked)
+        )
+    ).all()
+
+    genre_ids = dict(bind.execute(sa.select(genres.c.name, genres.c.id)).all())
+    links = []
+    for movie_id, value in rows:
+        names = json.loads(value) if isinstance(value, str) else value
+        if not isinstance(names, list):
+            continue
+        for name in dict.fromkeys(
+            n.strip() for n in names if isinstance(n, str) and n.strip()
+        ):
+            if name not in genre_ids:
+                genre_ids[name] = bind.execute(
+                    genres.insert().values(name=name).returning(genres.c.id)
+                ).scalar_one()
+            links.append({"movie_id": movie_id, "genre_id": genre_ids[name]})
+
+    for start in range(0, len(links), BATCH_SIZE):
+        bind.execute(movie_genres.insert(), links[start : start + BATCH_SIZE])
+
+
+def downgrade():
+    op.drop_index("ix_movie_genres_genre_id_movie_id", table_name="movie_genres")
+    op.drop_table("movie_genres")
+    op.drop_table("genres")
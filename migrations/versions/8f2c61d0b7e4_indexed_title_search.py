@@ -0,0 +1,63 @@
+"""Indexed movie title search (FTS5 on SQLite, pg_trgm on PostgreSQL)
+
+Revision ID: 8f2c61d0b7e4
+Revises: 3bd88744a93c
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8f2c61d0b7e4"
+down_revision = "3bd88744a93c"
+branch_labels = None
+depends_on = None
+
+SQLITE_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS movies_title_fts_insert AFTER INSERT ON movies "
+    "BEGIN INSERT INTO movie_titles_fts (movie_id, title) "
+    "VALUES (new.id, new.title); END",
+    "CREATE TRIGGER IF NOT EXISTS movies_title_fts_update "
+    "AFTER UPDATE OF id, title ON movies "
+    "WHEN old.id IS NOT new.id OR old.title IS NOT new.title "
+    "BEGIN DELETE FROM movie_titles_fts WHERE movie_id = old.id; "
+    "INSERT INTO movie_titles_fts (movie_id, title) "
+    "VALUES (new.id, new.title); END",
+    "CREATE TRIGGER IF NOT EXISTS movies_title_fts_delete AFTER DELETE ON movies "
+    "BEGIN DELETE FROM movie_titles_fts WHERE movie_id = old.id; END",
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        # The app creates the table and triggers along with a new movies table
+        if "movie_titles_fts" in sa.inspect(bind).get_table_names():
+            return
+        op.execute(
+            "CREATE VIRTUAL TABLE movie_titles_fts USING fts5("
+            "movie_id UNINDEXED, title, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "INSERT INTO movie_titles_fts (movie_id, title) SELECT id, title FROM movies"
+        )
+        for statement in SQLITE_TRIGGERS:
+            op.execute(statement)
+    elif bind.dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_movies_title_trgm "
+            "ON movies USING gin (title gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for trigger in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS movies_title_fts_{trigger}")
+        op.execute("DROP TABLE IF EXISTS movie_titles_fts")
+    elif bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_movies_title_trgm")
@@ -0,0 +1,44 @@
+"""Indexes for watchlist listing, sorting and ratings refresh
+
+Revision ID: c4a9e3f1d2b6
+Revises: 8f2c61d0b7e4
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c4a9e3f1d2b6"
+down_revision = "8f2c61d0b7e4"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    (
+        "ix_watchlist_entries_user_id_added_at",
+        "watchlist_entries",
+        ["user_id", "added_at", "id"],
+    ),
+    ("ix_watchlist_entries_movie_id", "watchlist_entries", ["movie_id"]),
+    ("ix_movies_ratings_updated_at", "movies", ["ratings_updated_at"]),
+]
+
+
+def upgrade():
+    # The app creates these along with new tables, so some may already exist
+    inspector = sa.inspect(op.get_bind())
+    existing = {
+        index["name"]
+        for table in ("watchlist_entries", "movies")
+        for index in inspector.get_indexes(table)
+    }
+    for name, table, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
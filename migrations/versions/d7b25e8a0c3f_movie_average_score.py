@@ -0,0 +1,85 @@
+"""Store and index movies.average_score
+
+Revision ID: d7b25e8a0c3f
+Revises: c4a9e3f1d2b6
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+import math
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d7b25e8a0c3f"
+down_revision = "c4a9e3f1d2b6"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("movies")}
+    if "average_score" not in columns:
+        op.add_column(
+            "movies",
+            sa.Column("average_score", sa.Float(), nullable=False, server_default="0"),
+        )
+        backfill_average_scores(op.get_bind())
+
+    indexes = {index["name"] for index in inspector.get_indexes("movies")}
+    if "ix_movies_average_score" not in indexes:
+        op.create_index("ix_movies_average_score", "movies", ["average_score"])
+
+
+def average_score(imdb_rating, tmdb_rating, rt_tomatometer):
+    # Frozen copy of utils.models.average_score
+    scores = [
+        score
+        for score in (imdb_rating, tmdb_rating, rt_tomatometer)
+        if score and score > 0
+    ]
+    if not scores:
+        return 0
+    return math.floor(sum(scores) / len(scores) * 10 + 0.5) / 10
+
+
+def backfill_average_scores(bind):
+    movies = sa.table(
+        "movies",
+        sa.column("id"),
+        sa.column("imdb_rating"),
+        sa.column("tmdb_rating"),
+        sa.column("rt_tomatometer"),
+        sa.column("average_score"),
+    )
+    rows = bind.execute(
+        sa.select(
+            movies.c.id,
+            movies.c.imdb_rating,
+            movies.c.tmdb_rating,
+            movies.c.rt_tomatometer,
+        )
+    ).all()
+    updates = [
+        {"movie_id": movie_id, "score": average_score(imdb, tmdb, rt)}
+        for movie_id, imdb, tmdb, rt in rows
+    ]
+    updates = [update for update in updates if update["score"]]
+
+    statement = (
+        movies.update()
+        .where(movies.c.id == sa.bindparam("movie_id"))
+        .values(average_score=sa.bindparam("score"))
+    )
+    for start in range(0, len(updates), BATCH_SIZE):
+        bind.execute(statement, updates[start : start + BATCH_SIZE])
+
+
+def downgrade():
+    op.drop_index("ix_movies_average_score", table_name="movies")
+    # Not batch mode: recreating movies on SQLite would drop its FTS triggers
+    op.drop_column("movies", "average_score")
@@ -0,0 +1,32 @@
+"""Add users.watchlist_version
+
+Revision ID: e5c8a1f4b9d2
+Revises: d7b25e8a0c3f
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5c8a1f4b9d2"
+down_revision = "d7b25e8a0c3f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("users")}
+    if "watchlist_version" not in columns:
+        op.add_column(
+            "users",
+            sa.Column(
+                "watchlist_version", sa.Integer(), nullable=False, server_default="0"
+            ),
+        )
+
+
+def downgrade():
+    op.drop_column("users", "watchlist_version")
@@ -168,68 +168,69 @@ function filterDuplicates(queries) {
   return queries.filter((q) => !existingQueries.has(q.query.toLowerCase()));
 }
 
-// Fetch rating from a specific platform
-async function fetchPlatformRating(movieId, platform, title, year) {
-  let url = `/api/movies/${encodeURIComponent(movieId)}/rating/${platform}`;
-
-  if (platform === 'tmdb' || platform === 'rt') {
-    const params = new URLSearchParams({ title });
-    if (year) params.append('year', year);
-    url += `?${params.toString()}`;
-  }
+// Platforms returned by the batch ratings endpoint
+const RATING_PLATFORMS = ['imdb', 'tmdb', 'rt'];
+
+// Movies per batch request - small batches keep cards filling in progressively
+const RATINGS_BATCH_SIZE = 10;
 
+// Fetch ratings for a list of movies from all platforms in one round trip per batch
+async function fetchRatingsBatch(movies, platforms = RATING_PLATFORMS) {
   try {
-    const response = await fetch(url);
+    const response = await fetch('/api/movies/ratings', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        movies: movies.map(m => ({ id: m.id, title: m.title, year: m.year })),
+        platforms,
+      }),
+    });
     const data = await response.json();
-    return data;
+    if (data.errors && data.errors.length > 0) {
+      console.warn('Some ratings had errors:', data.errors);
+    }
+    return data.ratings || {};
   } catch (error) {
-    console.error(`Error fetching ${platform} rating for ${movieId}:`, error);
-    return { rating: null, page_url: '' };
+    console.error('Error fetching ratings:', error);
+    return {};
   }
 }
 
-// Fetch all ratings for a movie and update UI progressively
-async function fetchAllRatingsForMovie(movie) {
-  const movieId = movie.id;
-  const title = movie.title;
-  const year = movie.year;
-
-  // Track pending ratings to know when all are done
-  let pendingCount = 3;
-  const checkAndReorder = () => {
-    pendingCount--;
-    if (pendingCount === 0) {
-      // All ratings loaded, finalize the card
-      MovieRenderer.finalizeShellCard(movieId);
-      MovieRenderer.reorderWithAnimation();
+// Add the HD backdrop button to a card, or remove it when no HD backdrop exists
+function updateBackdropButton(movieId, backdropUrlHd) {
+  const actionsContainer = document.getElementById(`${movieId}-actions`);
+  const existingBackdropBtn = document.getElementById(`${movieId}-backdrop-btn`);
+  const deleteBtn = document.getElementById(`${movieId}-dlt-btn`);
+
+  if (backdropUrlHd) {
+    if (!existingBackdropBtn && actionsContainer && deleteBtn) {
+      const backdropBtn = document.createElement('button');
+      backdropBtn.className = 'icon-button action-btn backdrop-button';
+      backdropBtn.type = 'button';
+      backdropBtn.id = `${movieId}-backdrop-btn`;
+      backdropBtn.setAttribute('onclick', `openBackdrop('${movieId}')`);
+      backdropBtn.setAttribute('data-tooltip', 'View HD backdrop');
+      backdropBtn.innerHTML = '<i class="fa fa-image"></i>';
+      actionsContainer.insertBefore(backdropBtn, deleteBtn);
     }
-  };
-
-  // Fetch IMDb rating
-  fetchPlatformRating(movieId, 'imdb', title, year).then(data => {
-    MovieRenderer.updateRatingPill(movieId, 'imdb', data);
-
-    // Update storage
-    const result = MovieStorage.updateMovie(movieId, {
-      imdb: {
-        rating: data.rating,
-        page_url: data.page_url,
-      }
-    });
-
-    if (result) {
-      MovieRenderer.updateAverageScore(movieId, result.movie.average_score);
-    }
-
-    checkAndReorder();
-  });
-
-  // Fetch TMDb rating
-  fetchPlatformRating(movieId, 'tmdb', title, year).then(data => {
-    MovieRenderer.updateRatingPill(movieId, 'tmdb', data);
+  } else if (existingBackdropBtn) {
+    existingBackdropBtn.remove();
+  }
+}
 
-    // Update storage with backdrop info too
-    const result = MovieStorage.updateMovie(movieId, {
+// Apply a single platform's rating to the card and storage
+function applyPlatformRating(movieId, platform, data) {
+  data = data || { rating: null, page_url: '' };
+  MovieRenderer.updateRatingPill(movieId, platform, data);
+
+  let update;
+  if (platform === 'imdb') {
+    update = {
+      imdb: { rating: data.rating, page_url: data.page_url },
+    };
+  } else if (platform === 'tmdb') {
+    // Store backdrop info too
+    update = {
       tmdb: {
         rating: data.rating,
         page_url: data.page_url,
@@ -238,68 +239,122 @@ async function fetchAllRatingsForMovie(movie) {
       },
       backdrop_url: data.backdrop_url || undefined,
       backdrop_url_hd: data.backdrop_url_hd || undefined,
-    });
+    };
+  } else {
+    // Store both tomatometer and popcornmeter
+    update = {
+      rt: {
+        rating: data.rating || data.tomatometer,
+        tomatometer: data.tomatometer,
+        popcornmeter: data.popcornmeter,
+        page_url: data.page_url,
+      },
+    };
+  }
+
+  const result = MovieStorage.updateMovie(movieId, update);
+  if (!result) return;
+
+  MovieRenderer.updateAverageScore(movieId, result.movie.average_score);
+
+  if (platform === 'tmdb') {
+    // Update backdrop preview if available
+    if (data.backdrop_url) {
+      const card = document.getElementById(movieId);
+      if (card) {
+        const existingStyle = card.querySelector('style');
+        if (existingStyle) existingStyle.remove();
 
-    if (result) {
-      MovieRenderer.updateAverageScore(movieId, result.movie.average_score);
-
-      // Update backdrop preview if available
-      if (data.backdrop_url) {
-        const card = document.getElementById(movieId);
-        if (card) {
-          const existingStyle = card.querySelector('style');
-          if (existingStyle) existingStyle.remove();
-
-          const style = document.createElement('style');
-          style.textContent = `
-            #${CSS.escape(movieId)}::before {
-              background-image: url(${data.backdrop_url});
-            }
-          `;
-          card.appendChild(style);
-        }
+        const style = document.createElement('style');
+        style.textContent = `
+          #${CSS.escape(movieId)}::before {
+            background-image: url(${data.backdrop_url});
+          }
+        `;
+        card.appendChild(style);
       }
+    }
+    updateBackdropButton(movieId, data.backdrop_url_hd);
+  }
+}
+
+// Fetch all ratings for a list of movies and update UI as each batch arrives
+async function fetchAllRatings(movies) {
+  const batches = [];
+  for (let i = 0; i < movies.length; i += RATINGS_BATCH_SIZE) {
+    batches.push(movies.slice(i, i + RATINGS_BATCH_SIZE));
+  }
 
-      // Add backdrop button if HD URL is available
-      if (data.backdrop_url_hd) {
-        const actionsContainer = document.getElementById(`${movieId}-actions`);
-        const deleteBtn = document.getElementById(`${movieId}-dlt-btn`);
-        if (actionsContainer && deleteBtn && !document.getElementById(`${movieId}-backdrop-btn`)) {
-          const backdropBtn = document.createElement('button');
-          backdropBtn.className = 'icon-button action-btn backdrop-button';
-          backdropBtn.type = 'button';
-          backdropBtn.id = `${movieId}-backdrop-btn`;
-          backdropBtn.setAttribute('onclick', `openBackdrop('${movieId}')`);
-          backdropBtn.setAttribute('data-tooltip', 'View HD backdrop');
-          backdropBtn.innerHTML = '<i class="fa fa-image"></i>';
-          actionsContainer.insertBefore(backdropBtn, deleteBtn);
-        }
+  await Promise.all(batches.map(async (batch) => {
+    const ratings = await fetchRatingsBatch(batch);
+    for (const movie of batch) {
+      const movieRatings = ratings[movie.id] || {};
+      for (const platform of RATING_PLATFORMS) {
+        applyPlatformRating(movie.id, platform, movieRatings[platform]);
       }
+      // All ratings loaded, finalize the card
+      MovieRenderer.finalizeShellCard(movie.id);
     }
+    MovieRenderer.reorderWithAnimation();
+  }));
+}
 
-    checkAndReorder();
-  });
+// How long to wait for more streamed movies before sending a ratings batch
+const RATINGS_QUEUE_DELAY_MS = 100;
 
-  // Fetch RT rating
-  fetchPlatformRating(movieId, 'rt', title, year).then(data => {
-    MovieRenderer.updateRatingPill(movieId, 'rt', data);
+// Collect movies as they stream in and fetch their ratings in batches
+function createRatingsQueue() {
+  let pending = [];
+  let timer = null;
 
-    // Update storage - store both tomatometer and popcornmeter
-    const result = MovieStorage.updateMovie(movieId, {
-      rt: {
-        rating: data.rating || data.tomatometer,
-        tomatometer: data.tomatometer,
-        popcornmeter: data.popcornmeter,
-        page_url: data.page_url,
+  const flush = () => {
+    clearTimeout(timer);
+    timer = null;
+    if (pending.length === 0) return;
+    fetchAllRatings(pending);
+    pending = [];
+  };
+
+  return {
+    push(movie) {
+      pending.push(movie);
+      if (pending.length >= RATINGS_BATCH_SIZE) {
+        flush();
+      } else if (!timer) {
+        timer = setTimeout(flush, RATINGS_QUEUE_DELAY_MS);
       }
-    });
+    },
+    flush,
+  };
+}
 
-    if (result) {
-      MovieRenderer.updateAverageScore(movieId, result.movie.average_score);
-    }
+// Read a newline-delimited JSON response, calling onEvent for each line as it arrives
+async function readNdjson(response, onEvent) {
+  const handleLine = (line) => {
+    if (line.trim()) onEvent(JSON.parse(line));
+  };
 
-    checkAndReorder();
-  });
+  // Fallback for browsers without streaming response bodies
+  if (!response.body || !response.body.getReader) {
+    (await response.text()).split('\n').forEach(handleLine);
+    return;
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop();
+    lines.forEach(handleLine);
+  }
+
+  handleLine(buffer + decoder.decode());
 }
 
 async function postSearchRequest(singleInputComponent, multiInputComponent) {
@@ -324,93 +379,114 @@ async function postSearchRequest(singleInputComponent, multiInputComponent) {
   // Phase 1: Add skeleton cards immediately
   const skeletons = MovieRenderer.addSkeletons(queries);
 
+  // Build a map of query -> skeleton for efficient lookup and removal
+  const skeletonMap = new Map();
+  for (const s of skeletons) {
+    skeletonMap.set(s.query.toLowerCase(), s);
+  }
+
+  // Phase 3: Ratings are requested in batches as shell cards appear
+  const ratingsQueue = createRatingsQueue();
+  let addedCount = 0;
+  const errors = [];
+
+  // Replace a skeleton with a shell card (has metadata, spinners for ratings)
+  const handleMovie = (movie) => {
+    // Find matching skeleton by query
+    const queryKey = movie.query.toLowerCase();
+    const matchingSkeleton = skeletonMap.get(queryKey);
+    if (!matchingSkeleton) return;
+
+    // Remove from map to prevent reuse
+    skeletonMap.delete(queryKey);
+
+    const skeleton = document.getElementById(matchingSkeleton.tempId);
+    if (!skeleton) return;
+
+    // Create shell card with spinners
+    const shellCard = MovieRenderer.createShellCard(movie, '?');
+    shellCard.classList.add('card-fade-in');
+
+    // Replace skeleton with shell card
+    skeleton.parentNode.replaceChild(shellCard, skeleton);
+
+    // Initialize movie in storage with basic data (no ratings yet)
+    const movieData = {
+      id: movie.id,
+      query: movie.query,
+      title: movie.title,
+      year: movie.year,
+      logo_url: movie.logo_url,
+      average_score: 0,
+      backdrop_url: '',
+      backdrop_url_hd: '',
+      imdb: { rating: null, page_url: '' },
+      tmdb: { rating: null, page_url: '', backdrop_url: '', backdrop_url_hd: '' },
+      rt: { rating: null, page_url: '' },
+    };
+
+    MovieStorage.add(movieData);
+    addedCount++;
+    ratingsQueue.push(movie);
+  };
+
+  // Drop the skeleton for a query that could not be resolved
+  const handleError = (error) => {
+    errors.push(error);
+    const queryKey = (error.query || '').toLowerCase();
+    const matchingSkeleton = skeletonMap.get(queryKey);
+    if (matchingSkeleton) {
+      skeletonMap.delete(queryKey);
+      MovieRenderer.removeSkeleton(matchingSkeleton.tempId);
+      MovieRenderer.updateCount();
+    }
+  };
+
   try {
-    // Phase 2: Search for movie metadata (no ratings)
+    // Phase 2: Stream movie metadata (no ratings) as each lookup finishes
     const response = await fetch("/api/movies/search", {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
+        "Accept": "application/x-ndjson",
       },
       body: JSON.stringify({ movies: queries }),
     });
 
-    const data = await response.json();
-
-    if (data.movies && data.movies.length > 0) {
-      let addedCount = 0;
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
 
-      // Build a map of query -> skeleton for efficient lookup and removal
-      const skeletonMap = new Map();
-      for (const s of skeletons) {
-        skeletonMap.set(s.query.toLowerCase(), s);
+    await readNdjson(response, (event) => {
+      if (event.type === 'movie') {
+        handleMovie(event.movie);
+      } else if (event.type === 'error') {
+        handleError(event.error);
       }
+    });
 
-      // Replace skeletons with shell cards (have metadata, spinners for ratings)
-      data.movies.forEach((movie, index) => {
-        // Find matching skeleton by query
-        const queryKey = movie.query.toLowerCase();
-        const matchingSkeleton = skeletonMap.get(queryKey);
-
-        if (matchingSkeleton) {
-          // Remove from map to prevent reuse
-          skeletonMap.delete(queryKey);
-
-          const skeleton = document.getElementById(matchingSkeleton.tempId);
-          if (skeleton) {
-            // Create shell card with spinners
-            const shellCard = MovieRenderer.createShellCard(movie, '?');
-            shellCard.classList.add('card-fade-in');
-
-            // Replace skeleton with shell card
-            skeleton.parentNode.replaceChild(shellCard, skeleton);
-
-            // Initialize movie in storage with basic data (no ratings yet)
-            const movieData = {
-              id: movie.id,
-              query: movie.query,
-              title: movie.title,
-              year: movie.year,
-              logo_url: movie.logo_url,
-              average_score: 0,
-              backdrop_url: '',
-              backdrop_url_hd: '',
-              imdb: { rating: null, page_url: '' },
-              tmdb: { rating: null, page_url: '', backdrop_url: '', backdrop_url_hd: '' },
-              rt: { rating: null, page_url: '' },
-            };
-
-            MovieStorage.add(movieData);
-            addedCount++;
-
-            // Phase 3: Fire parallel requests for each platform rating
-            fetchAllRatingsForMovie(movie);
-          }
-        }
-      });
+    ratingsQueue.flush();
 
-      // Remove any remaining skeletons (for queries that weren't found)
-      MovieRenderer.removeAllSkeletons();
-      MovieRenderer.updateCount();
+    // Remove any remaining skeletons (for queries that weren't found)
+    MovieRenderer.removeAllSkeletons();
+    MovieRenderer.updateCount();
 
-      if (addedCount > 0) {
-        showToast(`Added ${addedCount} movie${addedCount > 1 ? 's' : ''} to your list!`, "success");
-      }
+    if (addedCount > 0) {
+      showToast(`Added ${addedCount} movie${addedCount > 1 ? 's' : ''} to your list!`, "success");
     } else {
-      // Remove skeletons if no movies returned
-      MovieRenderer.removeAllSkeletons();
       showToast("No movies found for your search.", "warning");
     }
 
-    if (data.errors && data.errors.length > 0) {
-      console.warn("Some movies had errors:", data.errors);
-      // Note: Skeletons for failed queries are already removed by removeAllSkeletons() above
+    if (errors.length > 0) {
+      console.warn("Some movies had errors:", errors);
 
-      if (data.errors.length === queries.length) {
+      if (errors.length === queries.length) {
         showToast("Could not find any of the requested movies.", "error");
       }
     }
   } catch (error) {
     console.error("Error fetching movies:", error);
+    ratingsQueue.flush();
     // Remove skeletons on error
     MovieRenderer.removeAllSkeletons();
     showToast("Failed to fetch movie data. Please try again.", "error");
@@ -459,85 +535,20 @@ async function refreshMovie(movieId) {
     avgScoreEl.innerHTML = '<i class="fa fa-spinner fa-spin"></i>';
   }
 
-  // Track pending ratings
-  let pendingCount = 3;
-  const checkAndFinalize = () => {
-    pendingCount--;
-    if (pendingCount === 0) {
-      // All ratings refreshed
-      if (refreshBtn) {
-        refreshBtn.removeAttribute("disabled");
-        refreshBtn.innerHTML = '<i class="fa fa-refresh"></i>';
-      }
-      MovieRenderer.reorderWithAnimation();
-      showToast("Ratings refreshed!", "success");
-    }
-  };
-
-  const title = movie.title;
-  const year = movie.year;
-
-  // Fetch IMDb rating
-  fetchPlatformRating(movieId, 'imdb', title, year).then(data => {
-    MovieRenderer.updateRatingPill(movieId, 'imdb', data);
-    const result = MovieStorage.updateMovie(movieId, {
-      imdb: { rating: data.rating, page_url: data.page_url }
-    });
-    if (result) {
-      MovieRenderer.updateAverageScore(movieId, result.movie.average_score);
-    }
-    checkAndFinalize();
-  });
-
-  // Fetch TMDb rating
-  fetchPlatformRating(movieId, 'tmdb', title, year).then(data => {
-    MovieRenderer.updateRatingPill(movieId, 'tmdb', data);
-    const result = MovieStorage.updateMovie(movieId, {
-      tmdb: { rating: data.rating, page_url: data.page_url, backdrop_url: data.backdrop_url, backdrop_url_hd: data.backdrop_url_hd },
-      backdrop_url: data.backdrop_url || undefined,
-      backdrop_url_hd: data.backdrop_url_hd || undefined,
-    });
-    if (result) {
-      MovieRenderer.updateAverageScore(movieId, result.movie.average_score);
-    }
-    // Add or remove backdrop button based on HD URL availability
-    const actionsContainer = document.getElementById(`${movieId}-actions`);
-    const existingBackdropBtn = document.getElementById(`${movieId}-backdrop-btn`);
-    const deleteBtn = document.getElementById(`${movieId}-dlt-btn`);
-
-    if (data.backdrop_url_hd) {
-      if (!existingBackdropBtn && actionsContainer && deleteBtn) {
-        const backdropBtn = document.createElement('button');
-        backdropBtn.className = 'icon-button action-btn backdrop-button';
-        backdropBtn.type = 'button';
-        backdropBtn.id = `${movieId}-backdrop-btn`;
-        backdropBtn.setAttribute('onclick', `openBackdrop('${movieId}')`);
-        backdropBtn.setAttribute('data-tooltip', 'View HD backdrop');
-        backdropBtn.innerHTML = '<i class="fa fa-image"></i>';
-        actionsContainer.insertBefore(backdropBtn, deleteBtn);
-      }
-    } else if (existingBackdropBtn) {
-      existingBackdropBtn.remove();
-    }
-    checkAndFinalize();
-  });
+  // Fetch all platform ratings in a single request
+  const ratings = await fetchRatingsBatch([movie]);
+  const movieRatings = ratings[movieId] || {};
+  for (const platform of RATING_PLATFORMS) {
+    applyPlatformRating(movieId, platform, movieRatings[platform]);
+  }
 
-  // Fetch RT rating
-  fetchPlatformRating(movieId, 'rt', title, year).then(data => {
-    MovieRenderer.updateRatingPill(movieId, 'rt', data);
-    const result = MovieStorage.updateMovie(movieId, {
-      rt: {
-        rating: data.rating || data.tomatometer,
-        tomatometer: data.tomatometer,
-        popcornmeter: data.popcornmeter,
-        page_url: data.page_url,
-      }
-    });
-    if (result) {
-      MovieRenderer.updateAverageScore(movieId, result.movie.average_score);
-    }
-    checkAndFinalize();
-  });
+  // All ratings refreshed
+  if (refreshBtn) {
+    refreshBtn.removeAttribute("disabled");
+    refreshBtn.innerHTML = '<i class="fa fa-refresh"></i>';
+  }
+  MovieRenderer.reorderWithAnimation();
+  showToast("Ratings refreshed!", "success");
 }
 
 // Simple toast notification system
@@ -100,6 +100,7 @@ const WatchlistRenderer = {
             <option value="year:desc">Year (New-Old)</option>
             <option value="year:asc">Year (Old-New)</option>
             <option value="title:asc">Title (A-Z)</option>
+            <option value="average_score:desc">Average Score (High-Low)</option>
           </select>
         </div>
       </div>
@@ -11,7 +11,8 @@ const WatchlistStorage = {
    */
   async loadIds() {
     try {
-      const response = await fetch('/api/watchlist?per_page=1000');
+      // The browser revalidates with the ETag: unchanged watchlists are a 304
+      const response = await fetch('/api/watchlist/ids');
       if (response.status === 401) {
         this._cachedIds.clear();
         this._cacheLoaded = true;
@@ -19,7 +20,7 @@ const WatchlistStorage = {
       }
       if (response.ok) {
         const data = await response.json();
-        this._cachedIds = new Set(data.movies.map(m => m.id));
+        this._cachedIds = new Set(data.ids);
         this._cacheLoaded = true;
       }
     } catch (error) {
@@ -37,7 +38,7 @@ const WatchlistStorage = {
   /**
    * Get all movies in the user's watchlist with optional filters
    * @param {Object} options - Filter, sort, and pagination options
-   * @returns {Promise<Object>} - { movies, total, page, per_page, pages }
+   * @returns {Promise<Object>} - { movies, total, page, per_page, pages, next_cursor }
    */
   async getAll(options = {}) {
     const params = new URLSearchParams();
@@ -51,6 +52,7 @@ const WatchlistStorage = {
     if (options.sort_order) params.append("sort_order", options.sort_order);
     if (options.page) params.append("page", options.page);
     if (options.per_page) params.append("per_page", options.per_page);
+    if (options.cursor) params.append("cursor", options.cursor);
 
     const url = `/api/watchlist${params.toString() ? "?" + params.toString() : ""}`;
 
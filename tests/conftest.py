@@ -1,7 +1,10 @@
+import json
+from datetime import datetime, timedelta
+
 import pytest
 
 from app import app as flask_app
-from utils.models import User, db
+from utils.models import Movie, User, WatchlistEntry, db
 
 
 @pytest.fixture
@@ -51,3 +54,71 @@ def sample_user(app):
         user_id = user.id
         user_email = user.email
     return {"id": user_id, "email": user_email, "password": "password123"}
+
+
+@pytest.fixture
+def auth_client(client, sample_user):
+    """Test client logged in as the sample user."""
+    client.post(
+        "/api/auth/login",
+        data=json.dumps(
+            {"email": sample_user["email"], "password": sample_user["password"]}
+        ),
+        content_type="application/json",
+    )
+    return client
+
+
+@pytest.fixture
+def add_to_watchlist(app, sample_user):
+    """Add movies, given as Movie fields, to the sample user's watchlist."""
+
+    def add(movies, added_at=None):
+        for i, fields in enumerate(movies):
+            db.session.add(Movie(**fields))
+            entry = WatchlistEntry(user_id=sample_user["id"], movie_id=fields["id"])
+            if added_at is not None:
+                entry.added_at = added_at(i)
+            db.session.add(entry)
+        db.session.commit()
+
+    return add
+
+
+@pytest.fixture
+def watchlist(add_to_watchlist):
+    """Twelve watchlisted movies with repeated and missing sort values."""
+    added = datetime(2024, 1, 1)
+    add_to_watchlist(
+        [
+            {
+                "id": f"tt{i:07d}",
+                "title": f"Movie {i % 4}",
+                "year": None if i % 5 == 0 else 1990 + i % 3,
+                "imdb_rating": None if i % 3 == 0 else float(5 + i % 2),
+                "rt_tomatometer": float(i % 4),
+                "rt_popcornmeter": None,
+            }
+            for i in range(12)
+        ],
+        added_at=lambda i: added + timedelta(days=i // 2),
+    )
+
+
+@pytest.fixture
+def add_movie(app):
+    """Add The Matrix (tt0133093), rated at updated_at, with the given fields."""
+
+    def add(updated_at, **fields):
+        fields.setdefault("year", 1999)
+        db.session.add(
+            Movie(
+                id="tt0133093",
+                title="The Matrix",
+                ratings_updated_at=updated_at,
+                **fields,
+            )
+        )
+        db.session.commit()
+
+    return add
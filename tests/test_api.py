@@ -3,11 +3,13 @@
 import json
 from unittest.mock import MagicMock, patch
 
+import requests
+
 
 class TestRottenTomatoesAPI:
     """Tests for Rotten Tomatoes scraper with mocked requests."""
 
-    @patch("utils.api.rt.requests.get")
+    @patch("utils.api.session.requests.Session.get")
     def test_fetch_rt_with_year_suffix(self, mock_get):
         """Test RT fetches year-suffixed URL first when year provided."""
         from utils.api.rt import fetch_movie_data_from_rt
@@ -40,10 +42,9 @@ class TestRottenTomatoesAPI:
             headers={
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
             },
-            timeout=10,
         )
 
-    @patch("utils.api.rt.requests.get")
+    @patch("utils.api.session.requests.Session.get")
     def test_fetch_rt_fallback_to_title_only(self, mock_get):
         """Test RT falls back to title-only URL when year-suffixed fails."""
         from utils.api.rt import fetch_movie_data_from_rt
@@ -79,7 +80,7 @@ class TestRottenTomatoesAPI:
         assert result["year"] == 2010
         assert mock_get.call_count == 2  # Tried both URLs
 
-    @patch("utils.api.rt.requests.get")
+    @patch("utils.api.session.requests.Session.get")
     def test_fetch_rt_without_year(self, mock_get):
         """Test RT fetches title-only URL when no year provided."""
         from utils.api.rt import fetch_movie_data_from_rt
@@ -106,7 +107,7 @@ class TestRottenTomatoesAPI:
         assert "inception" in result["page_url"]
         assert "_" not in result["page_url"].split("/")[-1]  # No year suffix
 
-    @patch("utils.api.rt.requests.get")
+    @patch("utils.api.session.requests.Session.get")
     def test_fetch_rt_no_rating(self, mock_get):
         """Test RT returns zero rating when no aggregate rating found."""
         from utils.api.rt import fetch_movie_data_from_rt
@@ -129,7 +130,7 @@ class TestRottenTomatoesAPI:
 
         assert result["rating"] == 0.0
 
-    @patch("utils.api.rt.requests.get")
+    @patch("utils.api.session.requests.Session.get")
     def test_fetch_rt_404(self, mock_get):
         """Test RT returns empty result on 404."""
         from utils.api.rt import fetch_movie_data_from_rt
@@ -143,19 +144,98 @@ class TestRottenTomatoesAPI:
         assert result["rating"] == 0.0
         assert result["page_url"] == ""
 
-    @patch("utils.api.rt.requests.get")
+    @patch("utils.api.session.requests.Session.get")
     def test_fetch_rt_request_exception(self, mock_get):
-        """Test RT handles request exceptions gracefully."""
+        """Test RT reports timeouts as transient failures, not as misses."""
+        import pytest
         import requests
 
+        from utils.api.exception_handler import TransientAPIError
         from utils.api.rt import fetch_movie_data_from_rt
 
         mock_get.side_effect = requests.exceptions.Timeout()
 
-        result = fetch_movie_data_from_rt("Some Movie")
+        with pytest.raises(TransientAPIError):
+            fetch_movie_data_from_rt("Some Movie")
 
-        assert result["rating"] == 0.0
-        assert result["page_url"] == ""
+    @patch("utils.api.session.requests.Session.get")
+    def test_fetch_rt_server_error(self, mock_get):
+        """Test RT 5xx, 429, 401 and 403 responses are transient failures."""
+        import pytest
+
+        from utils.api.exception_handler import TransientAPIError
+        from utils.api.rt import fetch_movie_data_from_rt
+
+        for status_code in (401, 403, 429, 503):
+            mock_response = MagicMock()
+            mock_response.status_code = status_code
+            mock_get.return_value = mock_response
+
+            with pytest.raises(TransientAPIError):
+                fetch_movie_data_from_rt("Some Movie")
+
+
+class TestProviderSessions:
+    """Tests for pooled provider HTTP sessions."""
+
+    def test_get_session_is_shared_per_provider(self):
+        """Test each provider gets one session reused across calls."""
+        from utils.api.session import close_sessions, get_session
+
+        close_sessions()
+
+        assert get_session("imdb") is get_session("imdb")
+        assert get_session("imdb") is not get_session("tmdb")
+
+        close_sessions()
+
+    def test_get_session_is_thread_safe(self):
+        """Test concurrent first calls all receive the same session."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from utils.api.session import close_sessions, get_session
+
+        close_sessions()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            sessions = list(executor.map(lambda _: get_session("rt"), range(32)))
+
+        assert len({id(session) for session in sessions}) == 1
+
+        close_sessions()
+
+    def test_create_session_pool_settings(self):
+        """Test session adapter carries pool size and default timeout."""
+        from utils.api.session import create_session
+
+        session = create_session(timeout=3, pool_connections=2, pool_maxsize=4)
+        adapter = session.get_adapter("https://api.themoviedb.org")
+
+        assert adapter.timeout == 3
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 4
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_default_timeout_applied(self, mock_send):
+        """Test the provider timeout is used when the caller passes none."""
+        from utils.api.session import create_session
+
+        url = "https://api.themoviedb.org/3/search/movie"
+        adapter = create_session(timeout=7).get_adapter(url)
+        adapter.send(requests.Request("GET", url).prepare())
+
+        assert mock_send.call_args[1]["timeout"] == 7
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_explicit_timeout_wins(self, mock_send):
+        """Test an explicit timeout overrides the provider default."""
+        from utils.api.session import create_session
+
+        url = "https://api.themoviedb.org/3/search/movie"
+        adapter = create_session(timeout=7).get_adapter(url)
+        adapter.send(requests.Request("GET", url).prepare(), timeout=1)
+
+        assert mock_send.call_args[1]["timeout"] == 1
 
 
 class TestTitleToSlug:
@@ -189,7 +269,7 @@ class TestTitleToSlug:
 class TestTmdbAPI:
     """Tests for TMDb API with mocked requests."""
 
-    @patch("utils.api.tmdb.requests.get")
+    @patch("utils.api.session.requests.Session.get")
     def test_fetch_tmdb_success(self, mock_get):
         """Test successful TMDb fetch."""
         from utils.api.tmdb import fetch_movie_data_from_tmdb
@@ -215,7 +295,7 @@ class TestTmdbAPI:
         assert result["vote_average"] == 8.2
         assert result["year"] == 1999
 
-    @patch("utils.api.tmdb.requests.get")
+    @patch("utils.api.session.requests.Session.get")
     def test_fetch_tmdb_no_results(self, mock_get):
         """Test TMDb returns None when no results."""
         from utils.api.tmdb import fetch_movie_data_from_tmdb
@@ -228,7 +308,38 @@ class TestTmdbAPI:
 
         assert result is None
 
-    @patch("utils.api.tmdb.requests.get")
+    @patch("utils.api.session.requests.Session.get")
+    def test_fetch_tmdb_transient_failures(self, mock_get):
+        """Test timeouts, 5xx and auth errors raise TransientAPIError."""
+        import pytest
+
+        from utils.api.exception_handler import TransientAPIError
+        from utils.api.tmdb import fetch_movie_data_from_tmdb
+
+        mock_get.side_effect = requests.exceptions.ConnectionError()
+        with pytest.raises(TransientAPIError):
+            fetch_movie_data_from_tmdb("The Matrix", 1999)
+
+        mock_get.side_effect = None
+        for status_code in (401, 403, 502):
+            error_response = requests.Response()
+            error_response.status_code = status_code
+            mock_get.return_value = error_response
+            with pytest.raises(TransientAPIError):
+                fetch_movie_data_from_tmdb("The Matrix", 1999)
+
+    @patch("utils.api.session.requests.Session.get")
+    def test_fetch_tmdb_client_error_is_miss(self, mock_get):
+        """Test a 4xx response is a definitive miss."""
+        from utils.api.tmdb import fetch_movie_data_from_tmdb
+
+        error_response = requests.Response()
+        error_response.status_code = 404
+        mock_get.return_value = error_response
+
+        assert fetch_movie_data_from_tmdb("The Matrix", 1999) is None
+
+    @patch("utils.api.session.requests.Session.get")
     def test_fetch_tmdb_extracts_year(self, mock_get):
         """Test TMDb extracts year from release_date."""
         from utils.api.tmdb import fetch_movie_data_from_tmdb
@@ -250,7 +361,7 @@ class TestTmdbAPI:
 
         assert result["year"] == 2019
 
-    @patch("utils.api.tmdb.requests.get")
+    @patch("utils.api.session.requests.Session.get")
     def test_fetch_tmdb_missing_release_date(self, mock_get):
         """Test TMDb handles missing release_date."""
         from utils.api.tmdb import fetch_movie_data_from_tmdb
@@ -272,7 +383,7 @@ class TestTmdbAPI:
 
         assert result["year"] is None
 
-    @patch("utils.api.tmdb.requests.get")
+    @patch("utils.api.session.requests.Session.get")
     def test_fetch_tmdb_includes_year_param(self, mock_get):
         """Test TMDb includes year in API params when provided."""
         from utils.api.tmdb import fetch_movie_data_from_tmdb
@@ -286,7 +397,7 @@ class TestTmdbAPI:
         call_args = mock_get.call_args
         assert call_args[1]["params"]["year"] == 1999
 
-    @patch("utils.api.tmdb.requests.get")
+    @patch("utils.api.session.requests.Session.get")
     def test_fetch_tmdb_no_year_param_when_none(self, mock_get):
         """Test TMDb excludes year param when not provided."""
         from utils.api.tmdb import fetch_movie_data_from_tmdb
@@ -379,6 +490,478 @@ class TestMovieRatingEndpoints:
         assert "Unknown platform" in data["error"]
 
 
+class TestCacheStatsEndpoint:
+    """Tests for the lookup cache stats endpoint."""
+
+    def test_cache_stats(self, auth_client):
+        """Test cache and coalescing counters are reported."""
+        response = auth_client.get("/api/cache/stats")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert "hits" in data["cache"]
+        assert "collapsed" in data["coalescing"]
+
+    def test_cache_stats_requires_login(self, client):
+        """Test anonymous requests get a JSON 401."""
+        assert client.get("/api/cache/stats").status_code == 401
+
+
+class TestMovieRatingsBatchEndpoint:
+    """Tests for the batch movie ratings endpoint."""
+
+    def test_batch_ratings_success(self, client):
+        """Test batch endpoint returns ratings keyed by movie and platform."""
+        with patch("app.fetch_ratings_parallel") as mock_fetch:
+            mock_fetch.return_value = {
+                "ratings": {
+                    "tt0133093": {
+                        "imdb": {"rating": 8.7, "page_url": ""},
+                        "tmdb": {"rating": 8.2, "page_url": ""},
+                        "rt": {"rating": 8.3, "page_url": ""},
+                    }
+                },
+                "errors": [],
+            }
+
+            response = client.post(
+                "/api/movies/ratings",
+                data=json.dumps(
+                    {
+                        "movies": [
+                            {"id": "tt0133093", "title": "The Matrix", "year": 1999}
+                        ]
+                    }
+                ),
+                content_type="application/json",
+            )
+
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            assert data["ratings"]["tt0133093"]["imdb"]["rating"] == 8.7
+            mock_fetch.assert_called_once_with(
+                [{"id": "tt0133093", "title": "The Matrix", "year": 1999}],
+                ["imdb", "tmdb", "rt"],
+            )
+
+    def test_batch_ratings_platform_subset(self, client):
+        """Test batch endpoint only fetches requested platforms."""
+        with patch("app.fetch_ratings_parallel") as mock_fetch:
+            mock_fetch.return_value = {"ratings": {}, "errors": []}
+
+            response = client.post(
+                "/api/movies/ratings",
+                data=json.dumps(
+                    {"movies": [{"id": "tt0133093"}], "platforms": ["IMDB"]}
+                ),
+                content_type="application/json",
+            )
+
+            assert response.status_code == 200
+            mock_fetch.assert_called_once_with(
+                [{"id": "tt0133093", "title": "", "year": None}], ["imdb"]
+            )
+
+    def test_batch_ratings_missing_title(self, client):
+        """Test movies without a title are reported when TMDb/RT are requested."""
+        with patch("app.fetch_ratings_parallel") as mock_fetch:
+            mock_fetch.return_value = {"ratings": {}, "errors": []}
+
+            response = client.post(
+                "/api/movies/ratings",
+                data=json.dumps({"movies": [{"id": "tt0133093"}]}),
+                content_type="application/json",
+            )
+
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            assert data["errors"] == [{"id": "tt0133093", "error": "title is required"}]
+            mock_fetch.assert_not_called()
+
+    def test_batch_ratings_non_string_fields(self, client):
+        """Test ids and titles that are not strings are reported per movie."""
+        with patch("app.fetch_ratings_parallel") as mock_fetch:
+            mock_fetch.return_value = {"ratings": {}, "errors": []}
+
+            response = client.post(
+                "/api/movies/ratings",
+                data=json.dumps(
+                    {
+                        "movies": [
+                            {"id": ["x"], "title": "The Matrix"},
+                            {"id": "tt0133093", "title": 123, "year": 1999},
+                        ]
+                    }
+                ),
+                content_type="application/json",
+            )
+
+            assert response.status_code == 200
+            assert json.loads(response.data)["errors"] == [
+                {"id": None, "error": "id must be a string"},
+                {"id": "tt0133093", "error": "title must be a string"},
+            ]
+            mock_fetch.assert_not_called()
+
+    def test_batch_ratings_unknown_platform(self, client):
+        """Test batch endpoint rejects unknown platforms."""
+        response = client.post(
+            "/api/movies/ratings",
+            data=json.dumps({"movies": [], "platforms": ["netflix"]}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert "Unknown platform" in data["error"]
+
+    def test_batch_ratings_missing_movies_key(self, client):
+        """Test batch endpoint requires movies key."""
+        response = client.post(
+            "/api/movies/ratings",
+            data=json.dumps({"ids": []}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 400
+
+    def test_batch_ratings_too_many_movies(self, client):
+        """Test batch endpoint caps the number of movies per request."""
+        movies = [{"id": f"tt{i:07d}", "title": "Movie"} for i in range(101)]
+
+        response = client.post(
+            "/api/movies/ratings",
+            data=json.dumps({"movies": movies}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 400
+
+
+class TestStoredRatingsTier:
+    """Tests for serving and storing ratings through the Movie table."""
+
+    def test_fresh_row_served_without_lookup(self, app, client, add_movie):
+        """Test a recently rated movie is served from its row."""
+        from datetime import datetime
+
+        add_movie(datetime.utcnow(), imdb_rating=8.7, imdb_page_url="imdb-url")
+
+        with patch("app.fetch_imdb_rating") as mock_fetch:
+            response = client.get("/api/movies/tt0133093/rating/imdb")
+
+        assert json.loads(response.data) == {"rating": 8.7, "page_url": "imdb-url"}
+        mock_fetch.assert_not_called()
+
+    def test_stale_row_refreshed_and_written_back(self, app, client, add_movie):
+        """Test a stale row is looked up again and updated with the result."""
+        from datetime import datetime, timedelta
+
+        from utils.models import Movie
+
+        add_movie(datetime.utcnow() - timedelta(days=30), rt_tomatometer=8.0)
+
+        with patch("app.fetch_rt_rating") as mock_fetch:
+            mock_fetch.return_value = {
+                "rating": 8.3,
+                "tomatometer": 8.3,
+                "popcornmeter": 8.5,
+                "page_url": "rt-url",
+            }
+            response = client.get(
+                "/api/movies/tt0133093/rating/rt?title=The Matrix&year=1999"
+            )
+
+        assert json.loads(response.data)["rating"] == 8.3
+        with app.app_context():
+            movie = Movie.query.get("tt0133093")
+            assert movie.rt_tomatometer == 8.3
+            assert movie.rt_popcornmeter == 8.5
+            # One platform's lookup says nothing about the others' freshness
+            assert movie.ratings_updated_at < datetime.utcnow() - timedelta(days=29)
+
+    def test_lookup_of_every_platform_marks_row_fresh(self, app, client, add_movie):
+        """Test ratings_updated_at moves once all platforms were looked up."""
+        from datetime import datetime, timedelta
+
+        from utils.models import Movie
+
+        add_movie(datetime.utcnow() - timedelta(days=30))
+
+        with patch("app.fetch_ratings_parallel") as mock_fetch:
+            mock_fetch.return_value = {
+                "ratings": {
+                    "tt0133093": {
+                        "imdb": {"rating": 8.7, "page_url": ""},
+                        "tmdb": {"rating": 8.2, "page_url": ""},
+                        "rt": {"rating": None, "tomatometer": None, "page_url": ""},
+                    }
+                },
+                "errors": [],
+            }
+            client.post(
+                "/api/movies/ratings",
+                data=json.dumps(
+                    {
+                        "movies": [
+                            {"id": "tt0133093", "title": "The Matrix", "year": 1999}
+                        ]
+                    }
+                ),
+                content_type="application/json",
+            )
+
+        with app.app_context():
+            movie = Movie.query.get("tt0133093")
+            assert movie.tmdb_rating == 8.2
+            assert movie.ratings_updated_at > datetime.utcnow() - timedelta(minutes=1)
+
+    def test_lookup_under_other_title_not_written_back(self, app, client, add_movie):
+        """Test a title-based lookup for another film leaves the row alone."""
+        from datetime import datetime, timedelta
+
+        from utils.models import Movie
+
+        add_movie(datetime.utcnow() - timedelta(days=30), rt_tomatometer=8.0)
+
+        with patch("app.fetch_rt_rating") as mock_fetch:
+            mock_fetch.return_value = {
+                "rating": 1.2,
+                "tomatometer": 1.2,
+                "popcornmeter": 1.0,
+                "page_url": "other-url",
+            }
+            response = client.get(
+                "/api/movies/tt0133093/rating/rt?title=Another Film&year=1999"
+            )
+
+        assert json.loads(response.data)["rating"] == 1.2
+        with app.app_context():
+            assert Movie.query.get("tt0133093").rt_tomatometer == 8.0
+
+    def test_non_string_title_not_written_back(self, app, add_movie):
+        """Test a lookup with a title that is not a string is skipped."""
+        from datetime import datetime, timedelta
+
+        from utils.ratings_store import storable_ratings
+
+        add_movie(datetime.utcnow() - timedelta(days=30))
+        ratings = {"tt0133093": {"tmdb": {"rating": 8.2}, "imdb": {"rating": 8.7}}}
+
+        with app.app_context():
+            kept = storable_ratings(ratings, [{"id": "tt0133093", "title": 123}])
+
+        assert kept == {"tt0133093": {"imdb": {"rating": 8.7}}}
+
+    def test_missing_rating_not_written_back(self, app, client, add_movie):
+        """Test a lookup without a score leaves the stored rating alone."""
+        from datetime import datetime, timedelta
+
+        from utils.models import Movie
+
+        add_movie(datetime.utcnow() - timedelta(days=30), imdb_rating=8.7)
+
+        with patch("app.fetch_imdb_rating") as mock_fetch:
+            mock_fetch.return_value = {"rating": None, "page_url": ""}
+            client.get("/api/movies/tt0133093/rating/imdb")
+
+        with app.app_context():
+            assert Movie.query.get("tt0133093").imdb_rating == 8.7
+
+    def test_batch_only_looks_up_missing_platforms(self, app, client, add_movie):
+        """Test the batch endpoint combines stored and looked-up ratings."""
+        from datetime import datetime
+
+        add_movie(datetime.utcnow(), imdb_rating=8.7, tmdb_rating=8.2)
+
+        with patch("app.fetch_ratings_parallel") as mock_fetch:
+            mock_fetch.return_value = {
+                "ratings": {"tt0133093": {"rt": {"rating": 8.3, "page_url": ""}}},
+                "errors": [],
+            }
+            response = client.post(
+                "/api/movies/ratings",
+                data=json.dumps(
+                    {"movies": [{"id": "tt0133093", "title": "The Matrix"}]}
+                ),
+                content_type="application/json",
+            )
+
+        ratings = json.loads(response.data)["ratings"]["tt0133093"]
+        assert ratings["imdb"]["rating"] == 8.7
+        assert ratings["tmdb"]["rating"] == 8.2
+        assert ratings["rt"]["rating"] == 8.3
+        mock_fetch.assert_called_once_with(
+            [{"id": "tt0133093", "title": "The Matrix", "year": None}], ["rt"]
+        )
+
+    def test_stored_genres_served_without_lookup(self, app, client, add_movie):
+        """Test genres stored on the row are served directly."""
+        from datetime import datetime
+
+        add_movie(datetime.utcnow(), genres=["Action", "Sci-Fi"])
+
+        with patch("app.fetch_imdb_genres") as mock_fetch:
+            response = client.get("/api/movies/tt0133093/genres")
+
+        assert json.loads(response.data) == {"genres": ["Action", "Sci-Fi"]}
+        mock_fetch.assert_not_called()
+
+
+class TestRatingCacheHeaders:
+    """Tests for HTTP caching headers and 304s on the rating endpoints."""
+
+    def test_stored_rating_headers_follow_the_row(self, app, client, add_movie):
+        """Test a stored rating is cacheable until the row goes stale."""
+        from datetime import datetime, timedelta
+
+        from utils.ratings_store import RATINGS_MAX_AGE
+
+        updated_at = datetime.utcnow().replace(microsecond=0) - timedelta(hours=1)
+        add_movie(updated_at, imdb_rating=8.7)
+
+        response = client.get("/api/movies/tt0133093/rating/imdb")
+
+        assert response.status_code == 200
+        assert response.headers["ETag"]
+        assert response.last_modified.replace(tzinfo=None) == updated_at
+        assert response.cache_control.public
+        expected = (RATINGS_MAX_AGE - timedelta(hours=1)).total_seconds()
+        assert expected - 5 <= response.cache_control.max_age <= expected
+
+    def test_public_rating_does_not_vary_on_cookie(self, app, client, add_movie):
+        """Test shared caches can keep one copy of an anonymous rating."""
+        from datetime import datetime
+
+        add_movie(datetime.utcnow(), imdb_rating=8.7)
+
+        response = client.get("/api/movies/tt0133093/rating/imdb")
+
+        assert response.cache_control.public
+        assert "Cookie" not in response.vary
+
+    def test_revalidation_gets_not_modified(self, app, client, add_movie):
+        """Test If-None-Match and If-Modified-Since get an empty 304."""
+        from datetime import datetime
+
+        add_movie(datetime.utcnow(), imdb_rating=8.7)
+        first = client.get("/api/movies/tt0133093/rating/imdb")
+
+        by_etag = client.get(
+            "/api/movies/tt0133093/rating/imdb",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+        by_date = client.get(
+            "/api/movies/tt0133093/rating/imdb",
+            headers={"If-Modified-Since": first.headers["Last-Modified"]},
+        )
+
+        assert by_etag.status_code == 304
+        assert by_etag.data == b""
+        assert by_date.status_code == 304
+
+    def test_changed_rating_is_modified(self, app, client, add_movie):
+        """Test an old ETag no longer matches once the rating changes."""
+        from datetime import datetime
+
+        from utils.models import Movie, db
+
+        add_movie(datetime.utcnow(), imdb_rating=8.7)
+        etag = client.get("/api/movies/tt0133093/rating/imdb").headers["ETag"]
+        with app.app_context():
+            db.session.get(Movie, "tt0133093").imdb_rating = 8.8
+            db.session.commit()
+
+        response = client.get(
+            "/api/movies/tt0133093/rating/imdb", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert json.loads(response.data)["rating"] == 8.8
+
+    def test_looked_up_rating_headers_follow_the_cache_entry(self, client):
+        """Test a looked-up rating is cacheable for what is left of its TTL."""
+        import time
+
+        from utils.helpers import CACHE_TTLS, _cache
+
+        _cache.clear()
+        with patch("utils.helpers.get_imdb_rating") as mock_get:
+            mock_get.return_value = {"rating": 8.7, "page_url": "imdb-url"}
+            first = client.get("/api/movies/tt0133093/rating/imdb")
+            again = client.get(
+                "/api/movies/tt0133093/rating/imdb",
+                headers={"If-None-Match": first.headers["ETag"]},
+            )
+
+        entry = _cache.get_entry("imdb_rating", "tt0133093", record_stats=False)
+        assert first.last_modified.timestamp() == int(entry.stored_at)
+        assert CACHE_TTLS["imdb_rating"] - 5 <= first.cache_control.max_age
+        assert first.cache_control.max_age <= entry.expires_at - time.time() + 1
+        assert again.status_code == 304
+        mock_get.assert_called_once()
+
+    def test_stale_entry_served_while_revalidating(self, client):
+        """Test a stale cache entry has no max-age left but a grace period."""
+        import time
+
+        from utils.cache.base import CacheEntry
+
+        entry = CacheEntry(
+            {"rating": 8.7, "page_url": ""},
+            stored_at=time.time() - 7200,
+            ttl=3600,
+            grace=86400,
+        )
+        with patch("app.fetch_imdb_rating") as mock_fetch, patch(
+            "app.rating_cache_entry"
+        ) as mock_entry:
+            mock_fetch.return_value = entry.value
+            mock_entry.return_value = entry
+            response = client.get("/api/movies/tt0133093/rating/imdb")
+
+        assert response.cache_control.max_age == 0
+        assert 86400 - 3600 - 5 <= response.cache_control.stale_while_revalidate
+        assert response.cache_control.stale_while_revalidate <= 86400 - 3600
+
+    def test_uncached_result_must_be_revalidated(self, client):
+        """Test a result without a cache entry is sent with no-cache."""
+        with patch("app.fetch_imdb_rating") as mock_fetch, patch(
+            "app.rating_cache_entry", return_value=None
+        ):
+            mock_fetch.return_value = {"rating": 8.7, "page_url": ""}
+            response = client.get("/api/movies/tt0133093/rating/imdb")
+
+        assert response.cache_control.no_cache
+        assert response.headers["ETag"]
+
+    def test_stored_genres_cacheable(self, app, client, add_movie):
+        """Test genres stored on the row are cacheable for the genres TTL."""
+        from datetime import datetime
+
+        from utils.helpers import CACHE_TTLS
+
+        add_movie(datetime.utcnow(), genres=["Action"])
+
+        response = client.get("/api/movies/tt0133093/genres")
+        again = client.get(
+            "/api/movies/tt0133093/genres",
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+
+        assert response.cache_control.public
+        assert response.cache_control.max_age == CACHE_TTLS["imdb_genres"]
+        assert again.status_code == 304
+
+    def test_errors_not_cacheable(self, client):
+        """Test error responses carry no caching headers."""
+        response = client.get("/api/movies/tt0133093/rating/unknown")
+
+        assert response.status_code == 400
+        assert "ETag" not in response.headers
+        assert "Cache-Control" not in response.headers
+
+
 class TestMovieSearchEndpoint:
     """Tests for movie search API endpoint."""
 
@@ -432,3 +1015,55 @@ class TestMovieSearchEndpoint:
         assert response.status_code == 400
         data = json.loads(response.data)
         assert "array" in data["error"]
+
+    def test_search_movies_ndjson_stream(self, client):
+        """Test search streams one NDJSON line per result when requested."""
+        with patch("app.iter_search_movies") as mock_iter:
+            mock_iter.return_value = iter(
+                [
+                    ("movie", {"id": "tt0133093", "query": "The Matrix 1999"}),
+                    (
+                        "error",
+                        {"query": "Nonexistent 2099", "error": "Movie not found"},
+                    ),
+                ]
+            )
+
+            response = client.post(
+                "/api/movies/search",
+                data=json.dumps(
+                    {
+                        "movies": [
+                            {"query": "The Matrix 1999"},
+                            {"query": "Nonexistent 2099"},
+                        ]
+                    }
+                ),
+                content_type="application/json",
+                headers={"Accept": "application/x-ndjson"},
+            )
+
+            assert response.status_code == 200
+            assert response.mimetype == "application/x-ndjson"
+            lines = [json.loads(line) for line in response.data.splitlines()]
+            assert lines[0] == {
+                "type": "movie",
+                "movie": {"id": "tt0133093", "query": "The Matrix 1999"},
+            }
+            assert lines[1]["type"] == "error"
+            assert lines[2] == {"type": "done", "movies": 1, "errors": 1}
+
+    def test_search_movies_defaults_to_json(self, client):
+        """Test search returns a single JSON document without the NDJSON accept."""
+        with patch("app.search_movies_parallel") as mock_search:
+            mock_search.return_value = {"movies": [], "errors": []}
+
+            response = client.post(
+                "/api/movies/search",
+                data=json.dumps({"movies": []}),
+                content_type="application/json",
+                headers={"Accept": "*/*"},
+            )
+
+            assert response.mimetype == "application/json"
+            mock_search.assert_called_once()
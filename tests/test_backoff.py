@@ -0,0 +1,37 @@
+"""Tests for per-key retry backoff."""
+
+from utils.backoff import FailureBackoff
+
+
+class TestFailureBackoff:
+    """Tests for exponential delays and reset."""
+
+    def test_delay_doubles_up_to_max(self):
+        """Test consecutive failures double the delay up to max_delay."""
+        backoff = FailureBackoff(base=10, max_delay=50)
+
+        delays = [backoff.failure("key") for _ in range(5)]
+
+        assert delays == [10, 20, 40, 50, 50]
+        assert backoff.stats() == {"backing_off": 1, "failures": 5}
+
+    def test_reset_starts_over(self):
+        """Test a success resets the key to the base delay."""
+        backoff = FailureBackoff(base=10)
+        backoff.failure("key")
+        backoff.failure("key")
+
+        backoff.reset("key")
+
+        assert backoff.failure("key") == 10
+
+    def test_keys_are_independent_and_bounded(self):
+        """Test keys back off separately and old keys are forgotten."""
+        backoff = FailureBackoff(base=10, max_keys=2)
+        backoff.failure("a")
+        backoff.failure("a")
+        backoff.failure("b")
+        backoff.failure("c")
+
+        assert backoff.stats()["backing_off"] == 2
+        assert backoff.failure("a") == 10
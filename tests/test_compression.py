@@ -0,0 +1,313 @@
+"""Tests for the response compression middleware."""
+
+import gzip
+import json
+import zlib
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture
+def long_watchlist(add_to_watchlist):
+    """A hundred watchlisted movies with the usual image and page URLs."""
+    add_to_watchlist(
+        [
+            {
+                "id": f"tt{i:07d}",
+                "title": f"Movie {i}",
+                "year": 1950 + i % 75,
+                "logo_url": f"https://m.media-amazon.com/images/M/tt{i:07d}_V1_.jpg",
+                "backdrop_url": f"https://image.tmdb.org/t/p/w780/tt{i:07d}.jpg",
+                "backdrop_url_hd": (
+                    f"https://image.tmdb.org/t/p/original/tt{i:07d}.jpg"
+                ),
+                "imdb_rating": 5 + i % 50 / 10,
+                "imdb_page_url": f"https://www.imdb.com/title/tt{i:07d}/",
+                "rt_page_url": f"https://www.rottentomatoes.com/m/movie_{i}",
+            }
+            for i in range(100)
+        ]
+    )
+
+
+def _wsgi_app(body, headers):
+    """A WSGI app answering 200 with the given body iterable and headers."""
+
+    def app(environ, start_response):
+        start_response("200 OK", list(headers))
+        return body
+
+    return app
+
+
+def _call(middleware, accept_encoding="gzip", method="GET"):
+    """Call a middleware, returning the response headers (a dict) and body."""
+    captured = {}
+
+    def start_response(status, headers, exc_info=None):
+        captured.update(headers)
+
+    body = middleware(
+        {"REQUEST_METHOD": method, "HTTP_ACCEPT_ENCODING": accept_encoding},
+        start_response,
+    )
+    return captured, body
+
+
+class TestAcceptEncoding:
+    """Tests for Accept-Encoding parsing and negotiation."""
+
+    def test_parse_q_values(self):
+        """Test codings are mapped to their q-values, 1 by default."""
+        from utils.compression import parse_accept_encoding
+
+        assert parse_accept_encoding("gzip, br;q=0.5, identity;q=0, x;q=bad") == {
+            "gzip": 1.0,
+            "br": 0.5,
+            "identity": 0.0,
+            "x": 0.0,
+        }
+        assert parse_accept_encoding(None) == {}
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("gzip, deflate, br", "br"),
+            ("gzip;q=1, br;q=0.5", "gzip"),
+            ("br;q=0, gzip", "gzip"),
+            ("*", "br"),
+            ("gzip;q=0, *", "br"),
+            ("identity", None),
+            ("", None),
+        ],
+    )
+    def test_negotiate(self, header, expected):
+        """Test brotli is preferred, q-values and wildcards are honored."""
+        from utils.compression import CompressionMiddleware
+
+        with patch("utils.compression.brotli", object()):
+            assert CompressionMiddleware(None).negotiate(header) == expected
+
+    def test_gzip_without_brotli(self):
+        """Test gzip is used when the brotli package is missing."""
+        from utils.compression import CompressionMiddleware
+
+        with patch("utils.compression.brotli", None):
+            assert CompressionMiddleware(None).negotiate("br, gzip") == "gzip"
+            assert CompressionMiddleware(None).negotiate("br") is None
+
+
+class TestCompressionMiddleware:
+    """Tests for which responses are compressed and how."""
+
+    def test_known_length_compressed_whole(self):
+        """Test a sized body is compressed in one piece with a new length."""
+        from utils.compression import CompressionMiddleware
+
+        data = b'{"movies": []}' * 200
+        middleware = CompressionMiddleware(
+            _wsgi_app(
+                [data],
+                [
+                    ("Content-Type", "application/json"),
+                    ("Content-Length", str(len(data))),
+                    ("ETag", '"abc"'),
+                ],
+            )
+        )
+
+        headers, body = _call(middleware)
+        compressed = b"".join(body)
+
+        assert headers["Content-Encoding"] == "gzip"
+        assert headers["Content-Length"] == str(len(compressed))
+        assert headers["Vary"] == "Accept-Encoding"
+        assert headers["ETag"] == 'W/"abc"'
+        assert gzip.decompress(compressed) == data
+
+    def test_small_body_left_alone(self):
+        """Test bodies under min_size are sent as they are."""
+        from utils.compression import CompressionMiddleware
+
+        middleware = CompressionMiddleware(
+            _wsgi_app(
+                [b"{}"], [("Content-Type", "application/json"), ("Content-Length", "2")]
+            ),
+            min_size=100,
+        )
+
+        headers, body = _call(middleware)
+
+        assert "Content-Encoding" not in headers
+        assert headers["Vary"] == "Accept-Encoding"
+        assert b"".join(body) == b"{}"
+
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            [("Content-Type", "image/png")],
+            [("Content-Type", "application/json"), ("Content-Encoding", "br")],
+            [("Content-Type", "text/html"), ("Cache-Control", "no-transform")],
+        ],
+    )
+    def test_other_responses_left_alone(self, headers):
+        """Test other types, encoded and no-transform bodies are untouched."""
+        from utils.compression import CompressionMiddleware
+
+        middleware = CompressionMiddleware(_wsgi_app([b"x" * 5000], headers))
+
+        captured, body = _call(middleware)
+
+        assert captured.get("Content-Encoding") != "gzip"
+        assert b"".join(body) == b"x" * 5000
+
+    def test_head_and_identity_requests_left_alone(self):
+        """Test HEAD requests and clients without gzip get the plain body."""
+        from utils.compression import CompressionMiddleware
+
+        middleware = CompressionMiddleware(
+            _wsgi_app([b"x" * 5000], [("Content-Type", "text/html; charset=utf-8")])
+        )
+
+        for accept, method in (("gzip", "HEAD"), ("identity", "GET")):
+            headers, body = _call(middleware, accept, method)
+            assert "Content-Encoding" not in headers
+            assert b"".join(body) == b"x" * 5000
+
+    def test_stream_flushed_per_chunk(self):
+        """Test each streamed chunk can be decoded before the stream ends."""
+        from utils.compression import CompressionMiddleware
+
+        closed = []
+
+        def lines():
+            try:
+                for i in range(3):
+                    yield json.dumps({"line": i}).encode() + b"\n"
+            finally:
+                closed.append(True)
+
+        middleware = CompressionMiddleware(
+            _wsgi_app(lines(), [("Content-Type", "application/x-ndjson")])
+        )
+
+        headers, body = _call(middleware)
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        first = decoder.decompress(next(body))
+        rest = b"".join(decoder.decompress(chunk) for chunk in body)
+
+        assert "Content-Length" not in headers
+        assert headers["Content-Encoding"] == "gzip"
+        assert first == b'{"line": 0}\n'
+        assert rest == b'{"line": 1}\n{"line": 2}\n'
+        assert closed == [True]
+
+    def test_brotli(self):
+        """Test brotli-encoded bodies decode to the original."""
+        brotli = pytest.importorskip("brotli")
+        from utils.compression import CompressionMiddleware
+
+        data = b'{"movies": []}' * 200
+        middleware = CompressionMiddleware(
+            _wsgi_app([data], [("Content-Type", "application/json")])
+        )
+
+        headers, body = _call(middleware, "br")
+
+        assert headers["Content-Encoding"] == "br"
+        assert brotli.decompress(b"".join(body)) == data
+
+
+class _StubBrotliCompressor:
+    """brotli.Compressor stand-in: zlib output, and integer-only quality."""
+
+    def __init__(self, quality):
+        if not isinstance(quality, int):
+            raise TypeError(
+                f"{type(quality).__name__!r} object cannot be interpreted as an integer"
+            )
+        self._compressor = zlib.compressobj()
+
+    def process(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class TestCompressedRoutes:
+    """Tests for bytes on the wire through the app."""
+
+    def test_brotli_with_configured_quality(self, auth_client, long_watchlist):
+        """Test br responses work with the quality read from the environment."""
+        from types import SimpleNamespace
+
+        from utils.env_variables import EnvVariable
+
+        plain = auth_client.get("/api/watchlist?per_page=100")
+        stub = SimpleNamespace(Compressor=_StubBrotliCompressor)
+        with patch("utils.compression.brotli", stub):
+            compressed = auth_client.get(
+                "/api/watchlist?per_page=100", headers={"Accept-Encoding": "br"}
+            )
+
+        assert isinstance(EnvVariable.COMPRESSION_BROTLI_QUALITY.value, int)
+        assert compressed.status_code == 200
+        assert compressed.headers["Content-Encoding"] == "br"
+        assert zlib.decompress(compressed.data) == plain.data
+
+    def test_watchlist_page_on_the_wire(self, auth_client, long_watchlist):
+        """Test a 100-entry watchlist page is gzipped to a fraction of its size."""
+        plain = auth_client.get("/api/watchlist?per_page=100")
+        compressed = auth_client.get(
+            "/api/watchlist?per_page=100", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert len(json.loads(plain.data)["movies"]) == 100
+        assert "Content-Encoding" not in plain.headers
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert int(compressed.headers["Content-Length"]) == len(compressed.data)
+        assert len(compressed.data) * 5 < len(plain.data)
+        assert gzip.decompress(compressed.data) == plain.data
+
+    def test_compressed_etag_still_revalidates(self, auth_client, long_watchlist):
+        """Test the weak ETag of a compressed response still gets a 304."""
+        first = auth_client.get(
+            "/api/watchlist/ids", headers={"Accept-Encoding": "gzip"}
+        )
+
+        again = auth_client.get(
+            "/api/watchlist/ids",
+            headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": first.headers["ETag"],
+            },
+        )
+
+        assert first.headers["ETag"].startswith("W/")
+        assert again.status_code == 304
+        assert "Content-Encoding" not in again.headers
+
+    def test_streamed_search_on_the_wire(self, client):
+        """Test NDJSON search results are streamed gzip-encoded."""
+        results = [("movie", {"id": f"tt{i}", "title": "x" * 40}) for i in range(50)]
+        with patch("app.iter_search_movies", return_value=iter(results)):
+            response = client.post(
+                "/api/movies/search",
+                data=json.dumps({"movies": [{"query": "x"}]}),
+                content_type="application/json",
+                headers={
+                    "Accept": "application/x-ndjson",
+                    "Accept-Encoding": "gzip",
+                },
+            )
+            data = gzip.decompress(response.data)
+
+        lines = [json.loads(line) for line in data.splitlines()]
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert len(lines) == 51
+        assert lines[-1] == {"type": "done", "movies": 50, "errors": 0}
@@ -48,6 +48,34 @@ class TestYearValidation:
         assert _is_year_match(2019, 2022, tolerance=2) is False
 
 
+class TestCreateCache:
+    """Tests for cache backend selection."""
+
+    @patch("utils.helpers.EnvVariable")
+    def test_sqlite_backend(self, mock_env, tmp_path):
+        """Test CACHE_BACKEND=sqlite creates the shared on-disk cache."""
+        from utils.cache.sqlite import SQLiteCache
+        from utils.helpers import _create_cache
+
+        mock_env.CACHE_BACKEND.value = "sqlite"
+        mock_env.CACHE_SQLITE_PATH.value = str(tmp_path / "cache.sqlite3")
+        mock_env.CACHE_MAX_ENTRIES.value = 100
+
+        assert isinstance(_create_cache(), SQLiteCache)
+
+    @patch("utils.helpers.EnvVariable")
+    def test_unknown_backend(self, mock_env):
+        """Test an unknown CACHE_BACKEND fails loudly at startup."""
+        import pytest
+
+        from utils.helpers import _create_cache
+
+        mock_env.CACHE_BACKEND.value = "memcached"
+
+        with pytest.raises(ValueError):
+            _create_cache()
+
+
 class TestSearchMovie:
     """Tests for movie search with mocked IMDB API."""
 
@@ -109,6 +137,36 @@ class TestSearchMovie:
         # API should only be called once due to caching
         assert mock_search_imdb.call_count == 1
 
+    @patch("utils.helpers.search_imdb")
+    def test_search_movie_coalesces_concurrent_misses(self, mock_search_imdb):
+        """Test concurrent searches for one query share a single API call."""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        from utils.helpers import _cache, _inflight, search_movie
+
+        _cache.clear()
+        barrier = threading.Barrier(8)
+
+        def slow_search(query):
+            time.sleep(0.2)
+            return {"id": "tt0133093", "title": "The Matrix", "year": 1999}
+
+        mock_search_imdb.side_effect = slow_search
+        collapsed_before = _inflight.stats()["collapsed"]
+
+        def search(_):
+            barrier.wait()
+            return search_movie("The Matrix 1999")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(search, range(8)))
+
+        assert mock_search_imdb.call_count == 1
+        assert all(r["id"] == "tt0133093" for r in results)
+        assert _inflight.stats()["collapsed"] - collapsed_before == 7
+
 
 class TestFetchImdbRating:
     """Tests for IMDB rating fetch with mocked API."""
@@ -130,6 +188,28 @@ class TestFetchImdbRating:
         assert result["rating"] == 8.7
         assert "imdb.com" in result["page_url"]
 
+    @patch("utils.helpers.get_imdb_rating")
+    def test_fetch_imdb_rating_stale_while_revalidate(self, mock_get_rating):
+        """Test an expired rating is served immediately and refreshed behind."""
+        import time
+
+        from utils.helpers import _cache, _revalidator, fetch_imdb_rating
+
+        _cache.clear()
+        mock_get_rating.return_value = {"rating": 8.8, "page_url": "new"}
+
+        with patch("utils.cache.base.time.time", return_value=time.time() - 7200):
+            _cache.set("imdb_rating", "tt0133093", {"rating": 8.7, "page_url": "old"})
+
+        result = fetch_imdb_rating("tt0133093")
+
+        assert result["rating"] == 8.7
+        deadline = time.time() + 5
+        while _revalidator.stats()["pending"] and time.time() < deadline:
+            time.sleep(0.01)
+        mock_get_rating.assert_called_once_with("tt0133093")
+        assert fetch_imdb_rating("tt0133093")["rating"] == 8.8
+
     @patch("utils.helpers.get_imdb_rating")
     def test_fetch_imdb_rating_not_found(self, mock_get_rating):
         """Test IMDB rating not found returns default."""
@@ -144,6 +224,122 @@ class TestFetchImdbRating:
         assert result["rating"] is None
         assert "tt9999999" in result["page_url"]
 
+    @patch("utils.helpers.get_imdb_rating")
+    def test_fetch_imdb_rating_miss_ttl(self, mock_get_rating):
+        """Test definitive misses are cached for CACHE_MISS_TTL."""
+        from utils.helpers import CACHE_MISS_TTL, _cache, fetch_imdb_rating
+
+        _cache.clear()
+        mock_get_rating.return_value = None
+
+        fetch_imdb_rating("tt9999998")
+
+        entry = _cache.get_entry("imdb_rating", "tt9999998")
+        assert entry.ttl == CACHE_MISS_TTL
+
+    @patch("utils.helpers.CACHE_MISS_TTL", 24 * 3600)
+    @patch("utils.helpers.get_imdb_rating")
+    def test_fetch_imdb_rating_miss_ttl_capped(self, mock_get_rating):
+        """Test misses are never cached longer than found ratings."""
+        from utils.helpers import CACHE_TTLS, _cache, fetch_imdb_rating
+
+        _cache.clear()
+        mock_get_rating.return_value = None
+
+        fetch_imdb_rating("tt9999997")
+
+        entry = _cache.get_entry("imdb_rating", "tt9999997")
+        assert entry.ttl == CACHE_TTLS["imdb_rating"]
+
+    @patch("utils.helpers.get_imdb_rating")
+    def test_fetch_imdb_rating_transient_failure_backs_off(self, mock_get_rating):
+        """Test transient failures are cached briefly with growing backoff."""
+        from utils.api.exception_handler import TransientAPIError
+        from utils.helpers import _backoff, _cache, fetch_imdb_rating
+
+        _cache.clear()
+        _backoff.reset(("imdb_rating", "tt0133093"))
+        mock_get_rating.side_effect = TransientAPIError("timeout")
+
+        result = fetch_imdb_rating("tt0133093")
+
+        assert result["rating"] is None
+        first = _cache.get_entry("imdb_rating", "tt0133093")
+        assert first.ttl == _backoff.base
+
+        _cache.delete("imdb_rating", "tt0133093")
+        fetch_imdb_rating("tt0133093")
+        assert _cache.get_entry("imdb_rating", "tt0133093").ttl == 2 * _backoff.base
+
+        mock_get_rating.side_effect = None
+        mock_get_rating.return_value = {"rating": 8.7, "page_url": "url"}
+        _cache.delete("imdb_rating", "tt0133093")
+        assert fetch_imdb_rating("tt0133093")["rating"] == 8.7
+        assert _cache.get_entry("imdb_rating", "tt0133093").ttl == 3600
+        assert ("imdb_rating", "tt0133093") not in _backoff._failures
+
+    @patch("utils.helpers.get_imdb_rating")
+    def test_fetch_imdb_rating_keeps_stale_value_on_failure(self, mock_get_rating):
+        """Test a failed refresh keeps serving the last known rating."""
+        import time
+
+        from utils.api.exception_handler import TransientAPIError
+        from utils.helpers import _backoff, _cache, _load_and_cache, _load_imdb_rating
+
+        _cache.clear()
+        _backoff.reset(("imdb_rating", "tt0133093"))
+        mock_get_rating.side_effect = TransientAPIError("timeout")
+        with patch("utils.cache.base.time.time", return_value=time.time() - 7200):
+            _cache.set("imdb_rating", "tt0133093", {"rating": 8.7, "page_url": "old"})
+
+        result = _load_and_cache(
+            "imdb_rating", "tt0133093", _load_imdb_rating, ("tt0133093",)
+        )
+
+        assert result["rating"] == 8.7
+        entry = _cache.get_entry("imdb_rating", "tt0133093")
+        assert entry.value["rating"] == 8.7
+        assert entry.ttl == _backoff.base
+
+
+class TestRefreshRating:
+    """Tests for rating lookups made by the background refresh."""
+
+    @patch("utils.helpers.get_imdb_rating")
+    def test_refresh_rating_uses_cache_then_limiter(self, mock_get_rating):
+        """Test cached ratings skip the provider and misses wait for the limiter."""
+        from unittest.mock import MagicMock
+
+        from utils.helpers import _cache, refresh_rating
+
+        _cache.clear()
+        limiter = MagicMock()
+        mock_get_rating.return_value = {"rating": 8.7, "page_url": "url"}
+
+        assert refresh_rating("imdb", "tt0133093", "", rate_limiter=limiter) == {
+            "rating": 8.7,
+            "page_url": "url",
+        }
+        refresh_rating("imdb", "tt0133093", "", rate_limiter=limiter)
+
+        mock_get_rating.assert_called_once_with("tt0133093")
+        limiter.acquire.assert_called_once_with()
+
+    @patch("utils.helpers.get_imdb_rating")
+    def test_refresh_rating_raises_transient_failures(self, mock_get_rating):
+        """Test failures are raised rather than served as empty ratings."""
+        import pytest
+
+        from utils.api.exception_handler import TransientAPIError
+        from utils.helpers import _cache, refresh_rating
+
+        _cache.clear()
+        mock_get_rating.side_effect = TransientAPIError("timeout")
+
+        with pytest.raises(TransientAPIError):
+            refresh_rating("imdb", "tt0133093", "")
+        assert _cache.get("imdb_rating", "tt0133093") is None
+
 
 class TestFetchTmdbRating:
     """Tests for TMDB rating fetch with mocked API."""
@@ -292,6 +488,28 @@ class TestFetchRtRating:
         assert result["popcornmeter"] is None
 
 
+class TestSearchMovieTransientFailure:
+    """Tests for search lookups while IMDb is unavailable."""
+
+    @patch("utils.helpers.search_imdb")
+    def test_search_failure_is_not_cached(self, mock_search_imdb):
+        """Test a transient search failure surfaces and is retried next time."""
+        import pytest
+
+        from utils.api.exception_handler import TransientAPIError
+        from utils.helpers import _cache, search_movie
+
+        _cache.clear()
+        mock_search_imdb.side_effect = TransientAPIError("timeout")
+
+        with pytest.raises(TransientAPIError):
+            search_movie("The Matrix")
+
+        mock_search_imdb.side_effect = None
+        mock_search_imdb.return_value = {"id": "tt0133093", "title": "The Matrix"}
+        assert search_movie("The Matrix")["id"] == "tt0133093"
+
+
 class TestSearchMoviesParallel:
     """Tests for parallel movie search with mocked API."""
 
@@ -358,6 +576,89 @@ class TestSearchMoviesParallel:
         assert len(result["errors"]) == 2
 
 
+class TestIterSearchMovies:
+    """Tests for streaming parallel movie search."""
+
+    @patch("utils.helpers.search_movie")
+    def test_iter_search_movies_yields_in_completion_order(self, mock_search):
+        """Test a fast result is yielded before a slow one finishes."""
+        import threading
+
+        from utils.helpers import iter_search_movies
+
+        release_slow = threading.Event()
+
+        def search(query):
+            if query == "Slow 1999":
+                release_slow.wait(timeout=5)
+            return {"id": query, "query": query}
+
+        mock_search.side_effect = search
+
+        results = iter_search_movies([{"query": "Slow 1999"}, {"query": "Fast 2000"}])
+
+        assert next(results) == ("movie", {"id": "Fast 2000", "query": "Fast 2000"})
+        release_slow.set()
+        assert next(results) == ("movie", {"id": "Slow 1999", "query": "Slow 1999"})
+
+    def test_iter_search_movies_empty_query_error(self):
+        """Test empty queries are yielded as errors up front."""
+        from utils.helpers import iter_search_movies
+
+        assert list(iter_search_movies([{"query": "  "}])) == [
+            ("error", {"query": "  ", "error": "Empty query"})
+        ]
+
+
+class TestFetchRatingsParallel:
+    """Tests for parallel multi-platform rating fetch."""
+
+    @patch("utils.helpers.fetch_rt_rating")
+    @patch("utils.helpers.fetch_tmdb_rating")
+    @patch("utils.helpers.fetch_imdb_rating")
+    def test_fetch_ratings_parallel_all_platforms(self, mock_imdb, mock_tmdb, mock_rt):
+        """Test every movie is fetched from every platform."""
+        from utils.helpers import fetch_ratings_parallel
+
+        mock_imdb.return_value = {"rating": 8.7, "page_url": ""}
+        mock_tmdb.return_value = {"rating": 8.2, "page_url": ""}
+        mock_rt.return_value = {"rating": 8.3, "page_url": ""}
+
+        result = fetch_ratings_parallel(
+            [
+                {"id": "tt0133093", "title": "The Matrix", "year": 1999},
+                {"id": "tt1375666", "title": "Inception", "year": 2010},
+            ]
+        )
+
+        assert len(result["errors"]) == 0
+        assert result["ratings"]["tt0133093"]["imdb"]["rating"] == 8.7
+        assert result["ratings"]["tt1375666"]["rt"]["rating"] == 8.3
+        assert mock_imdb.call_count == 2
+        mock_tmdb.assert_any_call("Inception", 2010)
+
+    @patch("utils.helpers.fetch_rt_rating")
+    @patch("utils.helpers.fetch_imdb_rating")
+    def test_fetch_ratings_parallel_platform_error(self, mock_imdb, mock_rt):
+        """Test a failing platform is reported without dropping the others."""
+        from utils.helpers import fetch_ratings_parallel
+
+        mock_imdb.return_value = {"rating": 8.7, "page_url": ""}
+        mock_rt.side_effect = RuntimeError("boom")
+
+        result = fetch_ratings_parallel(
+            [{"id": "tt0133093", "title": "The Matrix", "year": 1999}],
+            platforms=["imdb", "rt"],
+        )
+
+        assert result["ratings"]["tt0133093"] == {
+            "imdb": {"rating": 8.7, "page_url": ""}
+        }
+        assert result["errors"] == [
+            {"id": "tt0133093", "platform": "rt", "error": "boom"}
+        ]
+
+
 class TestParseMovieQuery:
     """Tests for movie query parsing."""
 
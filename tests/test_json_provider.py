@@ -0,0 +1,107 @@
+"""Tests for the app JSON provider and its stdlib fallback."""
+
+import json
+from datetime import date, datetime
+from unittest.mock import patch
+
+import pytest
+
+PAYLOAD = {
+    "movies": [
+        {
+            "id": "tt0133093",
+            "title": "Amélie",
+            "imdb_rating": 8.7,
+            "genres": ["Action", "Sci-Fi"],
+            "added_at": datetime(2024, 1, 2, 3, 4, 5, 678000),
+        }
+    ],
+    "released": date(1999, 3, 31),
+    "total": 1,
+    "next_cursor": None,
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request):
+    """Run a test with orjson and with the stdlib fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        yield request.param
+    else:
+        with patch("utils.json_provider.orjson", None):
+            yield request.param
+
+
+class TestJSONSerialization:
+    """Tests for dumpb(), dumps() and loads()."""
+
+    def test_dates_as_iso_8601(self, backend):
+        """Test datetimes and dates are written as ISO 8601 strings."""
+        from utils.json_provider import dumpb, loads
+
+        data = loads(dumpb(PAYLOAD))
+
+        assert data["movies"][0]["added_at"] == "2024-01-02T03:04:05.678000"
+        assert data["released"] == "1999-03-31"
+
+    def test_compact_utf8_in_key_order(self, backend):
+        """Test output is compact UTF-8 that keeps dict key order."""
+        from utils.json_provider import dumpb
+
+        encoded = dumpb({"b": 1, "a": "é"})
+
+        assert encoded == '{"b":1,"a":"é"}'.encode()
+
+    def test_backends_agree(self, backend):
+        """Test both backends produce the same document."""
+        from utils.json_provider import dumps
+
+        with patch("utils.json_provider.orjson", None):
+            expected = dumps(PAYLOAD, sort_keys=True)
+
+        assert dumps(PAYLOAD, sort_keys=True) == expected
+
+    def test_integer_keys_and_big_integers(self, backend):
+        """Test integer keys become strings and big integers still encode."""
+        from utils.json_provider import dumps
+
+        assert json.loads(dumps({1: 2**70})) == {"1": 2**70}
+
+    def test_unserializable_raises(self, backend):
+        """Test objects JSON cannot represent raise TypeError."""
+        from utils.json_provider import dumps
+
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
+
+
+class TestFastJSONProvider:
+    """Tests for the provider registered on the app."""
+
+    def test_jsonify_uses_provider(self, app):
+        """Test jsonify writes compact output with dates as ISO 8601."""
+        from flask import jsonify
+
+        with app.test_request_context():
+            response = jsonify({"when": datetime(2024, 1, 2), "ok": True})
+
+        assert response.data == b'{"when":"2024-01-02T00:00:00","ok":true}\n'
+
+    def test_request_json_parsed(self, app):
+        """Test request bodies are parsed through the provider."""
+        with app.test_request_context(
+            "/", method="POST", data='{"movies": [1]}', content_type="application/json"
+        ):
+            from flask import request
+
+            assert request.get_json() == {"movies": [1]}
+
+    def test_response_object_uses_provider(self, app):
+        """Test utils.objects.Response serializes with the provider too."""
+        from utils.objects import Response
+
+        response = Response(response={"rating": 8.7, "at": date(2024, 1, 2)})
+
+        assert response.data == b'{"rating":8.7,"at":"2024-01-02"}'
+        assert response.mimetype == "application/json"
@@ -129,3 +129,153 @@ class TestUserModel:
             # This is technically invalid but tests the rsplit behavior
             user = User(email="user@company@example.com", password_hash="hash")
             assert user.username == "user@company"
+
+
+class TestMovieGenres:
+    """Tests for keeping movie_genres in sync with Movie.genres."""
+
+    def _linked(self, movie_id):
+        from utils.models import Genre, movie_genres
+
+        return sorted(
+            name
+            for (name,) in db.session.query(Genre.name)
+            .join(movie_genres, movie_genres.c.genre_id == Genre.id)
+            .filter(movie_genres.c.movie_id == movie_id)
+        )
+
+    def test_genres_linked_on_insert(self, app):
+        """Test a new movie's genres are stored as association rows."""
+        from utils.models import Genre, Movie
+
+        db.session.add(Movie(id="tt1", title="A", genres=["Sci-Fi", "Action"]))
+        db.session.add(Movie(id="tt2", title="B", genres=["Action", "Action"]))
+        db.session.commit()
+
+        assert self._linked("tt1") == ["Action", "Sci-Fi"]
+        assert self._linked("tt2") == ["Action"]
+        assert Genre.query.count() == 2
+
+    def test_genres_relinked_on_update(self, app):
+        """Test replacing Movie.genres replaces its association rows."""
+        from utils.models import Movie
+
+        movie = Movie(id="tt1", title="A", genres=["Action"])
+        db.session.add(movie)
+        db.session.commit()
+
+        movie.genres = ["Drama"]
+        db.session.commit()
+        assert self._linked("tt1") == ["Drama"]
+
+        movie.genres = None
+        db.session.commit()
+        assert self._linked("tt1") == []
+
+    def test_sync_from_core_connection(self, app):
+        """Test bulk paths can sync genres without the ORM."""
+        from utils.models import Movie, sync_movie_genres
+
+        db.session.execute(db.insert(Movie), [{"id": "tt1", "title": "A"}])
+        sync_movie_genres(db.session.connection(), {"tt1": ["Horror", "", None]})
+        db.session.commit()
+
+        assert self._linked("tt1") == ["Horror"]
+
+
+class TestMovieAverageScore:
+    """Tests for the stored Movie.average_score."""
+
+    def test_average_stored_on_insert(self, app):
+        """Test new movies store the average of their positive ratings."""
+        from utils.models import Movie
+
+        db.session.add(
+            Movie(
+                id="tt1", title="A", imdb_rating=8.0, tmdb_rating=7.0, rt_tomatometer=0
+            )
+        )
+        db.session.add(Movie(id="tt2", title="B"))
+        db.session.commit()
+
+        assert db.session.get(Movie, "tt1").average_score == 7.5
+        assert db.session.get(Movie, "tt2").average_score == 0
+
+    def test_average_recomputed_on_rating_change(self, app):
+        """Test changing any rating column updates the stored average."""
+        from utils.models import Movie
+
+        movie = Movie(id="tt1", title="A", imdb_rating=8.0)
+        db.session.add(movie)
+        db.session.commit()
+
+        movie.rt_tomatometer = 9.0
+        db.session.commit()
+        assert movie.average_score == 8.5
+
+        movie.imdb_rating = None
+        db.session.commit()
+        assert movie.average_score == 9.0
+
+    def test_average_updated_by_stored_ratings(self, app):
+        """Test ratings written by the ratings store refresh the average."""
+        from utils.models import Movie
+        from utils.ratings_store import store_ratings
+
+        db.session.add(Movie(id="tt1", title="A", imdb_rating=8.0))
+        db.session.commit()
+
+        store_ratings({"tt1": {"tmdb": {"rating": 6.0}}})
+
+        assert db.session.get(Movie, "tt1").average_score == 7.0
+
+    def test_matches_calculate_average_score(self, app):
+        """Test the stored value matches calculate_average_score()."""
+        from utils.models import Movie
+
+        movie = Movie(
+            id="tt1", title="A", imdb_rating=8.1, tmdb_rating=7.3, rt_tomatometer=9.0
+        )
+        db.session.add(movie)
+        db.session.commit()
+
+        assert movie.average_score == movie.calculate_average_score() == 8.1
+
+    def test_sql_average_matches_python(self, app):
+        """Test average_score_sql() computes exactly what average_score() does."""
+        from utils.models import Movie, average_score, average_score_sql
+
+        ratings = [
+            (10.0, 9.9, None),
+            (7.2, 7.3, None),
+            (8.0, 7.3, 6.6),
+            (None, None, None),
+            (0, 5.5, None),
+            (9.9, 9.8, 9.8),
+            (6.1, None, 8.2),
+        ]
+        db.session.execute(
+            db.insert(Movie),
+            [
+                {
+                    "id": f"tt{i}",
+                    "title": "A",
+                    "imdb_rating": imdb,
+                    "tmdb_rating": tmdb,
+                    "rt_tomatometer": rt,
+                }
+                for i, (imdb, tmdb, rt) in enumerate(ratings)
+            ],
+        )
+        db.session.execute(
+            db.update(Movie).values(
+                average_score=average_score_sql(
+                    Movie.imdb_rating, Movie.tmdb_rating, Movie.rt_tomatometer
+                )
+            )
+        )
+        db.session.commit()
+
+        for i, (imdb, tmdb, rt) in enumerate(ratings):
+            stored = db.session.get(Movie, f"tt{i}").average_score
+            assert stored == average_score(imdb, tmdb, rt), (imdb, tmdb, rt)
@@ -0,0 +1,31 @@
+"""Tests for the token bucket rate limiter."""
+
+from unittest.mock import patch
+
+from utils.rate_limit import RateLimiter
+
+
+class TestRateLimiter:
+    """Tests for bursts and waiting."""
+
+    @patch("utils.rate_limit.time.sleep")
+    def test_burst_then_waits(self, mock_sleep):
+        """Test calls within the burst pass and later calls wait 1/rate."""
+        with patch("utils.rate_limit.time.monotonic", return_value=100.0):
+            limiter = RateLimiter(rate=2, burst=2)
+            waits = [limiter.acquire() for _ in range(4)]
+
+        assert waits == [0.0, 0.0, 0.5, 1.0]
+        assert mock_sleep.call_count == 2
+        assert limiter.stats()["waited"] == 1.5
+
+    @patch("utils.rate_limit.time.sleep")
+    def test_tokens_refill_over_time(self, mock_sleep):
+        """Test idle time refills the bucket up to the burst size."""
+        with patch("utils.rate_limit.time.monotonic", return_value=100.0):
+            limiter = RateLimiter(rate=1, burst=1)
+            limiter.acquire()
+
+        with patch("utils.rate_limit.time.monotonic", return_value=110.0):
+            assert limiter.acquire() == 0.0
+            assert limiter.acquire() == 1.0
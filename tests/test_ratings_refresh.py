@@ -0,0 +1,159 @@
+"""Tests for the background ratings refresh."""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from utils.models import Movie, User, WatchlistEntry, db
+
+
+@pytest.fixture
+def stale_movies(app):
+    """Three movies with old ratings, watchlisted by 1, 3 and 2 users."""
+    old = datetime.utcnow() - timedelta(days=7)
+    users = [User(email=f"user{i}@example.com") for i in range(3)]
+    db.session.add_all(users)
+    for movie_id, watchers in (("tt0000001", 1), ("tt0000002", 3), ("tt0000003", 2)):
+        db.session.add(
+            Movie(id=movie_id, title=f"Movie {movie_id}", ratings_updated_at=old)
+        )
+        for user in users[:watchers]:
+            db.session.add(WatchlistEntry(user=user, movie_id=movie_id))
+    db.session.add(Movie(id="tt0000004", title="Fresh", ratings_updated_at=None))
+    db.session.commit()
+    return old
+
+
+class TestFindStaleMovies:
+    """Tests for selecting and prioritising stale movies."""
+
+    def test_ordered_by_watchlist_count(self, stale_movies):
+        """Test the most watchlisted stale movies come first."""
+        from utils.ratings_refresh import count_stale_movies, find_stale_movies
+
+        movies = find_stale_movies(timedelta(hours=1), limit=2)
+
+        assert [m["id"] for m in movies] == ["tt0000002", "tt0000003"]
+        assert movies[0]["watchers"] == 3
+        assert count_stale_movies(timedelta(hours=1)) == 3
+
+    def test_unwatched_and_fresh_movies_skipped(self, stale_movies):
+        """Test movies on no watchlist or refreshed recently are not selected."""
+        from utils.ratings_refresh import find_stale_movies
+
+        assert find_stale_movies(timedelta(days=30), limit=10) == []
+
+
+class TestRatingsRefresher:
+    """Tests for refreshing batches of stale movies."""
+
+    @patch("utils.ratings_refresh.refresh_rating")
+    def test_run_once_stores_ratings(self, mock_refresh, stale_movies):
+        """Test a batch looks up every platform and stores the results."""
+        from utils.ratings_refresh import RatingsRefresher
+
+        mock_refresh.side_effect = lambda platform, *args, **kwargs: {
+            "rating": {"imdb": 8.0, "tmdb": 7.5, "rt": 9.0}[platform],
+            "tomatometer": 9.0 if platform == "rt" else None,
+            "page_url": "",
+        }
+        refresher = RatingsRefresher(max_age=3600, batch_size=2)
+
+        result = refresher.run_once()
+
+        assert result == {"movies": 2, "refreshed": 2, "failed": 0}
+        movie = db.session.get(Movie, "tt0000002")
+        assert (movie.imdb_rating, movie.tmdb_rating, movie.rt_tomatometer) == (
+            8.0,
+            7.5,
+            9.0,
+        )
+        assert movie.ratings_updated_at > stale_movies
+        assert db.session.get(Movie, "tt0000001").ratings_updated_at == stale_movies
+
+        stats = refresher.stats()
+        assert stats["lookups"] == 6
+        assert stats["stale_remaining"] == 1
+
+    @patch("utils.ratings_refresh.refresh_rating")
+    def test_transient_failure_keeps_movie_stale(self, mock_refresh, stale_movies):
+        """Test movies with failed lookups are retried in a later batch."""
+        from utils.api.exception_handler import TransientAPIError
+        from utils.ratings_refresh import RatingsRefresher
+
+        def refresh(platform, movie_id, *args, **kwargs):
+            if movie_id == "tt0000002" and platform == "rt":
+                raise TransientAPIError("timeout")
+            return {"rating": None, "page_url": ""}
+
+        mock_refresh.side_effect = refresh
+        refresher = RatingsRefresher(max_age=3600, batch_size=3)
+
+        result = refresher.run_once()
+
+        assert result == {"movies": 3, "refreshed": 2, "failed": 1}
+        assert db.session.get(Movie, "tt0000002").ratings_updated_at == stale_movies
+        assert db.session.get(Movie, "tt0000003").ratings_updated_at > stale_movies
+        assert refresher.stats()["failures"] == 1
+
+    @patch("utils.ratings_refresh.refresh_rating")
+    def test_unexpected_error_fails_only_that_movie(self, mock_refresh, stale_movies):
+        """Test an error other than a transient one does not abort the batch."""
+        from utils.ratings_refresh import RatingsRefresher
+
+        def refresh(platform, movie_id, *args, **kwargs):
+            if movie_id == "tt0000002" and platform == "rt":
+                raise ValueError("unexpected page layout")
+            return {"rating": None, "page_url": ""}
+
+        mock_refresh.side_effect = refresh
+        refresher = RatingsRefresher(max_age=3600, batch_size=3)
+
+        result = refresher.run_once()
+
+        assert result == {"movies": 3, "refreshed": 2, "failed": 1}
+        assert db.session.get(Movie, "tt0000002").ratings_updated_at == stale_movies
+        assert db.session.get(Movie, "tt0000003").ratings_updated_at > stale_movies
+        assert refresher.stats()["failures"] == 1
+
+    @patch("utils.ratings_refresh.refresh_rating")
+    def test_rate_limiter_passed_per_platform(self, mock_refresh, stale_movies):
+        """Test each provider lookup goes through that provider's limiter."""
+        from utils.ratings_refresh import RatingsRefresher
+
+        mock_refresh.return_value = {"rating": None, "page_url": ""}
+        refresher = RatingsRefresher(
+            max_age=3600, batch_size=1, rate_limits={"rt": 0.5}, platforms=["rt"]
+        )
+
+        refresher.run_once()
+
+        assert mock_refresh.call_args.kwargs["rate_limiter"] is refresher.limiters["rt"]
+
+
+class TestRefreshRatingsCommand:
+    """Tests for the refresh-ratings CLI command and stats endpoint."""
+
+    @patch("utils.ratings_refresh.refresh_rating")
+    def test_refresh_once(self, mock_refresh, runner, stale_movies):
+        """Test --once refreshes a single batch and reports it."""
+        mock_refresh.return_value = {"rating": 7.0, "page_url": ""}
+
+        result = runner.invoke(args=["refresh-ratings", "--once"])
+
+        assert "Refreshed 3 of 3 movies (0 failed)" in result.output
+
+    def test_stats_endpoint(self, auth_client):
+        """Test refresh progress is exposed over the API."""
+        response = auth_client.get("/api/ratings/refresh/stats")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["running"] is False
+        assert "stale_remaining" in data
+
+    def test_stats_endpoint_requires_login(self, client):
+        """Test anonymous requests get a JSON 401."""
+        assert client.get("/api/ratings/refresh/stats").status_code == 401
@@ -0,0 +1,50 @@
+"""Tests for bounded background cache refreshes."""
+
+import threading
+
+from utils.revalidation import Revalidator
+
+
+class TestRevalidator:
+    """Tests for refresh scheduling limits."""
+
+    def test_runs_refresh_in_background(self):
+        """Test a submitted refresh runs and clears its pending key."""
+        revalidator = Revalidator(max_workers=1)
+        done = threading.Event()
+
+        assert revalidator.submit("key", done.set) is True
+        assert done.wait(timeout=5)
+
+    def test_same_key_scheduled_once(self):
+        """Test a key already being refreshed is not scheduled again."""
+        revalidator = Revalidator(max_workers=1)
+        release = threading.Event()
+
+        assert revalidator.submit("key", release.wait, 5) is True
+        assert revalidator.submit("key", release.wait, 5) is False
+        release.set()
+
+    def test_max_pending_drops_extra_refreshes(self):
+        """Test refreshes beyond the backlog limit are dropped."""
+        revalidator = Revalidator(max_workers=1, max_pending=2)
+        release = threading.Event()
+
+        assert revalidator.submit("a", release.wait, 5) is True
+        assert revalidator.submit("b", release.wait, 5) is True
+        assert revalidator.submit("c", release.wait, 5) is False
+        assert revalidator.stats()["dropped"] == 1
+        release.set()
+
+    def test_failed_refresh_is_counted(self):
+        """Test exceptions in a refresh are contained and counted."""
+        revalidator = Revalidator(max_workers=1)
+
+        def failing():
+            raise RuntimeError("upstream down")
+
+        revalidator.submit("key", failing)
+        revalidator._executor.shutdown(wait=True)
+
+        assert revalidator.stats()["failed"] == 1
+        assert revalidator.stats()["pending"] == 0
@@ -0,0 +1,60 @@
+"""Tests for request coalescing."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for collapsing concurrent calls for the same key."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test callers arriving mid-flight get the leader's result."""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_lookup():
+            calls.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return {"rating": 8.7}
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            leader = executor.submit(flight.do, "tt0133093", slow_lookup)
+            started.wait(timeout=5)
+            followers = [
+                executor.submit(flight.do, "tt0133093", slow_lookup) for _ in range(7)
+            ]
+            while flight.stats()["collapsed"] < 7:
+                pass
+            release.set()
+            results = [leader.result()] + [f.result() for f in followers]
+
+        assert len(calls) == 1
+        assert results == [{"rating": 8.7}] * 8
+        assert flight.stats() == {"executions": 1, "collapsed": 7, "in_flight": 0}
+
+    def test_different_keys_run_independently(self):
+        """Test calls for different keys are not collapsed."""
+        flight = SingleFlight()
+
+        assert flight.do("a", lambda: 1) == 1
+        assert flight.do("b", lambda: 2) == 2
+        assert flight.stats()["executions"] == 2
+
+    def test_exception_is_shared_and_key_released(self):
+        """Test a failing call raises for all waiters and can be retried."""
+        flight = SingleFlight()
+
+        def failing():
+            raise RuntimeError("upstream down")
+
+        with pytest.raises(RuntimeError):
+            flight.do("key", failing)
+
+        assert flight.do("key", lambda: "ok") == "ok"
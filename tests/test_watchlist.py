@@ -0,0 +1,1137 @@
+"""Tests for the watchlist listing API."""
+
+import json
+import re
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from utils.models import Movie, WatchlistEntry, db
+
+
+@pytest.fixture
+def file_db(app, tmp_path):
+    """Bind the app to a temporary SQLite file, shared by test threads."""
+    from sqlalchemy import create_engine
+
+    engines = db._app_engines[app]
+    default = engines[None]
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    db.session.remove()
+    engines[None] = engine
+    db.create_all()
+    yield engine
+    db.session.remove()
+    engines[None] = default
+    engine.dispose()
+
+
+def _ids(response):
+    return [movie["id"] for movie in json.loads(response.data)["movies"]]
+
+
+class TestWatchlistPagination:
+    """Tests for page and cursor pagination of GET /api/watchlist."""
+
+    @pytest.mark.parametrize(
+        "sort_by",
+        [
+            "imdb",
+            "rt_tomatometer",
+            "rt_popcornmeter",
+            "added_at",
+            "year",
+            "title",
+            "average_score",
+        ],
+    )
+    @pytest.mark.parametrize("sort_order", ["asc", "desc"])
+    def test_cursor_pages_match_page_numbers(
+        self, auth_client, watchlist, sort_by, sort_order
+    ):
+        """Test following next_cursor visits the same rows as page numbers."""
+        params = f"sort_by={sort_by}&sort_order={sort_order}&per_page=5"
+        by_page = []
+        for page in range(1, 4):
+            by_page += _ids(auth_client.get(f"/api/watchlist?{params}&page={page}"))
+
+        by_cursor = []
+        response = auth_client.get(f"/api/watchlist?{params}")
+        while True:
+            data = json.loads(response.data)
+            by_cursor += [movie["id"] for movie in data["movies"]]
+            if not data["next_cursor"]:
+                break
+            response = auth_client.get(
+                f"/api/watchlist?{params}&cursor={data['next_cursor']}"
+            )
+
+        assert len(by_page) == 12
+        assert by_cursor == by_page
+
+    def test_ties_broken_by_entry_id(self, auth_client, watchlist):
+        """Test rows with equal sort values keep a stable order."""
+        ids = _ids(auth_client.get("/api/watchlist?sort_by=added_at&sort_order=asc"))
+
+        assert ids[:2] == ["tt0000000", "tt0000001"]
+
+    def test_last_page_has_no_cursor(self, auth_client, watchlist):
+        """Test next_cursor is null once all rows are returned."""
+        data = json.loads(auth_client.get("/api/watchlist?per_page=12").data)
+
+        assert len(data["movies"]) == 12
+        assert data["next_cursor"] is None
+        assert data["total"] == 12
+        assert data["pages"] == 1
+
+    def test_invalid_cursor(self, auth_client, watchlist):
+        """Test malformed cursors are rejected."""
+        response = auth_client.get("/api/watchlist?cursor=not-a-cursor")
+
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            ["imdb", "desc", [1, 2], 3, 5],
+            ["imdb", "desc", {"a": 1}, 3, 5],
+            ["imdb", "desc", True, 3, 5],
+            ["imdb", "desc", 7.5, True, 5],
+            ["imdb", "desc", 7.5, 3, "5"],
+            ["title", "desc", 7, 3, None],
+            ["year", "desc", 1999.5, 3, None],
+            ["added_at", "desc", "yesterday", 3, None],
+        ],
+    )
+    def test_tampered_cursor_rejected(self, auth_client, watchlist, payload):
+        """Test cursors with values of the wrong type are a 400, not a 500."""
+        import base64
+
+        sort_by, sort_order = payload[:2]
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        response = auth_client.get(
+            f"/api/watchlist?sort_by={sort_by}&sort_order={sort_order}"
+            f"&cursor={cursor}"
+        )
+
+        assert response.status_code == 400
+        assert json.loads(response.data)["error"] == "Invalid cursor"
+
+    @pytest.mark.parametrize("per_page", [0, -5])
+    def test_per_page_below_one_clamped(self, auth_client, watchlist, per_page):
+        """Test per_page is at least 1."""
+        response = auth_client.get(f"/api/watchlist?per_page={per_page}&page=0")
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert len(data["movies"]) == 1
+        assert data["per_page"] == 1
+
+    def test_cursor_for_other_sort_rejected(self, auth_client, watchlist):
+        """Test a cursor only continues the sort it was issued for."""
+        data = json.loads(auth_client.get("/api/watchlist?per_page=5").data)
+
+        response = auth_client.get(
+            f"/api/watchlist?sort_by=title&cursor={data['next_cursor']}"
+        )
+
+        assert response.status_code == 400
+        assert "sort" in json.loads(response.data)["error"]
+
+
+@pytest.fixture
+def watchlist_statements(app):
+    """SQL statements run against watchlist_entries while the test runs."""
+    from sqlalchemy import event
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "watchlist_entries" in statement:
+            statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def watchlist_plans(app):
+    """EXPLAIN QUERY PLAN details of watchlist_entries SELECTs run by the test."""
+    from sqlalchemy import event
+
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and "watchlist_entries" in statement:
+            executed.append((statement, parameters))
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+
+    def plans():
+        connection = db.session.connection()
+        return [
+            [
+                row[3]
+                for row in connection.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+            ]
+            for statement, parameters in executed
+        ]
+
+    yield plans
+    event.remove(engine, "before_cursor_execute", record)
+
+
+class TestWatchlistQueryPlans:
+    """Tests that the listing queries are served by indexes."""
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            "",
+            "sort_by=imdb&sort_order=asc",
+            "sort_by=rt_tomatometer",
+            "sort_by=rt_popcornmeter",
+            "sort_by=year",
+            "sort_by=title",
+            "sort_by=average_score",
+            "min_average=5",
+            "include_total=false",
+            "genre=Action",
+            "year_start=1990&year_end=2000&min_rating=5",
+            "search=movie",
+        ],
+    )
+    def test_no_full_scans(self, auth_client, watchlist, watchlist_plans, params):
+        """Test no listing query scans watchlist_entries or movies in full."""
+        data = json.loads(auth_client.get(f"/api/watchlist?per_page=5&{params}").data)
+        if data["next_cursor"]:
+            auth_client.get(
+                f"/api/watchlist?per_page=5&{params}&cursor={data['next_cursor']}"
+            )
+
+        plans = watchlist_plans()
+        assert plans
+        for plan in plans:
+            scans = [
+                detail
+                for detail in plan
+                if re.match(r"SCAN (watchlist_entries|movies)\b", detail)
+            ]
+            assert scans == [], plan
+
+    def test_default_order_read_from_index(
+        self, auth_client, watchlist, watchlist_plans
+    ):
+        """Test cursor pages in added_at order need no sort step."""
+        data = json.loads(auth_client.get("/api/watchlist?per_page=5").data)
+        auth_client.get(f"/api/watchlist?per_page=5&cursor={data['next_cursor']}")
+
+        cursor_plan = watchlist_plans()[-1]
+        assert any("ix_watchlist_entries_user_id_added_at" in d for d in cursor_plan)
+        assert not any("TEMP B-TREE" in detail for detail in cursor_plan)
+
+
+class TestWatchlistTotals:
+    """Tests for computing totals without a separate count query."""
+
+    def test_page_and_total_in_one_statement(
+        self, auth_client, watchlist, watchlist_statements
+    ):
+        """Test a page is listed with a single watchlist query."""
+        data = json.loads(auth_client.get("/api/watchlist?per_page=5&page=2").data)
+
+        assert data["total"] == 12
+        assert data["pages"] == 3
+        assert len(watchlist_statements) == 1
+        assert "over" in watchlist_statements[0].lower()
+
+    def test_include_total_false(self, auth_client, watchlist, watchlist_statements):
+        """Test totals can be skipped entirely."""
+        data = json.loads(
+            auth_client.get("/api/watchlist?per_page=5&include_total=false").data
+        )
+
+        assert len(data["movies"]) == 5
+        assert data["total"] is None
+        assert data["pages"] is None
+        assert "count" not in watchlist_statements[0].lower()
+
+    def test_cursor_pages_carry_total(
+        self, auth_client, watchlist, watchlist_statements
+    ):
+        """Test cursor pages reuse the first page's total without counting."""
+        first = json.loads(auth_client.get("/api/watchlist?per_page=5").data)
+        watchlist_statements.clear()
+
+        second = json.loads(
+            auth_client.get(
+                f"/api/watchlist?per_page=5&cursor={first['next_cursor']}"
+            ).data
+        )
+
+        assert second["total"] == 12
+        assert "count" not in watchlist_statements[0].lower()
+
+    def test_page_past_the_end(self, auth_client, watchlist):
+        """Test an empty page past the end still reports the total."""
+        data = json.loads(auth_client.get("/api/watchlist?per_page=5&page=9").data)
+
+        assert data["movies"] == []
+        assert data["total"] == 12
+
+    def test_empty_watchlist(self, auth_client, watchlist_statements):
+        """Test an empty watchlist has a zero total from one query."""
+        data = json.loads(auth_client.get("/api/watchlist").data)
+
+        assert data["total"] == 0
+        assert data["pages"] == 0
+        assert len(watchlist_statements) == 1
+
+
+class TestWatchlistFields:
+    """Tests for sparse fieldsets (fields=) on GET /api/watchlist."""
+
+    def test_default_fields_match_to_dict(self, auth_client, watchlist):
+        """Test rows without fields= carry Movie.to_dict() plus added_at."""
+        data = json.loads(
+            auth_client.get("/api/watchlist?sort_by=added_at&sort_order=asc").data
+        )
+
+        movie = db.session.get(Movie, "tt0000000")
+        entry = WatchlistEntry.query.filter_by(movie_id="tt0000000").one()
+        assert data["movies"][0] == {
+            **movie.to_dict(),
+            "added_at": entry.added_at.isoformat(),
+        }
+
+    def test_only_requested_fields(self, auth_client, watchlist):
+        """Test fields limits each movie to those keys and its id."""
+        data = json.loads(
+            auth_client.get("/api/watchlist?fields=year,title,added_at").data
+        )
+
+        assert len(data["movies"]) == 12
+        for movie in data["movies"]:
+            assert list(movie) == ["id", "title", "year", "added_at"]
+
+    def test_only_requested_columns_selected(
+        self, auth_client, watchlist, watchlist_statements
+    ):
+        """Test unrequested columns are not read from the database."""
+        auth_client.get("/api/watchlist?fields=title")
+
+        assert len(watchlist_statements) == 1
+        assert "backdrop_url" not in watchlist_statements[0]
+        assert "genres" not in watchlist_statements[0]
+
+    def test_unknown_field_rejected(self, auth_client, watchlist):
+        """Test fields not in the listing are a 400."""
+        response = auth_client.get("/api/watchlist?fields=title,password_hash")
+
+        assert response.status_code == 400
+        assert "password_hash" in json.loads(response.data)["error"]
+
+    def test_cursor_without_sort_field(self, auth_client, watchlist):
+        """Test cursors work when the sort column is not a requested field."""
+        params = "sort_by=imdb&per_page=5"
+        expected = _ids(auth_client.get(f"/api/watchlist?{params}&page=2"))
+
+        first = json.loads(auth_client.get(f"/api/watchlist?{params}&fields=id").data)
+        second = auth_client.get(
+            f"/api/watchlist?{params}&fields=id&cursor={first['next_cursor']}"
+        )
+
+        assert _ids(second) == expected
+
+
+class TestWatchlistGenres:
+    """Tests for genre filtering and the genre dropdown."""
+
+    @pytest.fixture
+    def genre_movies(self, app, sample_user):
+        for movie_id, genres in (
+            ("tt1", ["Action", "Sci-Fi"]),
+            ("tt2", ["Drama"]),
+            ("tt3", ["Action"]),
+        ):
+            db.session.add(Movie(id=movie_id, title=movie_id, genres=genres))
+            db.session.add(WatchlistEntry(user_id=sample_user["id"], movie_id=movie_id))
+        # Genres of movies on no watchlist are not offered
+        db.session.add(Movie(id="tt4", title="tt4", genres=["Horror"]))
+        db.session.commit()
+
+    def test_filter_by_genre(self, auth_client, genre_movies):
+        """Test only movies with the genre are listed."""
+        response = auth_client.get("/api/watchlist?genre=Action&sort_by=title")
+
+        assert _ids(response) == ["tt3", "tt1"]
+        assert json.loads(response.data)["total"] == 2
+
+    def test_filter_by_unknown_genre(self, auth_client, genre_movies):
+        """Test an unknown genre matches nothing."""
+        assert _ids(auth_client.get("/api/watchlist?genre=Western")) == []
+
+    def test_genre_dropdown(self, auth_client, genre_movies):
+        """Test the dropdown lists the watchlist's genres, sorted."""
+        response = auth_client.get("/api/watchlist/genres")
+
+        assert json.loads(response.data) == {"genres": ["Action", "Drama", "Sci-Fi"]}
+
+
+class TestWatchlistSearch:
+    """Tests for title search of GET /api/watchlist."""
+
+    @pytest.fixture
+    def search_movies(self, app, sample_user):
+        for movie_id, title in (
+            ("tt1", "The Matrix"),
+            ("tt2", "The Matrix Reloaded"),
+            ("tt3", "Amélie"),
+            ("tt4", "Mad Max: Fury Road"),
+            ("tt5", "Matrix"),
+        ):
+            db.session.add(Movie(id=movie_id, title=title))
+            db.session.add(WatchlistEntry(user_id=sample_user["id"], movie_id=movie_id))
+        # Matches, but is on no watchlist
+        db.session.add(Movie(id="tt6", title="The Matrix Resurrections"))
+        db.session.commit()
+
+    def test_words_match_as_prefixes(self, auth_client, search_movies):
+        """Test every word must start a word of the title, in any order."""
+        response = auth_client.get("/api/watchlist?search=rel%20matr&sort_by=title")
+
+        assert _ids(response) == ["tt2"]
+
+    def test_prefix_not_substring(self, auth_client, search_movies):
+        """Test words match the start of title words only."""
+        assert _ids(auth_client.get("/api/watchlist?search=atrix")) == []
+
+    def test_case_and_accents_ignored(self, auth_client, search_movies):
+        """Test search ignores case and diacritics."""
+        assert _ids(auth_client.get("/api/watchlist?search=AMELIE")) == ["tt3"]
+
+    def test_sorted_by_relevance_by_default(self, auth_client, search_movies):
+        """Test closer title matches come first when searching."""
+        response = auth_client.get("/api/watchlist?search=matrix")
+
+        ids = _ids(response)
+        assert sorted(ids) == ["tt1", "tt2", "tt5"]
+        assert ids[0] == "tt5"
+        assert ids[-1] == "tt2"
+        assert json.loads(response.data)["total"] == 3
+
+    def test_explicit_sort_overrides_relevance(self, auth_client, search_movies):
+        """Test another sort_by still applies to search results."""
+        response = auth_client.get(
+            "/api/watchlist?search=matrix&sort_by=title&sort_order=asc"
+        )
+
+        assert _ids(response) == ["tt5", "tt1", "tt2"]
+
+    def test_relevance_pages_have_no_cursor(self, auth_client, search_movies):
+        """Test relevance sort paginates by page number only."""
+        response = auth_client.get("/api/watchlist?search=matrix&per_page=2")
+
+        data = json.loads(response.data)
+        assert len(data["movies"]) == 2
+        assert data["next_cursor"] is None
+        assert data["pages"] == 2
+
+    def test_punctuation_only_search(self, auth_client, search_movies):
+        """Test searches without words fall back to a substring match."""
+        assert _ids(auth_client.get("/api/watchlist?search=:")) == ["tt4"]
+
+    def test_index_follows_title_changes(self, auth_client, search_movies):
+        """Test renamed movies are re-indexed."""
+        db.session.get(Movie, "tt3").title = "Le Fabuleux Destin"
+        db.session.commit()
+
+        assert _ids(auth_client.get("/api/watchlist?search=amelie")) == []
+        assert _ids(auth_client.get("/api/watchlist?search=fabuleux")) == ["tt3"]
+
+
+class TestWatchlistAverageScore:
+    """Tests for sorting and filtering on the stored average score."""
+
+    @pytest.fixture
+    def scored_movies(self, app, sample_user):
+        for movie_id, imdb, rt in (
+            ("tt1", 6.0, 8.0),
+            ("tt2", 9.0, None),
+            ("tt3", None, None),
+            ("tt4", 5.0, 6.0),
+        ):
+            db.session.add(
+                Movie(id=movie_id, title=movie_id, imdb_rating=imdb, rt_tomatometer=rt)
+            )
+            db.session.add(WatchlistEntry(user_id=sample_user["id"], movie_id=movie_id))
+        db.session.commit()
+
+    def test_sort_by_average_score(self, auth_client, scored_movies):
+        """Test movies are ranked by the average score, unrated last."""
+        response = auth_client.get("/api/watchlist?sort_by=average_score")
+
+        assert _ids(response) == ["tt2", "tt1", "tt4", "tt3"]
+        scores = [
+            movie["average_score"] for movie in json.loads(response.data)["movies"]
+        ]
+        assert scores == [9.0, 7.0, 5.5, 0]
+
+    def test_min_average(self, auth_client, scored_movies):
+        """Test min_average keeps movies averaging at least that score."""
+        response = auth_client.get("/api/watchlist?min_average=7&sort_by=title")
+
+        assert _ids(response) == ["tt2", "tt1"]
+
+
+class TestWatchlistBulkAdd:
+    """Tests for POST /api/watchlist/bulk."""
+
+    def _post(self, client, movies):
+        response = client.post(
+            "/api/watchlist/bulk",
+            data=json.dumps({"movies": movies}),
+            content_type="application/json",
+        )
+        return json.loads(response.data)
+
+    def test_added_skipped_and_errors(self, auth_client, sample_user):
+        """Test each movie is reported as added, skipped or an error."""
+        db.session.add(Movie(id="tt1", title="Listed"))
+        db.session.add(Movie(id="tt2", title="Stored"))
+        db.session.add(WatchlistEntry(user_id=sample_user["id"], movie_id="tt1"))
+        db.session.commit()
+
+        data = self._post(
+            auth_client,
+            [
+                {"movie_id": "tt1"},
+                {"movie_id": "tt2"},
+                {"movie_id": "tt3", "title": "New", "imdb_rating": 8.0},
+                {"movie_id": "tt3", "title": "New"},
+                {"movie_id": "tt4"},
+                {"title": "No id"},
+            ],
+        )
+
+        assert data["added"] == ["tt2", "tt3"]
+        assert data["added_count"] == 2
+        assert sorted(data["skipped"]) == ["tt1", "tt3"]
+        assert data["errors"] == [
+            {"movie_id": None, "error": "movie_id is required"},
+            {"movie_id": "tt4", "error": "title is required"},
+        ]
+        assert db.session.get(Movie, "tt2").title == "Stored"
+        assert db.session.get(Movie, "tt3").average_score == 8.0
+
+    def test_new_movies_indexed(self, auth_client):
+        """Test bulk-inserted movies are searchable and filterable by genre."""
+        self._post(
+            auth_client,
+            [
+                {"movie_id": "tt1", "title": "The Matrix", "genres": ["Sci-Fi"]},
+                {"movie_id": "tt2", "title": "Heat", "genres": ["Crime"]},
+            ],
+        )
+
+        assert _ids(auth_client.get("/api/watchlist?search=matrix")) == ["tt1"]
+        assert _ids(auth_client.get("/api/watchlist?genre=Crime")) == ["tt2"]
+
+    def test_statement_count_independent_of_size(self, app, auth_client):
+        """Test the number of statements does not grow with the list."""
+        from sqlalchemy import event
+
+        counts = []
+        for start, size in ((0, 5), (100, 50)):
+            executed = []
+
+            def record(conn, cursor, statement, *args):
+                if "movies" in statement or "watchlist_entries" in statement:
+                    executed.append(statement)
+
+            event.listen(db.engine, "before_cursor_execute", record)
+            self._post(
+                auth_client,
+                [
+                    {"movie_id": f"tt{i}", "title": f"Movie {i}"}
+                    for i in range(start, start + size)
+                ],
+            )
+            event.remove(db.engine, "before_cursor_execute", record)
+            counts.append(len(executed))
+
+        assert counts[0] == counts[1]
+
+
+class TestWatchlistAdd:
+    """Tests for POST /api/watchlist."""
+
+    def _post(self, client, data):
+        response = client.post(
+            "/api/watchlist", data=json.dumps(data), content_type="application/json"
+        )
+        return response.status_code, json.loads(response.data)
+
+    def test_add_new_movie(self, auth_client):
+        """Test a new movie is stored and returned with its average."""
+        status, data = self._post(
+            auth_client,
+            {
+                "movie_id": "tt1",
+                "title": "The Matrix",
+                "imdb_rating": 8.7,
+                "tmdb_rating": 8.2,
+                "genres": ["Action"],
+            },
+        )
+
+        assert status == 200
+        assert data["movie"]["title"] == "The Matrix"
+        assert data["movie"]["average_score"] == 8.5
+        assert data["movie"]["added_at"]
+        assert _ids(auth_client.get("/api/watchlist?genre=Action")) == ["tt1"]
+
+    def test_add_stored_movie_merges_ratings(self, auth_client):
+        """Test adding a stored movie updates given ratings and keeps the rest."""
+        db.session.add(
+            Movie(id="tt1", title="Stored", imdb_rating=8.0, tmdb_rating=6.0)
+        )
+        db.session.commit()
+
+        status, data = self._post(
+            auth_client, {"movie_id": "tt1", "title": "Other", "tmdb_rating": 7.0}
+        )
+
+        assert status == 200
+        assert data["movie"]["title"] == "Stored"
+        assert data["movie"]["imdb_rating"] == 8.0
+        assert data["movie"]["tmdb_rating"] == 7.0
+        assert data["movie"]["average_score"] == 7.5
+
+    def test_add_stored_movie_without_title(self, auth_client):
+        """Test a title is only needed to create the movie."""
+        db.session.add(Movie(id="tt1", title="Stored"))
+        db.session.commit()
+
+        status, _ = self._post(auth_client, {"movie_id": "tt1", "imdb_rating": 7.0})
+        assert status == 200
+        status, data = self._post(auth_client, {"movie_id": "tt2"})
+        assert status == 400
+        assert data["error"] == "title is required"
+
+    def test_add_without_scores_keeps_ratings_stale(self, auth_client):
+        """Test only an add with scores marks the movie's ratings fresh."""
+        stale = datetime(2020, 1, 1)
+        db.session.add(Movie(id="tt1", title="Stored", ratings_updated_at=stale))
+        db.session.commit()
+
+        self._post(auth_client, {"movie_id": "tt1", "genres": ["Drama"]})
+        self._post(auth_client, {"movie_id": "tt2", "title": "New"})
+        self._post(auth_client, {"movie_id": "tt3", "title": "Rated", "imdb_rating": 7})
+
+        db.session.expire_all()
+        assert db.session.get(Movie, "tt1").ratings_updated_at == stale
+        assert db.session.get(Movie, "tt2").ratings_updated_at is None
+        assert db.session.get(Movie, "tt3").ratings_updated_at > stale
+
+    def test_add_twice_changes_nothing(self, auth_client):
+        """Test a repeated add is a 409 and does not touch the movie."""
+        self._post(auth_client, {"movie_id": "tt1", "title": "A", "imdb_rating": 6.0})
+
+        status, data = self._post(
+            auth_client, {"movie_id": "tt1", "title": "A", "imdb_rating": 9.0}
+        )
+
+        assert status == 409
+        assert data["error"] == "Movie already in watchlist"
+        assert db.session.get(Movie, "tt1").imdb_rating == 6.0
+
+    @patch("utils.watchlist_store.dialect_insert", return_value=None)
+    def test_add_without_upserts_uses_orm(self, _dialect_insert, auth_client):
+        """Test databases without ON CONFLICT get the same results."""
+        db.session.add(Movie(id="tt1", title="Stored", imdb_rating=8.0))
+        db.session.commit()
+
+        status, data = self._post(
+            auth_client, {"movie_id": "tt1", "title": "Other", "tmdb_rating": 7.0}
+        )
+        assert status == 200
+        assert data["movie"]["title"] == "Stored"
+        assert data["movie"]["average_score"] == 7.5
+        status, data = self._post(
+            auth_client, {"movie_id": "tt2", "title": "New", "genres": ["Action"]}
+        )
+        assert status == 200
+        assert data["movie"]["added_at"]
+        assert _ids(auth_client.get("/api/watchlist?genre=Action")) == ["tt2"]
+
+        assert self._post(auth_client, {"movie_id": "tt1"})[0] == 409
+        assert self._post(auth_client, {"movie_id": "tt3"})[0] == 400
+
+    def test_add_takes_two_statements(self, app, auth_client):
+        """Test an add is one movie upsert and one entry insert."""
+        from sqlalchemy import event
+
+        auth_client.get("/api/auth/status")
+        executed = []
+
+        def record(conn, cursor, statement, *args):
+            if "movies" in statement or "watchlist_entries" in statement:
+                executed.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        self._post(auth_client, {"movie_id": "tt1", "title": "A", "imdb_rating": 6.0})
+        event.remove(db.engine, "before_cursor_execute", record)
+
+        assert len(executed) == 2
+        assert "ON CONFLICT" in executed[0]
+        assert "ON CONFLICT" in executed[1]
+
+    def test_concurrent_adds_of_one_movie(self, app, file_db):
+        """Test many users adding the same new movie at once never error."""
+        import threading
+
+        from werkzeug.security import generate_password_hash
+
+        from utils.models import User
+
+        password_hash = generate_password_hash("password123")
+        clients = []
+        for i in range(8):
+            db.session.add(
+                User(email=f"user{i}@example.com", password_hash=password_hash)
+            )
+        db.session.commit()
+        for i in range(8):
+            client = app.test_client()
+            client.post(
+                "/api/auth/login",
+                data=json.dumps(
+                    {"email": f"user{i}@example.com", "password": "password123"}
+                ),
+                content_type="application/json",
+            )
+            clients.append(client)
+
+        barrier = threading.Barrier(len(clients))
+        statuses = []
+
+        def add(client):
+            barrier.wait()
+            for _ in range(3):
+                status, _ = self._post(
+                    client,
+                    {"movie_id": "tt1", "title": "Shared", "imdb_rating": 7.0},
+                )
+                statuses.append(status)
+
+        threads = [threading.Thread(target=add, args=(c,)) for c in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(statuses) == [200] * 8 + [409] * 16
+        assert Movie.query.count() == 1
+        assert WatchlistEntry.query.filter_by(movie_id="tt1").count() == 8
+
+
+class TestWatchlistIds:
+    """Tests for GET /api/watchlist/ids and its version-based ETag."""
+
+    def test_returns_every_id(self, auth_client, sample_user):
+        """Test all ids are returned, beyond the listing's per_page cap."""
+        for i in range(150):
+            db.session.add(Movie(id=f"tt{i}", title=f"Movie {i}"))
+            db.session.add(WatchlistEntry(user_id=sample_user["id"], movie_id=f"tt{i}"))
+        db.session.commit()
+
+        response = auth_client.get("/api/watchlist/ids")
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert sorted(data["ids"]) == sorted(f"tt{i}" for i in range(150))
+        assert set(data) == {"ids", "version"}
+
+    def test_unchanged_watchlist_is_not_modified(self, auth_client):
+        """Test sending the ETag back gets an empty 304."""
+        first = auth_client.get("/api/watchlist/ids")
+        etag = first.headers["ETag"]
+
+        response = auth_client.get(
+            "/api/watchlist/ids", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.headers["ETag"] == etag
+        assert "private" in response.headers["Cache-Control"]
+
+    def test_changes_bump_the_version(self, auth_client):
+        """Test adds, bulk adds and removals each change the ETag."""
+
+        def etag():
+            return auth_client.get("/api/watchlist/ids").headers["ETag"]
+
+        etags = [etag()]
+        auth_client.post(
+            "/api/watchlist",
+            data=json.dumps({"movie_id": "tt1", "title": "One"}),
+            content_type="application/json",
+        )
+        etags.append(etag())
+        auth_client.post(
+            "/api/watchlist/bulk",
+            data=json.dumps({"movies": [{"movie_id": "tt2", "title": "Two"}]}),
+            content_type="application/json",
+        )
+        etags.append(etag())
+        auth_client.delete("/api/watchlist/tt1")
+        etags.append(etag())
+
+        assert len(set(etags)) == 4
+        data = json.loads(auth_client.get("/api/watchlist/ids").data)
+        assert data == {"ids": ["tt2"], "version": 3}
+
+    def test_no_op_changes_keep_the_version(self, auth_client):
+        """Test duplicate adds and missing removals leave the ETag alone."""
+        auth_client.post(
+            "/api/watchlist",
+            data=json.dumps({"movie_id": "tt1", "title": "One"}),
+            content_type="application/json",
+        )
+        etag = auth_client.get("/api/watchlist/ids").headers["ETag"]
+
+        auth_client.post(
+            "/api/watchlist",
+            data=json.dumps({"movie_id": "tt1", "title": "One"}),
+            content_type="application/json",
+        )
+        auth_client.post(
+            "/api/watchlist/bulk",
+            data=json.dumps({"movies": [{"movie_id": "tt1"}]}),
+            content_type="application/json",
+        )
+        auth_client.delete("/api/watchlist/tt9")
+
+        response = auth_client.get(
+            "/api/watchlist/ids", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+    def test_etag_differs_between_users(self, auth_client):
+        """Test one user's ETag never validates another user's ids."""
+        from werkzeug.security import generate_password_hash
+
+        from utils.models import User
+
+        db.session.add(
+            User(
+                email="other@example.com",
+                password_hash=generate_password_hash("password123"),
+            )
+        )
+        db.session.commit()
+        etag = auth_client.get("/api/watchlist/ids").headers["ETag"]
+        auth_client.post("/api/auth/logout")
+        auth_client.post(
+            "/api/auth/login",
+            data=json.dumps({"email": "other@example.com", "password": "password123"}),
+            content_type="application/json",
+        )
+
+        response = auth_client.get(
+            "/api/watchlist/ids", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_requires_login(self, client):
+        """Test anonymous requests get a JSON 401."""
+        assert client.get("/api/watchlist/ids").status_code == 401
+
+
+class TestWatchlistExport:
+    """Tests for GET /api/watchlist/export."""
+
+    def test_csv_export(self, auth_client, watchlist):
+        """Test the CSV export holds every movie in listing order."""
+        import csv
+        import io
+
+        response = auth_client.get("/api/watchlist/export?sort_by=title")
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/csv"
+        assert "watchlist.csv" in response.headers["Content-Disposition"]
+        assert [row["id"] for row in rows] == _ids(
+            auth_client.get("/api/watchlist?sort_by=title&per_page=100")
+        )
+        assert rows[0]["added_at"] == "2024-01-06T00:00:00"
+
+    def test_ndjson_export_with_filters(self, auth_client, watchlist):
+        """Test NDJSON exports apply the listing filters, sort and fields."""
+        params = "min_rating=5&sort_by=imdb&sort_order=asc&fields=title,imdb_rating"
+        response = auth_client.get(f"/api/watchlist/export?format=ndjson&{params}")
+        movies = [json.loads(line) for line in response.get_data().splitlines()]
+
+        assert response.mimetype == "application/x-ndjson"
+        assert [movie["id"] for movie in movies] == _ids(
+            auth_client.get(f"/api/watchlist?{params}")
+        )
+        assert list(movies[0]) == ["id", "title", "imdb_rating"]
+
+    def test_streamed_in_batches(self, auth_client, watchlist):
+        """Test rows are read and written a batch at a time."""
+        from unittest.mock import patch
+
+        with patch("utils.export.EXPORT_BATCH_SIZE", 5):
+            response = auth_client.get(
+                "/api/watchlist/export?format=ndjson", buffered=False
+            )
+            chunks = list(response.response)
+
+        assert response.is_streamed
+        assert [chunk.count(b"\n") for chunk in chunks] == [5, 5, 2]
+
+    def test_empty_csv_export_has_header(self, auth_client):
+        """Test an empty watchlist exports just the CSV header."""
+        response = auth_client.get("/api/watchlist/export?fields=title")
+
+        assert response.get_data(as_text=True).strip() == "id,title"
+
+    def test_unknown_format_rejected(self, auth_client, watchlist):
+        """Test formats other than csv and ndjson are a 400."""
+        response = auth_client.get("/api/watchlist/export?format=xml")
+
+        assert response.status_code == 400
+
+    def test_requires_login(self, client):
+        """Test exports need an authenticated user."""
+        response = client.get("/api/watchlist/export")
+
+        assert response.status_code == 401
+
+
+IMDB_RATINGS_CSV = (
+    # IMDb exports start with a byte order mark
+    "\ufeffConst,Your Rating,Date Rated,Title,Original Title,URL,Title Type,"
+    "IMDb Rating,Runtime (mins),Year,Genres,Num Votes,Release Date,Directors\n"
+    "tt0133093,9,2024-01-01,The Matrix,The Matrix,"
+    "https://www.imdb.com/title/tt0133093/,Movie,8.7,136,1999,"
+    '"Action, Sci-Fi",2000000,1999-03-31,Lana Wachowski\n'
+    "tt0234215,7,2024-01-02,The Matrix Reloaded,The Matrix Reloaded,"
+    "https://www.imdb.com/title/tt0234215/,Movie,7.2,138,2003,"
+    '"Action, Sci-Fi",600000,2003-05-15,Lana Wachowski\n'
+)
+
+
+def _upload(client, text, filename="ratings.csv"):
+    import io
+
+    return client.post(
+        "/api/watchlist/import",
+        data={"file": (io.BytesIO(text.encode()), filename)},
+        content_type="multipart/form-data",
+    )
+
+
+class TestWatchlistImport:
+    """Tests for POST /api/watchlist/import."""
+
+    @pytest.fixture(autouse=True)
+    def completion(self):
+        """The background step, not run: it calls the search and providers."""
+        with patch("app.start_import_completion") as mock_start:
+            yield mock_start
+
+    @patch("utils.imdb_import.search_movies_parallel")
+    def test_import_by_const(self, mock_search, auth_client, sample_user, completion):
+        """Test rows with a Const are stored without searching."""
+        from app import app, ratings_refresher
+
+        response = _upload(auth_client, IMDB_RATINGS_CSV)
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert data["rows"] == 2
+        assert data["added_count"] == 2
+        assert data["ratings_pending"] == 2
+        mock_search.assert_not_called()
+        completion.assert_called_once_with(
+            app, sample_user["id"], ["tt0133093", "tt0234215"], [], ratings_refresher
+        )
+
+        movie = db.session.get(Movie, "tt0133093")
+        assert movie.title == "The Matrix"
+        assert movie.year == 1999
+        assert movie.imdb_rating == 8.7
+        assert movie.genres == ["Action", "Sci-Fi"]
+        # Left stale for the background refresh to fill in
+        assert movie.ratings_updated_at is None
+        assert WatchlistEntry.query.filter_by(user_id=sample_user["id"]).count() == 2
+
+    @patch("utils.imdb_import.search_movies_parallel")
+    def test_rows_without_const_left_for_search(
+        self, mock_search, auth_client, completion
+    ):
+        """Test rows with only a title are searched for after the response."""
+        data = json.loads(
+            _upload(auth_client, "Title,Year\nThe Matrix,1999\nNope,\n").data
+        )
+
+        assert data["added_count"] == 0
+        assert data["searches_pending"] == 2
+        mock_search.assert_not_called()
+        assert completion.call_args.args[3] == [
+            {"title": "The Matrix", "year": 1999},
+            {"title": "Nope", "year": None},
+        ]
+
+    @patch("utils.imdb_import.search_movies_parallel")
+    def test_completion_searches_and_rates(self, mock_search, sample_user):
+        """Test the background step adds found titles and rates new movies."""
+        from unittest.mock import MagicMock
+
+        from utils.imdb_import import complete_import
+
+        db.session.add(Movie(id="tt0234215", title="The Matrix Reloaded"))
+        db.session.add(
+            Movie(
+                id="tt0242653", title="Revolutions", ratings_updated_at=datetime.now()
+            )
+        )
+        db.session.commit()
+        mock_search.return_value = {
+            "movies": [
+                {
+                    "id": "tt0133093",
+                    "query": "The Matrix 1999",
+                    "title": "The Matrix",
+                    "year": 1999,
+                    "logo_url": "https://example.com/matrix.jpg",
+                    "page_url": "https://www.imdb.com/title/tt0133093/",
+                }
+            ],
+            "errors": [{"query": "Nope", "error": "Movie not found"}],
+        }
+        refresher = MagicMock(batch_size=2)
+        refresher.refresh.return_value = {"movies": 1, "refreshed": 1, "failed": 0}
+
+        result = complete_import(
+            sample_user["id"],
+            ["tt0234215", "tt0242653"],
+            [{"title": "The Matrix", "year": 1999}, {"title": "Nope", "year": None}],
+            refresher,
+        )
+
+        mock_search.assert_called_once_with(
+            [{"query": "The Matrix 1999"}, {"query": "Nope"}]
+        )
+        assert result["added"] == 1
+        assert result["errors"] == [
+            {"movie_id": None, "title": "Nope", "error": "Movie not found"}
+        ]
+        # Only movies still without ratings are looked up
+        batches = [call.args[0] for call in refresher.refresh.call_args_list]
+        assert [[movie["id"] for movie in movies] for movies in batches] == [
+            ["tt0234215"],
+            ["tt0133093"],
+        ]
+        assert result["refreshed"] == 2
+
+    def test_completion_runs_in_background(self, app, sample_user):
+        """Test the background step gets its own app context."""
+        from flask import current_app
+
+        from utils.imdb_import import start_import_completion
+
+        apps = []
+
+        def complete(*args):
+            apps.append(current_app.name)
+            return {"added": 0, "errors": [], "refreshed": 1, "failed": 0}
+
+        with patch(
+            "utils.imdb_import.complete_import", side_effect=complete
+        ) as mock_complete:
+            start_import_completion(app, 1, ["tt1"], [], "refresher").join(5)
+
+        mock_complete.assert_called_once_with(1, ["tt1"], [], "refresher")
+        assert apps == [app.name]
+
+    def test_imported_in_batches(self, auth_client, sample_user):
+        """Test every batch is stored and repeated titles are skipped."""
+        rows = "".join(f"tt{i:07d},Movie {i}\n" for i in range(5))
+
+        with patch("utils.imdb_import.IMPORT_BATCH_SIZE", 2):
+            data = json.loads(
+                _upload(auth_client, f"Const,Title\n{rows}tt0000001,Movie 1\n").data
+            )
+
+        assert data["rows"] == 6
+        assert data["added_count"] == 5
+        assert data["skipped_count"] == 1
+        assert WatchlistEntry.query.filter_by(user_id=sample_user["id"]).count() == 5
+
+    def test_text_csv_body(self, auth_client):
+        """Test the CSV can be sent as the request body."""
+        response = auth_client.post(
+            "/api/watchlist/import",
+            data="tconst,primaryTitle,startYear\ntt0133093,The Matrix,1999\n",
+            content_type="text/csv",
+        )
+
+        assert json.loads(response.data)["added_count"] == 1
+        assert db.session.get(Movie, "tt0133093").year == 1999
+
+    def test_reported_errors_capped(self, auth_client):
+        """Test only the first errors are listed, all are counted."""
+        with patch("utils.imdb_import.MAX_REPORTED_ERRORS", 2):
+            data = json.loads(_upload(auth_client, "Const,Title\nx,A\ny,B\nz,C\n").data)
+
+        assert data["errors_count"] == 3
+        assert [error["movie_id"] for error in data["errors"]] == ["x", "y"]
+
+    def test_only_new_movies_rated(self, auth_client, completion):
+        """Test movies already stored are not looked up again."""
+        db.session.add(Movie(id="tt0133093", title="The Matrix", imdb_rating=8.7))
+        db.session.commit()
+
+        data = json.loads(_upload(auth_client, IMDB_RATINGS_CSV).data)
+
+        assert data["added_count"] == 2
+        assert data["ratings_pending"] == 1
+        assert completion.call_args.args[2] == ["tt0234215"]
+
+    def test_nothing_left_to_complete(self, auth_client, completion):
+        """Test no background step starts when every movie was stored."""
+        db.session.add(Movie(id="tt0133093", title="The Matrix"))
+        db.session.add(Movie(id="tt0234215", title="The Matrix Reloaded"))
+        db.session.commit()
+
+        _upload(auth_client, IMDB_RATINGS_CSV)
+
+        completion.assert_not_called()
+
+    def test_csv_without_id_or_title_rejected(self, auth_client):
+        """Test files without a Const or Title column are a 400."""
+        response = _upload(auth_client, "Name,Rating\nfoo,1\n")
+
+        assert response.status_code == 400
+        assert "Const" in json.loads(response.data)["error"]
+
+    def test_file_required(self, auth_client):
+        """Test requests without a CSV are a 400."""
+        response = auth_client.post("/api/watchlist/import", json={})
+
+        assert response.status_code == 400
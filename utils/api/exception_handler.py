@@ -3,6 +3,24 @@ from typing import Callable
 import requests
 
 
+class TransientAPIError(Exception):
+    """
+    Upstream call failed in a way that may succeed on retry
+    (timeout, connection error, rate limit, rejected credentials or
+    blocked client, or server error).
+    Definitive misses are returned as None instead.
+    """
+
+
+def is_transient_status(status_code: int) -> bool:
+    """
+    Check if an HTTP status means the provider is unavailable to us for now.
+    401/403 say nothing about the movie (an expired key, a blocked client),
+    so they are not cached as misses either.
+    """
+    return status_code in (401, 403, 429) or status_code >= 500
+
+
 def handle_api_exception(api_connection_func: Callable):
     def wrapper(*args, **kwargs):
         try:
@@ -10,10 +28,15 @@ def handle_api_exception(api_connection_func: Callable):
         except (
             requests.exceptions.ConnectionError,
             requests.exceptions.Timeout,
-            requests.exceptions.HTTPError,
             requests.exceptions.JSONDecodeError,
-            requests.exceptions.TooManyRedirects,
-        ):
+        ) as exception:
+            raise TransientAPIError(str(exception)) from exception
+        except requests.exceptions.HTTPError as exception:
+            response = exception.response
+            if response is None or is_transient_status(response.status_code):
+                raise TransientAPIError(str(exception)) from exception
+            return None
+        except requests.exceptions.TooManyRedirects:
             return None
         except requests.exceptions.RequestException as exception:
             raise exception
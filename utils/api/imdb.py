@@ -1,8 +1,8 @@
 import pydash
-import requests
 
 from ..env_variables import EnvVariable
 from .exception_handler import handle_api_exception
+from .session import get_json
 
 
 def pick_top_valid_result(results):
@@ -39,7 +39,7 @@ def get_top_search_result(q: str):
         "X-RapidAPI-Host": "imdb8.p.rapidapi.com",
     }
 
-    response = requests.get(url, headers=headers, params=querystring).json()
+    response = get_json("imdb", url, headers=headers, params=querystring)
 
     top_results = pydash.get(response, "results", None)
 
@@ -85,7 +85,7 @@ def get_imdb_rating(tconst: str):
         "X-RapidAPI-Key": EnvVariable.IMDB_API_KEY.value,
         "X-RapidAPI-Host": "imdb8.p.rapidapi.com",
     }
-    response = requests.get(url, headers=headers, params=query_params).json()
+    response = get_json("imdb", url, headers=headers, params=query_params)
 
     rating = pydash.get(response, "rating", None)
     if rating is not None:
@@ -109,7 +109,7 @@ def get_imdb_genres(tconst: str):
         "X-RapidAPI-Key": EnvVariable.IMDB_API_KEY.value,
         "X-RapidAPI-Host": "imdb8.p.rapidapi.com",
     }
-    response = requests.get(url, headers=headers, params=query_params).json()
+    response = get_json("imdb", url, headers=headers, params=query_params)
 
     # Response is typically a list of genre strings
     if isinstance(response, list):
@@ -4,6 +4,9 @@ import re
 import requests
 from bs4 import BeautifulSoup
 
+from .exception_handler import TransientAPIError, is_transient_status
+from .session import get_session
+
 RT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 }
@@ -24,6 +27,7 @@ def _fetch_rt_page(movie_url: str) -> dict:
     """
     Fetch and parse a single RT page.
     Returns movie data dict with both tomatometer (critics) and popcornmeter (audience) scores.
+    Raises TransientAPIError on timeouts, connection errors, 429 and 5xx.
     """
     movie_data = {
         "tomatometer": 0.0,  # Critics score
@@ -34,8 +38,12 @@ def _fetch_rt_page(movie_url: str) -> dict:
     }
 
     try:
-        response = requests.get(movie_url, headers=RT_HEADERS, timeout=10)
+        response = get_session("rt").get(movie_url, headers=RT_HEADERS)
 
+        if is_transient_status(response.status_code):
+            raise TransientAPIError(
+                f"Rotten Tomatoes returned HTTP {response.status_code}"
+            )
         if response.status_code != 200:
             return movie_data
 
@@ -109,8 +117,10 @@ def _fetch_rt_page(movie_url: str) -> dict:
                     except (ValueError, TypeError):
                         continue
 
-    except requests.exceptions.RequestException:
+    except requests.exceptions.TooManyRedirects:
         pass
+    except requests.exceptions.RequestException as exception:
+        raise TransientAPIError(str(exception)) from exception
 
     return movie_data
 
@@ -0,0 +1,90 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..env_variables import EnvVariable
+
+# Default request timeouts per provider, in seconds
+PROVIDER_TIMEOUTS = {
+    "imdb": EnvVariable.IMDB_TIMEOUT.value,
+    "tmdb": EnvVariable.TMDB_TIMEOUT.value,
+    "rt": EnvVariable.RT_TIMEOUT.value,
+}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout when the caller passes none."""
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def create_session(
+    timeout: float,
+    pool_connections: int = None,
+    pool_maxsize: int = None,
+    pool_block: bool = None,
+) -> requests.Session:
+    """
+    Create a keep-alive session backed by a bounded urllib3 connection pool.
+    pool_connections: number of per-host pools to keep
+    pool_maxsize: maximum open connections per host
+    pool_block: wait for a free connection instead of opening extra ones
+    """
+    adapter = TimeoutHTTPAdapter(
+        timeout=timeout,
+        pool_connections=pool_connections or EnvVariable.HTTP_POOL_CONNECTIONS.value,
+        pool_maxsize=pool_maxsize or EnvVariable.HTTP_POOL_MAXSIZE.value,
+        pool_block=(
+            EnvVariable.HTTP_POOL_BLOCK.value if pool_block is None else pool_block
+        ),
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(provider: str) -> requests.Session:
+    """
+    Get the shared pooled session for a provider (imdb, tmdb, rt).
+    Sessions are created once per process and shared across threads.
+    """
+    session = _sessions.get(provider)
+    if session is not None:
+        return session
+
+    with _sessions_lock:
+        session = _sessions.get(provider)
+        if session is None:
+            session = create_session(timeout=PROVIDER_TIMEOUTS[provider])
+            _sessions[provider] = session
+        return session
+
+
+def close_sessions():
+    """Close all provider sessions and their pooled connections."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def get_json(provider: str, url: str, **kwargs):
+    """
+    GET a JSON document through the provider session.
+    Raises requests.HTTPError for 4xx/5xx responses.
+    """
+    response = get_session(provider).get(url, **kwargs)
+    response.raise_for_status()
+    return response.json()
@@ -1,8 +1,8 @@
 import pydash
-import requests
 
 from ..env_variables import EnvVariable
 from .exception_handler import handle_api_exception
+from .session import get_json
 
 
 @handle_api_exception
@@ -19,11 +19,9 @@ def fetch_movie_data_from_tmdb(
     if year:
         params["year"] = year
 
-    response = requests.get(
-        "https://api.themoviedb.org/3/search/movie",
-        params=params,
-        timeout=5,
-    ).json()
+    response = get_json(
+        "tmdb", "https://api.themoviedb.org/3/search/movie", params=params
+    )
 
     result = pydash.get(response, "results[0]", None)
     if result:
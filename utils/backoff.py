@@ -0,0 +1,38 @@
+# Retry backoff for keys whose upstream lookups keep failing transiently
+import threading
+from collections import OrderedDict
+
+
+class FailureBackoff:
+    """
+    Tracks consecutive failures per key and returns an exponential delay:
+    base, 2 * base, 4 * base, ... capped at max_delay. Only the most recently
+    failing max_keys keys are remembered.
+    """
+
+    def __init__(self, base: float = 30, max_delay: float = 900, max_keys: int = 10000):
+        self.base = base
+        self.max_delay = max_delay
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._failures = OrderedDict()
+        self._total = 0
+
+    def failure(self, key) -> float:
+        """Record a failure for key and return how long to wait before retrying."""
+        with self._lock:
+            count = self._failures.pop(key, 0) + 1
+            self._failures[key] = count
+            while len(self._failures) > self.max_keys:
+                self._failures.popitem(last=False)
+            self._total += 1
+        return min(self.base * 2 ** (count - 1), self.max_delay)
+
+    def reset(self, key):
+        """Forget failures for key after a successful call."""
+        with self._lock:
+            self._failures.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"backing_off": len(self._failures), "failures": self._total}
@@ -0,0 +1,104 @@
+# Cache backend interface shared by the memory, SQLite and Redis stores
+import threading
+import time
+
+
+class CacheEntry:
+    """
+    A cached value with the time it was stored and how long it stays fresh.
+    After expiring, an entry may still be served stale for `grace` seconds
+    while it is refreshed.
+    """
+
+    __slots__ = ("value", "stored_at", "ttl", "grace", "size")
+
+    def __init__(
+        self, value, stored_at: float, ttl: float, grace: float = 0, size: int = 0
+    ):
+        self.value = value
+        self.stored_at = stored_at
+        self.ttl = ttl
+        self.grace = grace
+        self.size = size
+
+    @property
+    def expires_at(self) -> float:
+        return self.stored_at + self.ttl
+
+    @property
+    def stale_until(self) -> float:
+        return self.expires_at + self.grace
+
+    def is_expired(self, now: float = None) -> bool:
+        return (now if now is not None else time.time()) >= self.expires_at
+
+    def is_dead(self, now: float = None) -> bool:
+        """Expired and past the grace window, so no longer servable at all."""
+        return (now if now is not None else time.time()) >= self.stale_until
+
+
+class CacheBackend:
+    """
+    Base class for cache stores keyed by (namespace, key).
+    Subclasses implement get_entry, set, delete and clear; values must be
+    JSON-serializable so they can be shared across processes. Namespaces
+    with a grace period keep expired entries around to be served stale.
+    """
+
+    def __init__(
+        self, ttls: dict = None, default_ttl: float = 3600, grace: dict = None
+    ):
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.grace = dict(grace or {})
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def ttl_for(self, namespace: str) -> float:
+        return self.ttls.get(namespace, self.default_ttl)
+
+    def grace_for(self, namespace: str) -> float:
+        """Seconds an expired entry is kept so it can be served stale."""
+        return self.grace.get(namespace, 0)
+
+    def get_entry(
+        self,
+        namespace: str,
+        key: str,
+        allow_stale: bool = False,
+        record_stats: bool = True,
+    ):
+        """
+        Get the CacheEntry for a key, or None if missing or expired.
+        With allow_stale, expired entries still inside their grace window
+        are returned too; callers check entry.is_expired(). Reads with
+        record_stats=False are left out of the hit/miss counters.
+        """
+        raise NotImplementedError
+
+    def get(self, namespace: str, key: str, default=None):
+        """Get a cached value if present and not expired."""
+        entry = self.get_entry(namespace, key)
+        return entry.value if entry is not None else default
+
+    def set(self, namespace: str, key: str, value, ttl: float = None):
+        """Store a value under the namespace TTL unless ttl is given."""
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {"hits": self._hits, "misses": self._misses}
+
+    def _record(self, hit: bool):
+        with self._stats_lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
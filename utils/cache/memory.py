@@ -0,0 +1,127 @@
+# Bounded in-process cache, the default backend
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from .base import CacheBackend, CacheEntry
+
+
+def _estimate_size(value) -> int:
+    """Approximate memory cost of a value by its JSON-encoded length."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class LRUCache(CacheBackend):
+    """
+    Thread-safe LRU cache with per-namespace TTLs.
+    Bounded by entry count and optionally by an approximate byte budget;
+    the least recently used entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = None,
+        ttls: dict = None,
+        default_ttl: float = 3600,
+        grace: dict = None,
+        purge_interval: float = 60,
+    ):
+        super().__init__(ttls=ttls, default_ttl=default_ttl, grace=grace)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.purge_interval = purge_interval
+
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self._last_purge = time.time()
+        self._evictions = 0
+
+    def get_entry(
+        self,
+        namespace: str,
+        key: str,
+        allow_stale: bool = False,
+        record_stats: bool = True,
+    ):
+        cache_key = (namespace, key)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry.is_dead(now):
+                self._remove(cache_key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                if not allow_stale and entry.is_expired(now):
+                    entry = None
+        if record_stats:
+            self._record(hit=entry is not None)
+        return entry
+
+    def set(self, namespace: str, key: str, value, ttl: float = None):
+        """Store a value, evicting least recently used entries to stay in budget."""
+        entry = CacheEntry(
+            value,
+            stored_at=time.time(),
+            ttl=ttl if ttl is not None else self.ttl_for(namespace),
+            grace=self.grace_for(namespace),
+            size=_estimate_size(value) if self.max_bytes else 0,
+        )
+        cache_key = (namespace, key)
+        with self._lock:
+            if cache_key in self._entries:
+                self._remove(cache_key)
+            self._entries[cache_key] = entry
+            self._bytes += entry.size
+
+            if entry.stored_at - self._last_purge >= self.purge_interval:
+                self.purge_expired()
+
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes and self._bytes > self.max_bytes
+            ):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self._evictions += 1
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._remove((namespace, key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def purge_expired(self):
+        """Drop every dead entry, including keys that are never read again."""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, e in self._entries.items() if e.is_dead(now)]
+            for cache_key in expired:
+                self._remove(cache_key)
+            self._last_purge = now
+            return len(expired)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **super().stats(),
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self._evictions,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, cache_key):
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self._bytes -= entry.size
@@ -0,0 +1,214 @@
+# Cache stored in a Redis-protocol server, shared by every app process
+import json
+import logging
+import queue
+import socket
+import time
+from urllib.parse import unquote, urlparse
+
+from .base import CacheBackend, CacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class RedisError(Exception):
+    """Error reply returned by the server."""
+
+
+class ProtocolError(RedisError):
+    """Reply that is not valid RESP; the connection can no longer be used."""
+
+
+class RedisClient:
+    """
+    Minimal thread-safe RESP client with a small connection pool.
+    Supports the handful of commands the cache needs, against Redis or any
+    server speaking the same protocol.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0, max_connections: int = 10):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        # redis://[[username]:password@]host[:port][/db]; a username selects
+        # a Redis 6 ACL user, otherwise AUTH checks the default user
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=max_connections)
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        conn = (sock, sock.makefile("rb"))
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if self.password:
+                credentials = [self.username] if self.username else []
+                self._send(conn, "AUTH", *credentials, self.password)
+            if self.db:
+                self._send(conn, "SELECT", self.db)
+        except BaseException:
+            self._close(conn)
+            raise
+        return conn
+
+    def execute(self, *args):
+        """Send one command and return its decoded reply."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        reusable = False
+        try:
+            reply = self._send(conn, *args)
+            reusable = True
+        except ProtocolError:
+            raise
+        except RedisError:
+            # An error reply leaves the connection in step with the server
+            reusable = True
+            raise
+        finally:
+            # Never return a connection in an unknown state to the pool
+            if reusable:
+                self._release(conn)
+            else:
+                self._close(conn)
+        return reply
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            self._close(conn)
+
+    @staticmethod
+    def _close(conn):
+        # The socket only closes once its reader is closed too
+        sock, reader = conn
+        reader.close()
+        sock.close()
+
+    def close(self):
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                return
+            self._close(conn)
+
+    def _send(self, conn, *args):
+        sock, reader = conn
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        sock.sendall(b"".join(parts))
+        return self._read_reply(reader)
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise RedisError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length == -1:
+                return None
+            return [self._read_reply(reader) for _ in range(length)]
+        raise ProtocolError(f"Unexpected reply: {line!r}")
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache stored in Redis so all workers share lookups and survive restarts.
+    Entries expire server-side once past their grace window; connection
+    failures degrade to cache misses.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "movie-ranklist:",
+        ttls: dict = None,
+        default_ttl: float = 3600,
+        grace: dict = None,
+        client: RedisClient = None,
+    ):
+        super().__init__(ttls=ttls, default_ttl=default_ttl, grace=grace)
+        self.prefix = prefix
+        self.client = client or RedisClient(url)
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}{namespace}:{key}"
+
+    def get_entry(
+        self,
+        namespace: str,
+        key: str,
+        allow_stale: bool = False,
+        record_stats: bool = True,
+    ):
+        entry = None
+        try:
+            raw = self.client.execute("GET", self._key(namespace, key))
+        except (OSError, ConnectionError, RedisError) as exception:
+            logger.warning("Redis cache get failed: %s", exception)
+            raw = None
+
+        if raw is not None:
+            data = json.loads(raw)
+            entry = CacheEntry(
+                data["v"], stored_at=data["s"], ttl=data["t"], grace=data.get("g", 0)
+            )
+            if entry.is_dead() or (not allow_stale and entry.is_expired()):
+                entry = None
+        if record_stats:
+            self._record(hit=entry is not None)
+        return entry
+
+    def set(self, namespace: str, key: str, value, ttl: float = None):
+        ttl = ttl if ttl is not None else self.ttl_for(namespace)
+        grace = self.grace_for(namespace)
+        payload = json.dumps({"v": value, "s": time.time(), "t": ttl, "g": grace})
+        # Keep the key through the grace window so it can be served stale
+        expire_ms = max(int((ttl + grace) * 1000), 1)
+        try:
+            self.client.execute(
+                "SET", self._key(namespace, key), payload, "PX", expire_ms
+            )
+        except (OSError, ConnectionError, RedisError) as exception:
+            logger.warning("Redis cache set failed: %s", exception)
+
+    def delete(self, namespace: str, key: str):
+        try:
+            self.client.execute("DEL", self._key(namespace, key))
+        except (OSError, ConnectionError, RedisError) as exception:
+            logger.warning("Redis cache delete failed: %s", exception)
+
+    def clear(self):
+        """Delete every key under this cache's prefix."""
+        cursor = "0"
+        while True:
+            cursor, keys = self.client.execute(
+                "SCAN", cursor, "MATCH", f"{self.prefix}*", "COUNT", 500
+            )
+            if keys:
+                self.client.execute("DEL", *keys)
+            cursor = cursor.decode() if isinstance(cursor, bytes) else cursor
+            if cursor == "0":
+                return
@@ -0,0 +1,164 @@
+# On-disk cache shared by every app process on the same host
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from .base import CacheBackend, CacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Cache stored in a local SQLite file, shared across processes and restarts.
+    Each thread uses its own connection; WAL mode lets readers run while
+    another process writes. Database errors (e.g. a lock held past the
+    timeout) degrade to cache misses.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 100000,
+        ttls: dict = None,
+        default_ttl: float = 3600,
+        grace: dict = None,
+        purge_interval: float = 60,
+    ):
+        super().__init__(ttls=ttls, default_ttl=default_ttl, grace=grace)
+        self.path = path
+        self.max_entries = max_entries
+        self.purge_interval = purge_interval
+
+        self._local = threading.local()
+        self._purge_lock = threading.Lock()
+        self._last_purge = 0.0
+
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    stale_until REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_cache_entries_stale_until "
+                "ON cache_entries (stale_until)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_entry(
+        self,
+        namespace: str,
+        key: str,
+        allow_stale: bool = False,
+        record_stats: bool = True,
+    ):
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT value, stored_at, expires_at, stale_until "
+                    "FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as exception:
+            logger.warning("SQLite cache get failed: %s", exception)
+            row = None
+
+        entry = None
+        if row is not None:
+            value, stored_at, expires_at, stale_until = row
+            entry = CacheEntry(
+                json.loads(value),
+                stored_at=stored_at,
+                ttl=expires_at - stored_at,
+                grace=stale_until - expires_at,
+            )
+            if entry.is_dead() or (not allow_stale and entry.is_expired()):
+                entry = None
+        if record_stats:
+            self._record(hit=entry is not None)
+        return entry
+
+    def set(self, namespace: str, key: str, value, ttl: float = None):
+        now = time.time()
+        ttl = ttl if ttl is not None else self.ttl_for(namespace)
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(namespace, key, value, stored_at, expires_at, stale_until) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    namespace,
+                    key,
+                    json.dumps(value),
+                    now,
+                    now + ttl,
+                    now + ttl + self.grace_for(namespace),
+                ),
+            )
+            if now - self._last_purge >= self.purge_interval:
+                self.purge_expired()
+        except sqlite3.Error as exception:
+            logger.warning("SQLite cache set failed: %s", exception)
+
+    def delete(self, namespace: str, key: str):
+        try:
+            self._connection().execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+        except sqlite3.Error as exception:
+            logger.warning("SQLite cache delete failed: %s", exception)
+
+    def clear(self):
+        self._connection().execute("DELETE FROM cache_entries")
+
+    def purge_expired(self):
+        """Drop rows past their grace window, then the oldest beyond max_entries."""
+        if not self._purge_lock.acquire(blocking=False):
+            return 0
+        try:
+            now = time.time()
+            conn = self._connection()
+            removed = conn.execute(
+                "DELETE FROM cache_entries WHERE stale_until <= ?",
+                (now,),
+            ).rowcount
+            removed += conn.execute(
+                """
+                DELETE FROM cache_entries WHERE rowid IN (
+                    SELECT rowid FROM cache_entries
+                    ORDER BY stored_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            ).rowcount
+            self._last_purge = now
+            return removed
+        finally:
+            self._purge_lock.release()
+
+    def stats(self) -> dict:
+        (entries,) = (
+            self._connection().execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        )
+        return {**super().stats(), "entries": entries}
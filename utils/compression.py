@@ -0,0 +1,218 @@
+# WSGI middleware compressing JSON, HTML and CSV responses with brotli or gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Content types worth compressing (parameters such as charset are ignored)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/html",
+    "text/csv",
+)
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    codings = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        # wbits 16 + MAX_WBITS writes a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compress JSON, NDJSON, HTML and CSV responses for clients that accept brotli
+    (when the brotli package is installed) or gzip.
+    Responses with a Content-Length below min_size are sent as they are;
+    larger ones are compressed whole and get a new Content-Length. Responses
+    without a length (generators) are compressed chunk by chunk, flushing
+    after each one so streamed lines reach the client without waiting for
+    the rest. Strong ETags become weak, as the bytes now differ per coding.
+    """
+
+    def __init__(
+        self,
+        app,
+        min_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+    ):
+        self.app = app
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def negotiate(self, accept_encoding: str):
+        """The coding to use for a request ("br", "gzip"), or None."""
+        codings = parse_accept_encoding(accept_encoding)
+        wildcard = codings.get("*", 0.0)
+        candidates = ["gzip"]
+        if brotli is not None:
+            candidates.insert(0, "br")  # preferred on equal q-values
+        best, best_quality = None, 0.0
+        for coding in candidates:
+            quality = codings.get(coding, wildcard)
+            if quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    def _encoder(self, coding: str):
+        if coding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+    def __call__(self, environ, start_response):
+        coding = None
+        if environ.get("REQUEST_METHOD") != "HEAD":
+            coding = self.negotiate(environ.get("HTTP_ACCEPT_ENCODING"))
+        state = {}
+
+        def capture(status, headers, exc_info=None):
+            state["compress"] = coding is not None and self._should_compress(
+                status, headers
+            )
+            if _is_compressible_type(headers):
+                headers = _add_vary(headers)
+            if not state["compress"]:
+                return start_response(status, headers, exc_info)
+            state["length"] = _header(headers, "Content-Length")
+            state["start"] = (status, headers, exc_info)
+            return _deferred_write
+
+        def _deferred_write(data):
+            raise RuntimeError("CompressionMiddleware does not support write()")
+
+        body = self.app(environ, capture)
+        if not state.get("compress"):
+            return body
+
+        status, headers, exc_info = state["start"]
+        headers = _encoded_headers(headers, coding)
+        encoder = self._encoder(coding)
+        if state["length"] is not None:
+            # Known size: compress it whole and say how long the result is
+            try:
+                data = b"".join(body)
+            finally:
+                _close(body)
+            data = encoder.compress(data) + encoder.finish()
+            headers.append(("Content-Length", str(len(data))))
+            start_response(status, headers, exc_info)
+            return [data]
+
+        start_response(status, headers, exc_info)
+        return _stream(body, encoder)
+
+    def _should_compress(self, status: str, headers: list) -> bool:
+        if not status.startswith("2") or status.startswith("204"):
+            return False
+        if not _is_compressible_type(headers):
+            return False
+        if _header(headers, "Content-Encoding"):
+            return False
+        if "no-transform" in (_header(headers, "Cache-Control") or "").lower():
+            return False
+        length = _header(headers, "Content-Length")
+        return length is None or int(length) >= self.min_size
+
+
+def _stream(body, encoder):
+    try:
+        for chunk in body:
+            if chunk:
+                data = encoder.compress(chunk) + encoder.flush()
+                if data:
+                    yield data
+        yield encoder.finish()
+    finally:
+        _close(body)
+
+
+def _close(body):
+    if hasattr(body, "close"):
+        body.close()
+
+
+def _header(headers: list, name: str):
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _is_compressible_type(headers: list) -> bool:
+    content_type = (_header(headers, "Content-Type") or "").split(";")[0]
+    return content_type.strip().lower() in COMPRESSIBLE_TYPES
+
+
+def _add_vary(headers: list) -> list:
+    """Add Accept-Encoding to Vary, as the body depends on it."""
+    vary = _header(headers, "Vary")
+    if vary is None:
+        return headers + [("Vary", "Accept-Encoding")]
+    values = [value.strip().lower() for value in vary.split(",")]
+    if "accept-encoding" in values or "*" in values:
+        return headers
+    return [
+        (key, f"{value}, Accept-Encoding" if key.lower() == "vary" else value)
+        for key, value in headers
+    ]
+
+
+def _encoded_headers(headers: list, coding: str) -> list:
+    encoded = []
+    for key, value in headers:
+        name = key.lower()
+        if name == "content-length":
+            continue
+        if name == "etag" and not value.startswith("W/"):
+            value = f"W/{value}"
+        encoded.append((key, value))
+    encoded.append(("Content-Encoding", coding))
+    return encoded
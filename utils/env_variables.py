@@ -1,6 +1,5 @@
 # Central environment variables configuration
 import os
-from enum import Enum
 
 
 def _to_bool(value: str) -> bool:
@@ -15,19 +14,98 @@ def _get_env(key: str, default: str = None, required: bool = False) -> str:
     return value
 
 
-class EnvVariable(Enum):
-    """Enum containing all environment variable names used in the app."""
+class Setting:
+    """A configuration value, read as EnvVariable.NAME.value."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return f"Setting({self.value!r})"
+
+
+class EnvVariable:
+    """
+    All environment variables used in the app.
+    A plain class rather than an Enum: Enum members with equal values become
+    aliases, so e.g. an int setting of 5 would read back another's 5.0.
+    """
 
     # Server configuration - defaults for testing
-    PORT = int(_get_env("PORT", "5000"))
-    FLASK_DEBUG = _to_bool(_get_env("FLASK_DEBUG", "false"))
+    PORT = Setting(int(_get_env("PORT", "5000")))
+    FLASK_DEBUG = Setting(_to_bool(_get_env("FLASK_DEBUG", "false")))
 
     # Database - defaults to SQLite for testing
-    DATABASE_URL = _get_env("DATABASE_URL", "sqlite:///movieapp.db")
+    DATABASE_URL = Setting(_get_env("DATABASE_URL", "sqlite:///movieapp.db"))
 
     # Security - default for testing (should be overridden in production)
-    SECRET_KEY = _get_env("SECRET_KEY", "test-secret-key-do-not-use-in-production")
+    SECRET_KEY = Setting(
+        _get_env("SECRET_KEY", "test-secret-key-do-not-use-in-production")
+    )
 
     # API Keys - defaults to empty for testing (mocked in tests)
-    TMDB_API_KEY = _get_env("TMDB_API_KEY", "")
-    IMDB_API_KEY = _get_env("IMDB_API_KEY", "")
+    TMDB_API_KEY = Setting(_get_env("TMDB_API_KEY", ""))
+    IMDB_API_KEY = Setting(_get_env("IMDB_API_KEY", ""))
+
+    # Outbound HTTP - connection pooling for the IMDb, TMDb and RT clients
+    HTTP_POOL_CONNECTIONS = Setting(int(_get_env("HTTP_POOL_CONNECTIONS", "10")))
+    HTTP_POOL_MAXSIZE = Setting(int(_get_env("HTTP_POOL_MAXSIZE", "20")))
+    HTTP_POOL_BLOCK = Setting(_to_bool(_get_env("HTTP_POOL_BLOCK", "true")))
+    IMDB_TIMEOUT = Setting(float(_get_env("IMDB_TIMEOUT", "10")))
+    TMDB_TIMEOUT = Setting(float(_get_env("TMDB_TIMEOUT", "5")))
+    RT_TIMEOUT = Setting(float(_get_env("RT_TIMEOUT", "10")))
+
+    # Lookup cache backend: "memory" (per process), "sqlite" or "redis" (shared)
+    CACHE_BACKEND = Setting(_get_env("CACHE_BACKEND", "memory"))
+    CACHE_SQLITE_PATH = Setting(_get_env("CACHE_SQLITE_PATH", "lookup-cache.sqlite3"))
+    CACHE_REDIS_URL = Setting(_get_env("CACHE_REDIS_URL", "redis://localhost:6379/0"))
+
+    # Lookup cache bounds (CACHE_MAX_BYTES=0 disables the byte budget)
+    CACHE_MAX_ENTRIES = Setting(int(_get_env("CACHE_MAX_ENTRIES", "10000")))
+    CACHE_MAX_BYTES = Setting(int(_get_env("CACHE_MAX_BYTES", "0")))
+
+    # Stale-while-revalidate for rating and genre lookups
+    CACHE_STALE_GRACE = Setting(int(_get_env("CACHE_STALE_GRACE", "86400")))
+    CACHE_REFRESH_WORKERS = Setting(int(_get_env("CACHE_REFRESH_WORKERS", "4")))
+    CACHE_REFRESH_MAX_PENDING = Setting(
+        int(_get_env("CACHE_REFRESH_MAX_PENDING", "100"))
+    )
+
+    # Negative caching: definitive "not found" results are kept for
+    # CACHE_MISS_TTL (at most the hit TTL); transient upstream failures back
+    # off exponentially from CACHE_RETRY_BACKOFF up to CACHE_RETRY_BACKOFF_MAX
+    CACHE_MISS_TTL = Setting(int(_get_env("CACHE_MISS_TTL", "3600")))
+    CACHE_RETRY_BACKOFF = Setting(int(_get_env("CACHE_RETRY_BACKOFF", "30")))
+    CACHE_RETRY_BACKOFF_MAX = Setting(int(_get_env("CACHE_RETRY_BACKOFF_MAX", "900")))
+
+    # Movie rows with ratings newer than this (seconds) are served directly
+    # by the rating endpoints instead of looking the rating up again
+    RATINGS_MAX_AGE = Setting(int(_get_env("RATINGS_MAX_AGE", "43200")))
+
+    # Background ratings refresh: movies whose ratings are older than
+    # RATINGS_REFRESH_AGE seconds are refreshed in batches, most watchlisted
+    # first, every RATINGS_REFRESH_INTERVAL seconds. Provider calls are limited
+    # to the given rate per second.
+    RATINGS_REFRESH_ENABLED = Setting(
+        _to_bool(_get_env("RATINGS_REFRESH_ENABLED", "false"))
+    )
+    RATINGS_REFRESH_AGE = Setting(int(_get_env("RATINGS_REFRESH_AGE", "36000")))
+    RATINGS_REFRESH_INTERVAL = Setting(int(_get_env("RATINGS_REFRESH_INTERVAL", "300")))
+    RATINGS_REFRESH_BATCH_SIZE = Setting(
+        int(_get_env("RATINGS_REFRESH_BATCH_SIZE", "50"))
+    )
+    IMDB_RATE_LIMIT = Setting(float(_get_env("IMDB_RATE_LIMIT", "2")))
+    TMDB_RATE_LIMIT = Setting(float(_get_env("TMDB_RATE_LIMIT", "4")))
+    RT_RATE_LIMIT = Setting(float(_get_env("RT_RATE_LIMIT", "0.5")))
+
+    # Response compression: JSON, HTML and CSV bodies of at least
+    # COMPRESSION_MIN_SIZE bytes are sent gzip- or (with the brotli package)
+    # brotli-encoded to clients that accept it
+    COMPRESSION_ENABLED = Setting(_to_bool(_get_env("COMPRESSION_ENABLED", "true")))
+    COMPRESSION_MIN_SIZE = Setting(int(_get_env("COMPRESSION_MIN_SIZE", "1024")))
+    COMPRESSION_GZIP_LEVEL = Setting(int(_get_env("COMPRESSION_GZIP_LEVEL", "6")))
+    COMPRESSION_BROTLI_QUALITY = Setting(
+        int(_get_env("COMPRESSION_BROTLI_QUALITY", "5"))
+    )
@@ -0,0 +1,62 @@
+# Watchlist export: listing rows streamed as CSV or NDJSON, batch by batch
+import csv
+import io
+from datetime import date, datetime
+
+from .json_provider import dumps
+
+# Rows fetched from the database per batch, and written per response chunk
+EXPORT_BATCH_SIZE = 500
+
+# Export formats by format param: (mimetype, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+
+def iter_batches(session, query, batch_size: int = None):
+    """
+    Execute a select() and yield its rows in lists of up to batch_size
+    (default EXPORT_BATCH_SIZE).
+    yield_per streams rows from a server-side cursor where the driver has
+    one (PostgreSQL); SQLite steps through results lazily anyway. Either
+    way only one batch is held at a time.
+    """
+    batch_size = batch_size or EXPORT_BATCH_SIZE
+    result = session.execute(query.execution_options(yield_per=batch_size))
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)
+    return value
+
+
+def csv_chunks(fields: list, batches):
+    """Yield a CSV header line, then one chunk of CSV lines per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for rows in batches:
+        writer.writerows(
+            [_csv_value(value) for value in row[: len(fields)]] for row in rows
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only: nothing matched
+        yield buffer.getvalue()
+
+
+def ndjson_chunks(fields: list, batches):
+    """Yield one chunk of JSON lines, one object per row, per batch."""
+    for rows in batches:
+        yield "".join(dumps(dict(zip(fields, row))) + "\n" for row in rows)
@@ -1,30 +1,203 @@
 # App wide helper and handler functions
 import re
-import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from .api.exception_handler import TransientAPIError
 from .api.imdb import get_imdb_genres, get_imdb_rating, search_imdb
 from .api.rt import fetch_movie_data_from_rt
 from .api.tmdb import fetch_movie_data_from_tmdb
+from .backoff import FailureBackoff
+from .cache.memory import LRUCache
+from .cache.redis import RedisCache
+from .cache.sqlite import SQLiteCache
+from .env_variables import EnvVariable
+from .revalidation import Revalidator
+from .singleflight import SingleFlight
+
+# Platforms supported by the rating endpoints
+RATING_PLATFORMS = ("imdb", "tmdb", "rt")
+
+# Cache TTLs per namespace, in seconds
+CACHE_TTLS = {
+    "search": 24 * 3600,
+    "imdb_rating": 3600,
+    "tmdb_rating": 3600,
+    "rt_rating": 3600,
+    "imdb_genres": 24 * 3600,
+}
+
+# Namespaces served stale-while-revalidate: after the TTL, entries are still
+# returned for CACHE_STALE_GRACE seconds while a background refresh runs
+STALE_WHILE_REVALIDATE = ("imdb_rating", "tmdb_rating", "rt_rating", "imdb_genres")
+CACHE_GRACE = {
+    namespace: EnvVariable.CACHE_STALE_GRACE.value
+    for namespace in STALE_WHILE_REVALIDATE
+}
+
+# Definitive "not found" results (no rating, no genres) use their own TTL,
+# capped at the namespace's TTL: a title not rated yet may be rated soon
+CACHE_MISS_TTL = EnvVariable.CACHE_MISS_TTL.value
+
+
+def _create_cache():
+    """Create the lookup cache backend selected by CACHE_BACKEND."""
+    backend = EnvVariable.CACHE_BACKEND.value.lower()
+    if backend == "sqlite":
+        return SQLiteCache(
+            EnvVariable.CACHE_SQLITE_PATH.value,
+            max_entries=EnvVariable.CACHE_MAX_ENTRIES.value,
+            ttls=CACHE_TTLS,
+            grace=CACHE_GRACE,
+        )
+    if backend == "redis":
+        return RedisCache(
+            EnvVariable.CACHE_REDIS_URL.value, ttls=CACHE_TTLS, grace=CACHE_GRACE
+        )
+    if backend == "memory":
+        return LRUCache(
+            max_entries=EnvVariable.CACHE_MAX_ENTRIES.value,
+            max_bytes=EnvVariable.CACHE_MAX_BYTES.value or None,
+            ttls=CACHE_TTLS,
+            grace=CACHE_GRACE,
+        )
+    raise ValueError(
+        f"Unknown CACHE_BACKEND: {backend}. Supported: memory, sqlite, redis"
+    )
+
+
+# Lookup cache shared by all request threads (and processes, for sqlite/redis)
+_cache = _create_cache()
+
+# Coalesces concurrent cache misses for the same key into one upstream call
+_inflight = SingleFlight()
+
+# Background refreshes of stale entries, bounded in concurrency and backlog
+_revalidator = Revalidator(
+    max_workers=EnvVariable.CACHE_REFRESH_WORKERS.value,
+    max_pending=EnvVariable.CACHE_REFRESH_MAX_PENDING.value,
+)
+
+# Retry delays for keys whose lookups keep failing transiently
+_backoff = FailureBackoff(
+    base=EnvVariable.CACHE_RETRY_BACKOFF.value,
+    max_delay=EnvVariable.CACHE_RETRY_BACKOFF_MAX.value,
+)
+
+
+def _get_cached(namespace, key):
+    """Get value from cache if not expired."""
+    return _cache.get(namespace, key)
 
-# In-memory cache with TTL (1 hour = 3600 seconds)
-_cache = {}
-_cache_ttl = 3600
 
+def _set_cached(namespace, key, value, ttl=None):
+    """Set value in cache with the given TTL, or the namespace TTL."""
+    _cache.set(namespace, key, value, ttl=ttl)
 
-def _get_cached(key):
-    """Get value from cache if not expired."""
-    if key in _cache:
-        value, timestamp = _cache[key]
-        if time.time() - timestamp < _cache_ttl:
-            return value
-        del _cache[key]
-    return None
+
+def _cached_lookup(namespace, key, loader, *args):
+    """
+    Return the cached value for a key, or load it upstream and cache it.
+    Concurrent misses for the same key share a single upstream call.
+    Expired entries in STALE_WHILE_REVALIDATE namespaces are returned
+    immediately while a background refresh runs.
+    Loaders return None for results that should not be cached, and raise
+    TransientAPIError when the provider is temporarily unavailable.
+    """
+    entry = _cache.get_entry(
+        namespace, key, allow_stale=namespace in STALE_WHILE_REVALIDATE
+    )
+    if entry is not None:
+        if entry.is_expired():
+            _revalidator.submit(
+                (namespace, key), _refresh, namespace, key, loader, args
+            )
+        return entry.value
+    return _inflight.do((namespace, key), _load_and_cache, namespace, key, loader, args)
+
+
+def _refresh(namespace, key, loader, args):
+    _inflight.do((namespace, key), _load_and_cache, namespace, key, loader, args)
+
+
+def _load_and_cache(namespace, key, loader, args):
+    # Another flight may have filled the cache since our miss
+    cached = _get_cached(namespace, key)
+    if cached is not None:
+        return cached
+
+    try:
+        value = loader(*args)
+    except TransientAPIError:
+        value = _serve_through_failure(namespace, key, args)
+        if value is None:
+            raise
+        return value
+
+    _backoff.reset((namespace, key))
+    if value is not None:
+        ttl = _miss_ttl(namespace, value)
+        _set_cached(namespace, key, value, ttl=ttl)
+    return value
+
+
+def _serve_through_failure(namespace, key, args):
+    """
+    After a transient failure, keep serving the last known value (or the
+    namespace's empty result) until the key's retry backoff elapses.
+    Returns None if there is nothing to serve.
+    """
+    entry = _cache.get_entry(namespace, key, allow_stale=True)
+    if entry is not None:
+        value = entry.value
+    elif namespace in EMPTY_RESULTS:
+        value = EMPTY_RESULTS[namespace](*args)
+    else:
+        return None
+
+    _set_cached(namespace, key, value, ttl=_backoff.failure((namespace, key)))
+    return value
+
+
+def _miss_ttl(namespace, value):
+    """TTL to cache a loaded value with: the miss TTL for misses, else None."""
+    if not _is_miss(namespace, value):
+        return None
+    return min(CACHE_MISS_TTL, CACHE_TTLS[namespace])
+
+
+def _is_miss(namespace, value) -> bool:
+    """Check if a loaded value is a definitive "not found" result."""
+    if namespace == "imdb_genres":
+        return not value.get("genres")
+    if namespace in ("imdb_rating", "tmdb_rating", "rt_rating"):
+        return value.get("rating") is None and value.get("popcornmeter") is None
+    return False
+
+
+def rating_cache_entry(platform: str, movie_id: str, title: str, year: int = None):
+    """
+    The cache entry a platform rating lookup is served from (stale ones
+    included), or None. Not counted in the cache hit/miss stats.
+    """
+    namespace, key, _, _ = _rating_lookup(platform, movie_id, title, year)
+    return _cache.get_entry(namespace, key, allow_stale=True, record_stats=False)
 
 
-def _set_cached(key, value):
-    """Set value in cache with current timestamp."""
-    _cache[key] = (value, time.time())
+def genres_cache_entry(movie_id: str):
+    """The cache entry a genres lookup is served from, like rating_cache_entry."""
+    return _cache.get_entry(
+        "imdb_genres", movie_id, allow_stale=True, record_stats=False
+    )
+
+
+def get_lookup_stats() -> dict:
+    """Cache and request coalescing counters for the upstream lookups."""
+    return {
+        "cache": _cache.stats(),
+        "coalescing": _inflight.stats(),
+        "revalidation": _revalidator.stats(),
+        "backoff": _backoff.stats(),
+    }
 
 
 def search_movie(query: str) -> dict:
@@ -32,16 +205,15 @@ def search_movie(query: str) -> dict:
     Search for a movie and return metadata only (no ratings).
     Returns: { id, query, title, year, logo_url } or None
     """
-    cache_key = f"search:{query}"
-    cached = _get_cached(cache_key)
-    if cached is not None:
-        return cached
+    return _cached_lookup("search", query, _load_search_movie, query)
+
 
+def _load_search_movie(query: str) -> dict:
     result = search_imdb(query)
     if result is None:
         return None
 
-    movie_data = {
+    return {
         "id": result["id"],
         "query": query,
         "title": result.get("title", ""),
@@ -50,28 +222,26 @@ def search_movie(query: str) -> dict:
         "page_url": result.get("page_url", ""),
     }
 
-    _set_cached(cache_key, movie_data)
-    return movie_data
-
 
 def fetch_imdb_rating(movie_id: str) -> dict:
     """
     Fetch IMDb rating by movie ID (tconst).
     Returns: { rating, page_url } or { rating: None, ... }
     """
-    cache_key = f"imdb_rating:{movie_id}"
-    cached = _get_cached(cache_key)
-    if cached is not None:
-        return cached
+    return _cached_lookup("imdb_rating", movie_id, _load_imdb_rating, movie_id)
 
+
+def _load_imdb_rating(movie_id: str) -> dict:
     result = get_imdb_rating(movie_id)
     if result is None:
-        result = {"rating": None, "page_url": f"https://www.imdb.com/title/{movie_id}/"}
-
-    _set_cached(cache_key, result)
+        result = _empty_imdb_rating(movie_id)
     return result
 
 
+def _empty_imdb_rating(movie_id: str) -> dict:
+    return {"rating": None, "page_url": f"https://www.imdb.com/title/{movie_id}/"}
+
+
 def _is_year_match(expected_year: int, actual_year: int, tolerance: int = 1) -> bool:
     """Check if years match within tolerance (default ±1 year for regional differences)."""
     if not expected_year or not actual_year:
@@ -84,33 +254,27 @@ def fetch_tmdb_rating(title: str, year: int = None) -> dict:
     Fetch TMDb rating by title and year.
     Returns: { rating, page_url, backdrop_url, backdrop_url_hd } or { rating: None, ... }
     """
-    cache_key = f"tmdb_rating:{title}:{year}"
-    cached = _get_cached(cache_key)
-    if cached is not None:
-        return cached
+    return _cached_lookup(
+        "tmdb_rating", f"{title}:{year}", _load_tmdb_rating, title, year
+    )
+
 
+def _load_tmdb_rating(title: str, year: int = None) -> dict:
     result = fetch_movie_data_from_tmdb(title=title, year=year)
 
     # Default empty response
-    rating_data = {
-        "rating": None,
-        "page_url": "",
-        "backdrop_url": "",
-        "backdrop_url_hd": "",
-    }
+    rating_data = _empty_tmdb_rating()
 
     if result is None:
-        _set_cached(cache_key, rating_data)
         return rating_data
 
     # Validate year match to ensure correct movie
     result_year = result.get("year")
     if not _is_year_match(year, result_year):
-        _set_cached(cache_key, rating_data)
         return rating_data
 
     backdrop_path = result.get("backdrop_path")
-    rating_data = {
+    return {
         "rating": (
             round(float(result.get("vote_average", 0)), 1)
             if result.get("vote_average")
@@ -131,8 +295,14 @@ def fetch_tmdb_rating(title: str, year: int = None) -> dict:
         ),
     }
 
-    _set_cached(cache_key, rating_data)
-    return rating_data
+
+def _empty_tmdb_rating(title: str = None, year: int = None) -> dict:
+    return {
+        "rating": None,
+        "page_url": "",
+        "backdrop_url": "",
+        "backdrop_url_hd": "",
+    }
 
 
 def fetch_rt_rating(title: str, year: int = None) -> dict:
@@ -140,23 +310,18 @@ def fetch_rt_rating(title: str, year: int = None) -> dict:
     Fetch Rotten Tomatoes ratings by title with year validation.
     Returns: { rating, tomatometer, popcornmeter, page_url } or { rating: None, ... }
     """
-    cache_key = f"rt_rating:{title}:{year}"
-    cached = _get_cached(cache_key)
-    if cached is not None:
-        return cached
+    return _cached_lookup("rt_rating", f"{title}:{year}", _load_rt_rating, title, year)
 
+
+def _load_rt_rating(title: str, year: int = None) -> dict:
     result = fetch_movie_data_from_rt(title, year)
 
     # Default empty response
-    rating_data = {
-        "rating": None,
-        "tomatometer": None,
-        "popcornmeter": None,
-        "page_url": result.get("page_url", "") if result else "",
-    }
+    rating_data = _empty_rt_rating()
+    if result:
+        rating_data["page_url"] = result.get("page_url", "")
 
     if result is None:
-        _set_cached(cache_key, rating_data)
         return rating_data
 
     # Check if we have any valid scores
@@ -164,24 +329,28 @@ def fetch_rt_rating(title: str, year: int = None) -> dict:
     popcornmeter = result.get("popcornmeter", 0)
 
     if tomatometer == 0 and popcornmeter == 0:
-        _set_cached(cache_key, rating_data)
         return rating_data
 
     # Validate year match to ensure correct movie
     result_year = result.get("year")
     if not _is_year_match(year, result_year):
-        _set_cached(cache_key, rating_data)
         return rating_data
 
-    rating_data = {
+    return {
         "rating": round(float(tomatometer), 1) if tomatometer > 0 else None,
         "tomatometer": round(float(tomatometer), 1) if tomatometer > 0 else None,
         "popcornmeter": round(float(popcornmeter), 1) if popcornmeter > 0 else None,
         "page_url": result.get("page_url", ""),
     }
 
-    _set_cached(cache_key, rating_data)
-    return rating_data
+
+def _empty_rt_rating(title: str = None, year: int = None) -> dict:
+    return {
+        "rating": None,
+        "tomatometer": None,
+        "popcornmeter": None,
+        "page_url": "",
+    }
 
 
 def fetch_imdb_genres(movie_id: str) -> dict:
@@ -189,27 +358,115 @@ def fetch_imdb_genres(movie_id: str) -> dict:
     Fetch genres for a movie by movie ID (tconst).
     Returns: { genres: ["Action", "Sci-Fi", ...] }
     """
-    cache_key = f"imdb_genres:{movie_id}"
-    cached = _get_cached(cache_key)
-    if cached is not None:
-        return cached
+    return _cached_lookup("imdb_genres", movie_id, _load_imdb_genres, movie_id)
+
 
+def _load_imdb_genres(movie_id: str) -> dict:
     result = get_imdb_genres(movie_id)
     if result is None:
-        result = {"genres": []}
-
-    _set_cached(cache_key, result)
+        result = _empty_imdb_genres(movie_id)
     return result
 
 
-def search_movies_parallel(queries: list) -> dict:
+def _empty_imdb_genres(movie_id: str) -> dict:
+    return {"genres": []}
+
+
+# Results served while a provider is unavailable and nothing is cached yet
+EMPTY_RESULTS = {
+    "imdb_rating": _empty_imdb_rating,
+    "tmdb_rating": _empty_tmdb_rating,
+    "rt_rating": _empty_rt_rating,
+    "imdb_genres": _empty_imdb_genres,
+}
+
+
+def fetch_rating(platform: str, movie_id: str, title: str, year: int = None) -> dict:
+    """Fetch a rating for a movie from a single platform (imdb, tmdb, rt)."""
+    if platform == "imdb":
+        return fetch_imdb_rating(movie_id)
+    if platform == "tmdb":
+        return fetch_tmdb_rating(title, year)
+    if platform == "rt":
+        return fetch_rt_rating(title, year)
+    raise ValueError(f"Unknown platform: {platform}")
+
+
+def _rating_lookup(platform: str, movie_id: str, title: str, year: int = None):
+    """Cache namespace, cache key, loader and loader args for a platform rating."""
+    if platform == "imdb":
+        return "imdb_rating", movie_id, _load_imdb_rating, (movie_id,)
+    if platform == "tmdb":
+        return "tmdb_rating", f"{title}:{year}", _load_tmdb_rating, (title, year)
+    if platform == "rt":
+        return "rt_rating", f"{title}:{year}", _load_rt_rating, (title, year)
+    raise ValueError(f"Unknown platform: {platform}")
+
+
+def refresh_rating(
+    platform: str, movie_id: str, title: str, year: int = None, rate_limiter=None
+) -> dict:
     """
-    Search for multiple movies in parallel (metadata only, no ratings).
-    Returns dict with 'movies' list and 'errors' list.
+    Get a rating for a background refresh: cached values are reused, otherwise
+    the provider is called (after rate_limiter.acquire(), if given).
+    Unlike fetch_rating, raises TransientAPIError instead of serving a fallback.
     """
-    movies = []
+    namespace, key, loader, args = _rating_lookup(platform, movie_id, title, year)
+    cached = _get_cached(namespace, key)
+    if cached is not None:
+        return cached
+
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+    value = loader(*args)
+    _backoff.reset((namespace, key))
+    ttl = _miss_ttl(namespace, value)
+    _set_cached(namespace, key, value, ttl=ttl)
+    return value
+
+
+def fetch_ratings_parallel(movies: list, platforms=RATING_PLATFORMS) -> dict:
+    """
+    Fetch ratings for multiple movies from multiple platforms in parallel.
+    Accepts: [{"id": "tt0133093", "title": "The Matrix", "year": 1999}, ...]
+    Returns dict with 'ratings' ({movie_id: {platform: rating_data}}) and 'errors' list.
+    """
+    ratings = {}
     errors = []
 
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        future_to_lookup = {}
+        for movie in movies:
+            movie_id = movie["id"]
+            if movie_id in ratings:
+                continue
+            ratings[movie_id] = {}
+            for platform in platforms:
+                future = executor.submit(
+                    fetch_rating,
+                    platform,
+                    movie_id,
+                    movie.get("title", ""),
+                    movie.get("year"),
+                )
+                future_to_lookup[future] = (movie_id, platform)
+
+        for future in as_completed(future_to_lookup):
+            movie_id, platform = future_to_lookup[future]
+            try:
+                ratings[movie_id][platform] = future.result()
+            except Exception as e:
+                errors.append({"id": movie_id, "platform": platform, "error": str(e)})
+
+    return {"ratings": ratings, "errors": errors}
+
+
+def iter_search_movies(queries: list):
+    """
+    Search for multiple movies in parallel (metadata only, no ratings),
+    yielding each result as soon as its lookup finishes.
+    Yields ("movie", movie_data) or ("error", {"query": ..., "error": ...}) tuples.
+    """
     # Parse all queries first
     parsed_queries = []
     for q in queries:
@@ -218,10 +475,11 @@ def search_movies_parallel(queries: list) -> dict:
         if parsed:
             parsed_queries.append(parsed)
         else:
-            errors.append({"query": query_str, "error": "Empty query"})
+            yield "error", {"query": query_str, "error": "Empty query"}
 
     # Search all movies in parallel
-    with ThreadPoolExecutor(max_workers=10) as executor:
+    executor = ThreadPoolExecutor(max_workers=10)
+    try:
         future_to_query = {
             executor.submit(search_movie, pq["query"]): pq for pq in parsed_queries
         }
@@ -230,11 +488,29 @@ def search_movies_parallel(queries: list) -> dict:
             try:
                 movie_data = future.result()
                 if movie_data:
-                    movies.append(movie_data)
+                    yield "movie", movie_data
                 else:
-                    errors.append({"query": pq["query"], "error": "Movie not found"})
+                    yield "error", {"query": pq["query"], "error": "Movie not found"}
             except Exception as e:
-                errors.append({"query": pq["query"], "error": str(e)})
+                yield "error", {"query": pq["query"], "error": str(e)}
+    finally:
+        # Drop queued lookups if the consumer stops early (e.g. client disconnect)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def search_movies_parallel(queries: list) -> dict:
+    """
+    Search for multiple movies in parallel (metadata only, no ratings).
+    Returns dict with 'movies' list and 'errors' list.
+    """
+    movies = []
+    errors = []
+
+    for kind, data in iter_search_movies(queries):
+        if kind == "movie":
+            movies.append(data)
+        else:
+            errors.append(data)
 
     return {"movies": movies, "errors": errors}
 
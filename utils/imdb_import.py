@@ -0,0 +1,258 @@
+# Watchlist import from IMDb CSV exports (ratings, watchlists and lists)
+import csv
+import logging
+import re
+import threading
+
+from .helpers import search_movies_parallel
+from .models import Movie, db
+from .watchlist_store import add_movies_to_watchlist
+
+logger = logging.getLogger(__name__)
+
+# CSV rows added to the watchlist per transaction
+IMPORT_BATCH_SIZE = 500
+
+# Errors listed in an import result; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Column names by field, lower case: IMDb exports ("Const", "Title", ...)
+# and the IMDb datasets (title.basics.tsv converted to CSV)
+IMPORT_COLUMNS = {
+    "movie_id": ("const", "tconst"),
+    "title": ("title", "primarytitle"),
+    "year": ("year", "startyear"),
+    "imdb_rating": ("imdb rating", "averagerating"),
+    "imdb_page_url": ("url",),
+    "genres": ("genres",),
+}
+
+TCONST_PATTERN = re.compile(r"tt\d+")
+
+
+class InvalidImport(ValueError):
+    """Uploaded file is not a CSV with an IMDb id or title column."""
+
+
+def _columns(header: list) -> dict:
+    """Position of each IMPORT_COLUMNS field found in a CSV header."""
+    names = [name.strip().lower() for name in header]
+    columns = {}
+    for field, aliases in IMPORT_COLUMNS.items():
+        for alias in aliases:
+            if alias in names:
+                columns[field] = names.index(alias)
+                break
+    return columns
+
+
+def _value(row: list, columns: dict, field: str) -> str:
+    position = columns.get(field)
+    if position is None or position >= len(row):
+        return ""
+    value = row[position].strip()
+    return "" if value == "\\N" else value  # the datasets' NULL
+
+
+def _number(value: str, kind):
+    try:
+        return kind(value) if value else None
+    except ValueError:
+        return None
+
+
+def parse_imdb_row(row: list, columns: dict) -> dict:
+    """
+    Movie data (as add_movies_to_watchlist() takes it) from a CSV row.
+    movie_id is None when the row has no IMDb id; title is then needed to
+    search for it.
+    """
+    movie_id = _value(row, columns, "movie_id")
+    genres = _value(row, columns, "genres")
+    return {
+        "movie_id": movie_id or None,
+        "title": _value(row, columns, "title"),
+        "year": _number(_value(row, columns, "year"), int),
+        "imdb_rating": _number(_value(row, columns, "imdb_rating"), float),
+        "imdb_page_url": (
+            _value(row, columns, "imdb_page_url")
+            or (f"https://www.imdb.com/title/{movie_id}/" if movie_id else None)
+        ),
+        "genres": [name.strip() for name in genres.split(",") if name.strip()] or None,
+    }
+
+
+def iter_imdb_batches(lines, batch_size: int = None):
+    """
+    Read an IMDb CSV export from lines of text (e.g. a text file object),
+    yielding lists of up to batch_size (default IMPORT_BATCH_SIZE) parsed
+    rows. Only one batch is held at a time.
+    Raises InvalidImport when the header has no id or title column.
+    """
+    batch_size = batch_size or IMPORT_BATCH_SIZE
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    columns = _columns(header or [])
+    if "movie_id" not in columns and "title" not in columns:
+        raise InvalidImport("CSV needs a Const (IMDb id) or Title column")
+
+    batch = []
+    for row in reader:
+        if not any(value.strip() for value in row):
+            continue
+        batch.append(parse_imdb_row(row, columns))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _search_rows(rows: list):
+    """
+    Look up rows without an IMDb id by title and year.
+    Returns: (movie data found, errors)
+    """
+    titles = {
+        f"{row['title']} {row['year'] or ''}".strip(): row["title"] for row in rows
+    }
+    result = search_movies_parallel([{"query": query} for query in titles])
+    found = [
+        {
+            "movie_id": movie["id"],
+            "title": movie["title"],
+            "year": movie["year"],
+            "logo_url": movie["logo_url"],
+            "imdb_page_url": movie["page_url"] or None,
+        }
+        for movie in result["movies"]
+    ]
+    errors = [
+        {"movie_id": None, "title": titles[error["query"]], "error": error["error"]}
+        for error in result["errors"]
+    ]
+    return found, errors
+
+
+def _batches(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def import_imdb_csv(user_id: int, lines, batch_size: int = None) -> dict:
+    """
+    Add the titles of an IMDb CSV export to a user's watchlist, a batch at
+    a time. Rows with an IMDb id are stored as they are, with the export's
+    IMDb rating and genres. Rows with only a title are returned for
+    complete_import() to search for, as are the ids of the movies stored
+    without ratings.
+    Returns: {"rows": n, "added": n, "skipped": n, "created": [movie_id, ...],
+    "to_search": [{"title", "year"}, ...], "errors": [...], "errors_count": n},
+    listing at most MAX_REPORTED_ERRORS errors. Every error has the row's
+    "movie_id" (None when it has none).
+    """
+    result = {
+        "rows": 0,
+        "added": 0,
+        "skipped": 0,
+        "created": [],
+        "to_search": [],
+        "errors": [],
+        "errors_count": 0,
+    }
+
+    def report(errors):
+        result["errors_count"] += len(errors)
+        room = MAX_REPORTED_ERRORS - len(result["errors"])
+        result["errors"] += errors[: max(room, 0)]
+
+    for rows in iter_imdb_batches(lines, batch_size):
+        result["rows"] += len(rows)
+        movies_data = []
+        errors = []
+        for row in rows:
+            if row["movie_id"] is None:
+                if row["title"]:
+                    result["to_search"].append(
+                        {"title": row["title"], "year": row["year"]}
+                    )
+                else:
+                    errors.append({"movie_id": None, "error": "Const or Title needed"})
+            elif TCONST_PATTERN.fullmatch(row["movie_id"]):
+                movies_data.append(row)
+            else:
+                errors.append({"movie_id": row["movie_id"], "error": "Invalid IMDb id"})
+
+        added = add_movies_to_watchlist(user_id, movies_data, refresh_ratings=True)
+        result["added"] += len(added["added"])
+        result["skipped"] += len(added["skipped"])
+        result["created"] += added["created"]
+        report(errors + added["errors"])
+
+    return result
+
+
+def complete_import(
+    user_id: int, created: list, to_search: list, refresher, batch_size: int = None
+) -> dict:
+    """
+    Second step of an import, run after the response is sent: search for
+    the rows with only a title and add the movies found, then look up the
+    ratings of every movie the import stored, refresher.batch_size at a time.
+    Movies rated meanwhile (e.g. by the background refresh) are skipped.
+    Must run inside an application context.
+    Returns: {"added": n, "skipped": n, "errors": [...], "refreshed": n,
+    "failed": n}
+    """
+    batch_size = batch_size or IMPORT_BATCH_SIZE
+    result = {"added": 0, "skipped": 0, "errors": [], "refreshed": 0, "failed": 0}
+    created = list(created)
+
+    for rows in _batches(to_search, batch_size):
+        found, errors = _search_rows(rows)
+        added = add_movies_to_watchlist(user_id, found, refresh_ratings=True)
+        result["added"] += len(added["added"])
+        result["skipped"] += len(added["skipped"])
+        result["errors"] += errors + added["errors"]
+        created += added["created"]
+
+    for ids in _batches(created, refresher.batch_size):
+        movies = [
+            {"id": row.id, "title": row.title, "year": row.year}
+            for row in db.session.query(Movie.id, Movie.title, Movie.year).filter(
+                Movie.id.in_(ids), Movie.ratings_updated_at.is_(None)
+            )
+        ]
+        refreshed = refresher.refresh(movies)
+        result["refreshed"] += refreshed["refreshed"]
+        result["failed"] += refreshed["failed"]
+    return result
+
+
+def start_import_completion(
+    app, user_id: int, created: list, to_search: list, refresher
+) -> threading.Thread:
+    """Run complete_import() in a daemon thread with its own app context."""
+
+    def run():
+        with app.app_context():
+            try:
+                result = complete_import(user_id, created, to_search, refresher)
+            except Exception:
+                logger.exception(
+                    "Completing the IMDb import of user %s failed", user_id
+                )
+                return
+        logger.info(
+            "IMDb import of user %s: %d searched titles added, %d errors, "
+            "%d movies rated, %d lookups failed",
+            user_id,
+            result["added"],
+            len(result["errors"]),
+            result["refreshed"],
+            result["failed"],
+        )
+
+    thread = threading.Thread(target=run, name="imdb-import", daemon=True)
+    thread.start()
+    return thread
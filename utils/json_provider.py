@@ -0,0 +1,86 @@
+# App wide JSON serialization with orjson, or the stdlib json when it is missing
+import json
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Integer dict keys are written as strings, like the stdlib json does
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def _default(obj):
+    """Encode what JSON has no type for; dates as ISO 8601, like orjson."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+
+def dumpb(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize obj to compact (or indented) UTF-8 JSON bytes."""
+    if orjson is not None:
+        option = _ORJSON_OPTIONS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits and the like; json copes or raises
+            pass
+    return json.dumps(
+        obj,
+        default=_default,
+        ensure_ascii=False,
+        sort_keys=sort_keys,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+    ).encode()
+
+
+def dumps(obj, indent: bool = False, sort_keys: bool = False) -> str:
+    """Serialize obj to a JSON string, see dumpb()."""
+    return dumpb(obj, indent=indent, sort_keys=sort_keys).decode()
+
+
+def loads(s):
+    """Deserialize JSON from a string or UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by dumpb() and loads(), for jsonify() and
+    request.get_json(). Keys keep their order (no sort_keys) and output is
+    compact UTF-8 unless compact is False or the app is in debug mode.
+    """
+
+    sort_keys = False
+    ensure_ascii = False
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            # Callers asking for specific json.dumps options get the stdlib
+            kwargs.setdefault("default", _default)
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=self.sort_keys)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(
+            dumpb(obj, indent=indent, sort_keys=self.sort_keys) + b"\n",
+            mimetype=self.mimetype,
+        )
@@ -1,7 +1,15 @@
+import math
+import operator
 from datetime import datetime
+from functools import reduce
 
 from flask_login import UserMixin
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import DDL, Float, case, event, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
 
 db = SQLAlchemy()
 
@@ -15,6 +23,10 @@ class User(UserMixin, db.Model):
     auth_provider = db.Column(db.String(50), default="local")  # 'local', 'google'
     oauth_id = db.Column(db.String(255), nullable=True)  # For future OAuth
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Bumped on every watchlist change; the ETag of GET /api/watchlist/ids
+    watchlist_version = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
 
     # Relationship to watchlist entries
     watchlist_entries = db.relationship(
@@ -37,6 +49,34 @@ class User(UserMixin, db.Model):
         }
 
 
+class Genre(db.Model):
+    """Genre names, linked to movies through the movie_genres table."""
+
+    __tablename__ = "genres"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+
+
+# Normalized copy of Movie.genres, kept in sync on flush (see sync_movie_genres)
+movie_genres = db.Table(
+    "movie_genres",
+    db.Column(
+        "movie_id",
+        db.String(20),
+        db.ForeignKey("movies.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    db.Column(
+        "genre_id",
+        db.Integer,
+        db.ForeignKey("genres.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    db.Index("ix_movie_genres_genre_id_movie_id", "genre_id", "movie_id"),
+)
+
+
 class Movie(db.Model):
     """
     Stores movie metadata and ratings.
@@ -64,6 +104,10 @@ class Movie(db.Model):
     # Genre from IMDB
     genres = db.Column(db.JSON)  # e.g., ["Action", "Sci-Fi"]
 
+    # calculate_average_score(), stored so listings can sort and filter on it;
+    # recomputed whenever the row is flushed (Core writes use average_score())
+    average_score = db.Column(db.Float, nullable=False, default=0, server_default="0")
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     ratings_updated_at = db.Column(db.DateTime)
 
@@ -72,6 +116,13 @@ class Movie(db.Model):
         "WatchlistEntry", backref="movie", lazy="dynamic", cascade="all, delete-orphan"
     )
 
+    # ratings_updated_at serves the stale ratings refresh, average_score the
+    # min_average filter
+    __table_args__ = (
+        db.Index("ix_movies_ratings_updated_at", "ratings_updated_at"),
+        db.Index("ix_movies_average_score", "average_score"),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -88,6 +139,7 @@ class Movie(db.Model):
             "rt_popcornmeter": self.rt_popcornmeter,
             "rt_page_url": self.rt_page_url,
             "genres": self.genres,
+            "average_score": self.average_score,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "ratings_updated_at": (
                 self.ratings_updated_at.isoformat() if self.ratings_updated_at else None
@@ -96,17 +148,106 @@ class Movie(db.Model):
 
     def calculate_average_score(self):
         """Calculate average score from all available platform ratings."""
-        scores = []
-        if self.imdb_rating and self.imdb_rating > 0:
-            scores.append(self.imdb_rating)
-        if self.tmdb_rating and self.tmdb_rating > 0:
-            scores.append(self.tmdb_rating)
-        # Use tomatometer as the primary RT score for average
-        if self.rt_tomatometer and self.rt_tomatometer > 0:
-            scores.append(self.rt_tomatometer)
-        if not scores:
-            return 0
-        return round(sum(scores) / len(scores), 1)
+        return average_score(self.imdb_rating, self.tmdb_rating, self.rt_tomatometer)
+
+
+def average_score(imdb_rating=None, tmdb_rating=None, rt_tomatometer=None) -> float:
+    """
+    Average of the available platform ratings, or 0 if there are none.
+    Use tomatometer as the primary RT score for average.
+    """
+    scores = [
+        score
+        for score in (imdb_rating, tmdb_rating, rt_tomatometer)
+        if score and score > 0
+    ]
+    if not scores:
+        return 0
+    # Rounded like the client's Math.round(x * 10) / 10, which
+    # average_score_sql() reproduces exactly in SQL
+    return math.floor(sum(scores) / len(scores) * 10 + 0.5) / 10
+
+
+class _round_to_tenth(FunctionElement):
+    """floor(x * 10 + 0.5) / 10 of a non-negative x, as in average_score()."""
+
+    type = Float()
+    name = "round_to_tenth"
+    inherit_cache = True
+
+
+@compiles(_round_to_tenth)
+def _compile_round_to_tenth(element, compiler, **kw):
+    return f"FLOOR(({compiler.process(element.clauses, **kw)}) * 10 + 0.5) / 10"
+
+
+@compiles(_round_to_tenth, "sqlite")
+def _compile_round_to_tenth_sqlite(element, compiler, **kw):
+    # FLOOR() needs SQLite's optional math functions; truncating a
+    # non-negative value is the same
+    value = compiler.process(element.clauses, **kw)
+    return f"CAST(({value}) * 10 + 0.5 AS INTEGER) / 10.0"
+
+
+def average_score_sql(imdb_rating, tmdb_rating, rt_tomatometer):
+    """
+    SQL expression for average_score() of the given rating expressions, for
+    statements that set ratings without loading the row (upserts, UPDATEs).
+    """
+    ratings = (imdb_rating, tmdb_rating, rt_tomatometer)
+    total = reduce(
+        operator.add, [case((rating > 0, rating), else_=0.0) for rating in ratings]
+    )
+    count = reduce(operator.add, [case((rating > 0, 1), else_=0) for rating in ratings])
+    return case((count == 0, 0.0), else_=_round_to_tenth(total / count))
+
+
+@event.listens_for(Movie, "before_insert")
+@event.listens_for(Movie, "before_update")
+def _store_average_score(mapper, connection, movie):
+    movie.average_score = movie.calculate_average_score()
+
+
+# Indexed title search (see utils.watchlist.title_matches). SQLite keeps an
+# FTS5 shadow table in step with movies through triggers, so Core and ORM
+# writes are both covered; PostgreSQL searches movies through a pg_trgm index.
+MOVIE_TITLES_FTS = "movie_titles_fts"
+
+TITLE_SEARCH_DDL = {
+    "sqlite": [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {MOVIE_TITLES_FTS} USING fts5("
+        "movie_id UNINDEXED, title, tokenize = 'unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS movies_title_fts_insert AFTER INSERT ON movies "
+        f"BEGIN INSERT INTO {MOVIE_TITLES_FTS} (movie_id, title) "
+        "VALUES (new.id, new.title); END",
+        "CREATE TRIGGER IF NOT EXISTS movies_title_fts_update "
+        "AFTER UPDATE OF id, title ON movies "
+        "WHEN old.id IS NOT new.id OR old.title IS NOT new.title "
+        f"BEGIN DELETE FROM {MOVIE_TITLES_FTS} WHERE movie_id = old.id; "
+        f"INSERT INTO {MOVIE_TITLES_FTS} (movie_id, title) "
+        "VALUES (new.id, new.title); END",
+        "CREATE TRIGGER IF NOT EXISTS movies_title_fts_delete AFTER DELETE ON movies "
+        f"BEGIN DELETE FROM {MOVIE_TITLES_FTS} WHERE movie_id = old.id; END",
+    ],
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_movies_title_trgm "
+        "ON movies USING gin (title gin_trgm_ops)",
+    ],
+}
+
+for _dialect, _statements in TITLE_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            Movie.__table__,
+            "after_create",
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
+event.listen(
+    Movie.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {MOVIE_TITLES_FTS}").execute_if(dialect="sqlite"),
+)
 
 
 class WatchlistEntry(db.Model):
@@ -122,7 +263,14 @@ class WatchlistEntry(db.Model):
     movie_id = db.Column(db.String(20), db.ForeignKey("movies.id"), nullable=False)
     added_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    __table_args__ = (db.UniqueConstraint("user_id", "movie_id", name="uq_user_movie"),)
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "movie_id", name="uq_user_movie"),
+        # Default listing order, read straight off the index (cursor pages
+        # stop after LIMIT rows instead of sorting the whole watchlist)
+        db.Index("ix_watchlist_entries_user_id_added_at", "user_id", "added_at", "id"),
+        # Movie-side lookups: watcher counts, stale refresh, cascades
+        db.Index("ix_watchlist_entries_movie_id", "movie_id"),
+    )
 
     def to_dict(self):
         return {
@@ -132,3 +280,100 @@ class WatchlistEntry(db.Model):
             "added_at": self.added_at.isoformat() if self.added_at else None,
             "movie": self.movie.to_dict() if self.movie else None,
         }
+
+
+def dialect_insert(table, connection):
+    """INSERT supporting ON CONFLICT clauses, or None on other databases."""
+    if connection.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    if connection.dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return None
+
+
+def begin_write(connection):
+    """
+    Take the database write lock before a write transaction's first statement.
+    SQLite otherwise starts transactions deferred and can fail a concurrent
+    writer's lock upgrade at once with "database is locked"; BEGIN IMMEDIATE
+    makes it wait on the busy timeout instead. A no-op on other databases.
+    """
+    dbapi_connection = connection.connection.dbapi_connection
+    if connection.dialect.name == "sqlite" and not dbapi_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def insert_ignoring_conflicts(table, connection):
+    """INSERT that skips rows violating a unique constraint, where supported."""
+    insert = dialect_insert(table, connection)
+    if insert is None:
+        return table.insert()
+    return insert.on_conflict_do_nothing()
+
+
+def sync_movie_genres(connection, genres_by_movie: dict):
+    """
+    Replace the movie_genres rows of the given movies, creating missing genres.
+    Accepts: {movie_id: ["Action", "Sci-Fi"], ...} (None or [] clears a movie).
+    Runs on a Core connection, so bulk insert paths can call it directly.
+    """
+    if not genres_by_movie:
+        return
+
+    names_by_movie = {
+        movie_id: list(
+            dict.fromkeys(
+                name.strip()
+                for name in (genres or [])
+                if isinstance(name, str) and name.strip()
+            )
+        )
+        for movie_id, genres in genres_by_movie.items()
+    }
+    all_names = {name for names in names_by_movie.values() for name in names}
+
+    genres = Genre.__table__
+    genre_ids = {}
+    if all_names:
+        select_ids = db.select(genres.c.name, genres.c.id)
+        genre_ids = dict(
+            connection.execute(select_ids.where(genres.c.name.in_(all_names))).all()
+        )
+        missing = sorted(all_names - genre_ids.keys())
+        if missing:
+            connection.execute(
+                insert_ignoring_conflicts(genres, connection),
+                [{"name": name} for name in missing],
+            )
+            genre_ids.update(
+                connection.execute(select_ids.where(genres.c.name.in_(missing))).all()
+            )
+
+    connection.execute(
+        movie_genres.delete().where(movie_genres.c.movie_id.in_(list(names_by_movie)))
+    )
+    rows = [
+        {"movie_id": movie_id, "genre_id": genre_ids[name]}
+        for movie_id, names in names_by_movie.items()
+        for name in names
+    ]
+    if rows:
+        connection.execute(movie_genres.insert(), rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_flushed_movie_genres(session, flush_context):
+    """Keep movie_genres in step with Movie.genres for ORM writes."""
+    changed = {
+        movie.id: movie.genres
+        for movie in list(session.new) + list(session.dirty)
+        if isinstance(movie, Movie)
+        and (movie.genres or movie not in session.new)
+        and inspect(movie).attrs.genres.history.has_changes()
+    }
+    deleted = [movie.id for movie in session.deleted if isinstance(movie, Movie)]
+    if deleted:
+        session.connection().execute(
+            movie_genres.delete().where(movie_genres.c.movie_id.in_(deleted))
+        )
+    sync_movie_genres(session.connection(), changed)
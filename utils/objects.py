@@ -1,9 +1,9 @@
-import json
-
 from flask import Response as FlaskResponse
 
+from .json_provider import dumpb
+
 
 class Response(FlaskResponse):
     def __init__(self, response, status=200, mimetype="application/json", **kwargs):
-        response = json.dumps(response)
+        response = dumpb(response)
         return super().__init__(response, status=status, mimetype=mimetype, **kwargs)
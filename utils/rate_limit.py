@@ -0,0 +1,39 @@
+# Client-side rate limiting for background calls to the rating providers
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `rate` calls per second on average, with bursts of
+    up to `burst` calls. acquire() blocks until a call is allowed.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waited = 0.0
+
+    def acquire(self) -> float:
+        """Take one token, sleeping if needed; returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is the wait owed by this caller
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self._waited += wait
+
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"rate": self.rate, "burst": self.burst, "waited": self._waited}
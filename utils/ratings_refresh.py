@@ -0,0 +1,245 @@
+# Background refresh of stored movie ratings, most watchlisted movies first
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, or_
+
+from .api.exception_handler import TransientAPIError
+from .env_variables import EnvVariable
+from .helpers import RATING_PLATFORMS, refresh_rating
+from .models import Movie, WatchlistEntry, db
+from .rate_limit import RateLimiter
+from .ratings_store import mark_ratings_checked, store_ratings
+
+logger = logging.getLogger(__name__)
+
+
+def _stale_filter(max_age: timedelta):
+    cutoff = datetime.utcnow() - max_age
+    return or_(Movie.ratings_updated_at.is_(None), Movie.ratings_updated_at < cutoff)
+
+
+def find_stale_movies(max_age: timedelta, limit: int) -> list:
+    """
+    Watchlisted movies with ratings older than max_age, ordered by how many
+    watchlists contain them, then by oldest ratings first.
+    Returns: [{"id", "title", "year", "watchers"}, ...]
+    """
+    watchers = func.count(WatchlistEntry.id).label("watchers")
+    rows = (
+        db.session.query(Movie.id, Movie.title, Movie.year, watchers)
+        .join(WatchlistEntry, WatchlistEntry.movie_id == Movie.id)
+        .filter(_stale_filter(max_age))
+        .group_by(Movie.id, Movie.title, Movie.year, Movie.ratings_updated_at)
+        .order_by(watchers.desc(), Movie.ratings_updated_at.asc().nullsfirst())
+        .limit(limit)
+        .all()
+    )
+    return [
+        {"id": row.id, "title": row.title, "year": row.year, "watchers": row.watchers}
+        for row in rows
+    ]
+
+
+def count_stale_movies(max_age: timedelta) -> int:
+    """Number of watchlisted movies with ratings older than max_age."""
+    return (
+        db.session.query(func.count(func.distinct(Movie.id)))
+        .join(WatchlistEntry, WatchlistEntry.movie_id == Movie.id)
+        .filter(_stale_filter(max_age))
+        .scalar()
+    )
+
+
+class RatingsRefresher:
+    """
+    Refreshes stale Movie ratings in batches.
+    Each provider is called from its own thread through its own rate limiter,
+    so a slow provider does not hold back the others. Movies whose lookups
+    fail transiently keep their old timestamp and are retried next batch.
+    """
+
+    def __init__(
+        self,
+        max_age: float = 36000,
+        batch_size: int = 50,
+        interval: float = 300,
+        rate_limits: dict = None,
+        platforms=RATING_PLATFORMS,
+    ):
+        self.max_age = timedelta(seconds=max_age)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.platforms = tuple(platforms)
+        self.limiters = {
+            platform: RateLimiter(float(rate))
+            for platform, rate in (rate_limits or {}).items()
+        }
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._batches = 0
+        self._movies_refreshed = 0
+        self._lookups = 0
+        self._failures = 0
+        self._stale_remaining = None
+        self._last_run_at = None
+        self._last_run_seconds = None
+
+    def run_once(self) -> dict:
+        """
+        Refresh one batch of the most watched stale movies.
+        Must run inside an application context.
+        Returns: {"movies": n, "refreshed": n, "failed": n}
+        """
+        return self.refresh(find_stale_movies(self.max_age, self.batch_size))
+
+    def refresh(self, movies: list) -> dict:
+        """
+        Look up and store the ratings of the given movies
+        ([{"id", "title", "year"}, ...]), e.g. ones just imported.
+        Must run inside an application context.
+        Returns: {"movies": n, "refreshed": n, "failed": n}
+        """
+        started = time.monotonic()
+        ratings = {movie["id"]: {} for movie in movies}
+        failed = set()
+        if movies:
+            with ThreadPoolExecutor(max_workers=len(self.platforms)) as executor:
+                results = executor.map(
+                    lambda platform: self._refresh_platform(platform, movies),
+                    self.platforms,
+                )
+                for platform, (platform_ratings, platform_failed) in zip(
+                    self.platforms, results
+                ):
+                    for movie_id, data in platform_ratings.items():
+                        ratings[movie_id][platform] = data
+                    failed.update(platform_failed)
+
+        refreshed = {
+            movie_id: data
+            for movie_id, data in ratings.items()
+            if movie_id not in failed
+        }
+        store_ratings(refreshed)
+        # Movies with nothing to update still count as checked
+        mark_ratings_checked(list(refreshed))
+        stale_remaining = count_stale_movies(self.max_age)
+
+        with self._lock:
+            self._batches += 1
+            self._movies_refreshed += len(refreshed)
+            self._stale_remaining = stale_remaining
+            self._last_run_at = datetime.utcnow()
+            self._last_run_seconds = round(time.monotonic() - started, 3)
+
+        return {
+            "movies": len(movies),
+            "refreshed": len(refreshed),
+            "failed": len(failed),
+        }
+
+    def _refresh_platform(self, platform: str, movies: list):
+        ratings = {}
+        failed = set()
+        for movie in movies:
+            if self._stop.is_set():
+                failed.add(movie["id"])
+                continue
+            try:
+                ratings[movie["id"]] = refresh_rating(
+                    platform,
+                    movie["id"],
+                    movie["title"],
+                    movie["year"],
+                    rate_limiter=self.limiters.get(platform),
+                )
+            except TransientAPIError as exception:
+                logger.info(
+                    "Refresh of %s %s failed: %s", platform, movie["id"], exception
+                )
+                failed.add(movie["id"])
+                with self._lock:
+                    self._failures += 1
+            except Exception:
+                # e.g. a page that no longer parses; the rest of the batch
+                # still goes ahead
+                logger.exception("Refresh of %s %s failed", platform, movie["id"])
+                failed.add(movie["id"])
+                with self._lock:
+                    self._failures += 1
+            with self._lock:
+                self._lookups += 1
+        return ratings, failed
+
+    def run(self, app):
+        """Refresh batches until stopped, sleeping once nothing is stale."""
+        while not self._stop.is_set():
+            try:
+                with app.app_context():
+                    result = self.run_once()
+            except Exception:
+                logger.exception("Ratings refresh batch failed")
+                result = {"movies": 0}
+            # Keep going while full batches refresh cleanly
+            if result["movies"] < self.batch_size or result.get("failed"):
+                self._stop.wait(self.interval)
+
+    def start(self, app):
+        """Run the refresher in a daemon thread."""
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self.run, args=(app,), name="ratings-refresh", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        """Whether the refresher runs in a thread of this process."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self.running,
+                "batches": self._batches,
+                "movies_refreshed": self._movies_refreshed,
+                "lookups": self._lookups,
+                "failures": self._failures,
+                "stale_remaining": self._stale_remaining,
+                "last_run_at": (
+                    self._last_run_at.isoformat() if self._last_run_at else None
+                ),
+                "last_run_seconds": self._last_run_seconds,
+                "rate_limits": {
+                    platform: limiter.stats()
+                    for platform, limiter in self.limiters.items()
+                },
+            }
+
+
+def create_refresher() -> RatingsRefresher:
+    """Create a refresher configured from the environment."""
+    return RatingsRefresher(
+        max_age=EnvVariable.RATINGS_REFRESH_AGE.value,
+        batch_size=EnvVariable.RATINGS_REFRESH_BATCH_SIZE.value,
+        interval=EnvVariable.RATINGS_REFRESH_INTERVAL.value,
+        rate_limits={
+            "imdb": EnvVariable.IMDB_RATE_LIMIT.value,
+            "tmdb": EnvVariable.TMDB_RATE_LIMIT.value,
+            "rt": EnvVariable.RT_RATE_LIMIT.value,
+        },
+    )
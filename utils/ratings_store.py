@@ -0,0 +1,238 @@
+# Persisted Movie rows used as a read-through tier in front of rating lookups
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Float, bindparam
+from sqlalchemy.exc import SQLAlchemyError
+
+from .cache.base import CacheEntry
+from .env_variables import EnvVariable
+from .models import Movie, average_score_sql, db
+
+logger = logging.getLogger(__name__)
+
+# Ratings refreshed more recently than this are served from the Movie row
+RATINGS_MAX_AGE = timedelta(seconds=EnvVariable.RATINGS_MAX_AGE.value)
+
+# Movie column for each field of a platform's rating lookup result
+PLATFORM_COLUMNS = {
+    "imdb": {"rating": "imdb_rating", "page_url": "imdb_page_url"},
+    "tmdb": {
+        "rating": "tmdb_rating",
+        "page_url": "tmdb_page_url",
+        "backdrop_url": "backdrop_url",
+        "backdrop_url_hd": "backdrop_url_hd",
+    },
+    "rt": {
+        "tomatometer": "rt_tomatometer",
+        "popcornmeter": "rt_popcornmeter",
+        "page_url": "rt_page_url",
+    },
+}
+
+# Fields that hold scores; the others are URLs
+SCORE_FIELDS = ("rating", "tomatometer", "popcornmeter")
+
+# Platforms looked up by the title and year the caller gives, not the id
+TITLE_PLATFORMS = ("tmdb", "rt")
+
+
+def _rating_from_movie(movie: Movie, platform: str) -> dict:
+    """Build a platform's rating result from a Movie row, or None if unrated."""
+    data = {}
+    for field, column in PLATFORM_COLUMNS[platform].items():
+        value = getattr(movie, column)
+        data[field] = value if value is not None or field in SCORE_FIELDS else ""
+    if platform == "rt":
+        data["rating"] = data["tomatometer"]
+
+    if all(data.get(field) is None for field in SCORE_FIELDS):
+        return None
+    return data
+
+
+def get_stored_ratings(movie_ids: list, platforms: list) -> dict:
+    """
+    Get ratings from Movie rows refreshed within RATINGS_MAX_AGE.
+    Returns: {movie_id: {platform: rating_data}} for the ratings available.
+    """
+    if not movie_ids:
+        return {}
+
+    fresh_after = datetime.utcnow() - RATINGS_MAX_AGE
+    movies = Movie.query.filter(
+        Movie.id.in_(movie_ids), Movie.ratings_updated_at >= fresh_after
+    ).all()
+
+    stored = {}
+    for movie in movies:
+        for platform in platforms:
+            data = _rating_from_movie(movie, platform)
+            if data is not None:
+                stored.setdefault(movie.id, {})[platform] = data
+    return stored
+
+
+def get_stored_rating(movie_id: str, platform: str):
+    """
+    Get one platform's rating from a Movie row refreshed within RATINGS_MAX_AGE,
+    as a CacheEntry stored at ratings_updated_at with that max age, or None.
+    """
+    movie = Movie.query.filter(
+        Movie.id == movie_id,
+        Movie.ratings_updated_at >= datetime.utcnow() - RATINGS_MAX_AGE,
+    ).first()
+    data = _rating_from_movie(movie, platform) if movie is not None else None
+    if data is None:
+        return None
+    return CacheEntry(
+        data,
+        stored_at=movie.ratings_updated_at.replace(tzinfo=timezone.utc).timestamp(),
+        ttl=RATINGS_MAX_AGE.total_seconds(),
+    )
+
+
+def storable_ratings(ratings: dict, movies: list) -> dict:
+    """
+    The ratings that may be written back for lookups of movies, as given by
+    the caller ([{"id", "title", "year"}, ...]). TMDb and RT results are
+    kept only when the title (and the year, when both are known) are those
+    of the stored Movie row, so a lookup under another film's title never
+    replaces this one's scores. IMDb results are looked up by id and kept.
+    """
+    requested = {movie["id"]: movie for movie in movies}
+    rows = {
+        movie.id: movie
+        for movie in Movie.query.filter(Movie.id.in_(list(ratings))).with_entities(
+            Movie.id, Movie.title, Movie.year
+        )
+    }
+
+    def same_movie(movie_id):
+        row = rows.get(movie_id)
+        movie = requested.get(movie_id)
+        if row is None or movie is None or not row.title:
+            return False
+        title = movie.get("title")
+        if not isinstance(title, str):
+            return False
+        year = movie.get("year")
+        return title.strip().casefold() == row.title.strip().casefold() and (
+            year is None or row.year is None or year == row.year
+        )
+
+    return {
+        movie_id: {
+            platform: data
+            for platform, data in platform_ratings.items()
+            if platform not in TITLE_PLATFORMS or same_movie(movie_id)
+        }
+        for movie_id, platform_ratings in ratings.items()
+    }
+
+
+def store_ratings(ratings: dict):
+    """
+    Write looked-up ratings back to existing Movie rows.
+    Accepts: {movie_id: {platform: rating_data}}; results without a score
+    (misses, provider outages) are skipped so they never replace a rating.
+    ratings_updated_at is one timestamp for every platform, so it is only
+    bumped for movies looked up on all of them; other writes leave the row
+    as stale as it was.
+    """
+    complete = {
+        movie_id
+        for movie_id, platform_ratings in ratings.items()
+        if set(PLATFORM_COLUMNS) <= set(platform_ratings)
+    }
+    updates = {
+        movie_id: {
+            platform: data
+            for platform, data in platform_ratings.items()
+            if data and any(data.get(field) is not None for field in SCORE_FIELDS)
+        }
+        for movie_id, platform_ratings in ratings.items()
+    }
+    updates = {movie_id: data for movie_id, data in updates.items() if data}
+    if not updates:
+        return
+
+    # One UPDATE (executemany) per set of columns written (and whether the
+    # timestamp is), without loading the rows; average_score is recomputed
+    # in the same statement
+    by_columns = {}
+    for movie_id, platform_ratings in updates.items():
+        values = {
+            column: data[field]
+            for platform, data in platform_ratings.items()
+            for field, column in PLATFORM_COLUMNS[platform].items()
+            if data.get(field) is not None and data.get(field) != ""
+        }
+        key = (tuple(sorted(values)), movie_id in complete)
+        by_columns.setdefault(key, []).append(
+            {"movie_id": movie_id, **{f"new_{c}": v for c, v in values.items()}}
+        )
+
+    movies = Movie.__table__
+    try:
+        for (columns, refreshed), rows in by_columns.items():
+            ratings_after = [
+                (
+                    bindparam(f"new_{column}", type_=Float)
+                    if column in columns
+                    else movies.c[column]
+                )
+                for column in ("imdb_rating", "tmdb_rating", "rt_tomatometer")
+            ]
+            db.session.execute(
+                movies.update()
+                .where(movies.c.id == bindparam("movie_id"))
+                .values(
+                    **{column: bindparam(f"new_{column}") for column in columns},
+                    **({"ratings_updated_at": datetime.utcnow()} if refreshed else {}),
+                    average_score=average_score_sql(*ratings_after),
+                ),
+                rows,
+            )
+        db.session.commit()
+    except SQLAlchemyError as exception:
+        db.session.rollback()
+        logger.warning("Could not store ratings: %s", exception)
+
+
+def get_stored_genres(movie_id: str) -> dict:
+    """Get genres from the Movie row, or None if the movie has none stored."""
+    movie = Movie.query.get(movie_id)
+    if movie is None or not movie.genres:
+        return None
+    return {"genres": movie.genres}
+
+
+def store_genres(movie_id: str, genres: list):
+    """Write looked-up genres back to an existing Movie row."""
+    if not genres:
+        return
+
+    try:
+        movie = Movie.query.get(movie_id)
+        if movie is not None and movie.genres != genres:
+            movie.genres = genres
+            db.session.commit()
+    except SQLAlchemyError as exception:
+        db.session.rollback()
+        logger.warning("Could not store genres: %s", exception)
+
+
+def mark_ratings_checked(movie_ids: list):
+    """Bump ratings_updated_at for movies looked up without any new score."""
+    if not movie_ids:
+        return
+
+    try:
+        Movie.query.filter(Movie.id.in_(movie_ids)).update(
+            {Movie.ratings_updated_at: datetime.utcnow()}, synchronize_session=False
+        )
+        db.session.commit()
+    except SQLAlchemyError as exception:
+        db.session.rollback()
+        logger.warning("Could not update ratings timestamps: %s", exception)
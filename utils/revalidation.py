@@ -0,0 +1,62 @@
+# Bounded background refreshes for stale-while-revalidate cache reads
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class Revalidator:
+    """
+    Runs cache refreshes in a small background pool.
+    Each key is refreshed at most once at a time, and new refreshes are
+    dropped (the stale value keeps being served) once max_pending are queued.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 100):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._executor = None
+        self._scheduled = 0
+        self._dropped = 0
+        self._failed = 0
+
+    def submit(self, key, fn, *args) -> bool:
+        """Schedule fn(*args) to refresh key; returns False if not scheduled."""
+        with self._lock:
+            if key in self._pending:
+                return False
+            if len(self._pending) >= self.max_pending:
+                self._dropped += 1
+                return False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="revalidate"
+                )
+            self._pending.add(key)
+            self._scheduled += 1
+
+        self._executor.submit(self._run, key, fn, args)
+        return True
+
+    def _run(self, key, fn, args):
+        try:
+            fn(*args)
+        except Exception:
+            logger.exception("Background refresh failed for %s", key)
+            with self._lock:
+                self._failed += 1
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "scheduled": self._scheduled,
+                "dropped": self._dropped,
+                "failed": self._failed,
+            }
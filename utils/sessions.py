@@ -0,0 +1,17 @@
+# Cookie sessions that keep public responses shareable between users
+from flask.sessions import SecureCookieSessionInterface
+
+
+class PublicResponseSessionInterface(SecureCookieSessionInterface):
+    """
+    Flask's signed cookie sessions, except that public responses do not get
+    Vary: Cookie. Flask-Login reads the session on every response to manage
+    its remember cookie, which would otherwise make shared caches keep one
+    copy of an anonymous rating per visitor. Responses that set a cookie
+    still vary on it.
+    """
+
+    def save_session(self, app, session, response):
+        super().save_session(app, session, response)
+        if response.cache_control.public and "Set-Cookie" not in response.headers:
+            response.vary.discard("Cookie")
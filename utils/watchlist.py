@@ -0,0 +1,321 @@
+# Watchlist listing queries: filters, sorting and keyset (cursor) pagination
+import base64
+import binascii
+import json
+import re
+from datetime import datetime
+
+from sqlalchemy import (
+    Float,
+    and_,
+    column,
+    exists,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+)
+
+from .models import MOVIE_TITLES_FTS, Genre, Movie, WatchlistEntry, db, movie_genres
+
+# Sortable columns by sort_by name
+SORT_COLUMNS = {
+    "imdb": Movie.imdb_rating,
+    "rt_tomatometer": Movie.rt_tomatometer,
+    "rt_popcornmeter": Movie.rt_popcornmeter,
+    "added_at": WatchlistEntry.added_at,
+    "year": Movie.year,
+    "title": Movie.title,
+    "average_score": Movie.average_score,
+}
+
+DEFAULT_SORT = "added_at"
+
+# Listed fields by name: those of Movie.to_dict() plus the entry's added_at
+WATCHLIST_FIELDS = {
+    "id": Movie.id,
+    "title": Movie.title,
+    "year": Movie.year,
+    "logo_url": Movie.logo_url,
+    "backdrop_url": Movie.backdrop_url,
+    "backdrop_url_hd": Movie.backdrop_url_hd,
+    "imdb_rating": Movie.imdb_rating,
+    "imdb_page_url": Movie.imdb_page_url,
+    "tmdb_rating": Movie.tmdb_rating,
+    "tmdb_page_url": Movie.tmdb_page_url,
+    "rt_tomatometer": Movie.rt_tomatometer,
+    "rt_popcornmeter": Movie.rt_popcornmeter,
+    "rt_page_url": Movie.rt_page_url,
+    "genres": Movie.genres,
+    "average_score": Movie.average_score,
+    "created_at": Movie.created_at,
+    "ratings_updated_at": Movie.ratings_updated_at,
+    "added_at": WatchlistEntry.added_at,
+}
+
+# Search relevance (higher is better) of the title_matches subquery, which
+# build_watchlist_query joins when searching
+RELEVANCE_SORT = "relevance"
+RELEVANCE = literal_column("title_matches.relevance", Float)
+
+
+class InvalidCursor(ValueError):
+    """Cursor is malformed or was issued for a different sort."""
+
+
+class InvalidFields(ValueError):
+    """Fields name something a watchlist listing does not have."""
+
+
+def build_watchlist_query(
+    user_id: int,
+    genre: str = None,
+    year_start: int = None,
+    year_end: int = None,
+    min_rating: float = None,
+    search: str = None,
+    min_average: float = None,
+    columns: list = None,
+):
+    """
+    Query (WatchlistEntry, Movie) rows of a user's watchlist, filtered.
+    Given columns, a Core select() of just those columns instead, whose rows
+    skip building ORM objects (see listing_columns()).
+    """
+    # Base query: join WatchlistEntry with Movie for the user
+    if columns is None:
+        query = db.session.query(WatchlistEntry, Movie)
+    else:
+        query = select(*columns).select_from(WatchlistEntry)
+    query = query.join(Movie, WatchlistEntry.movie_id == Movie.id).filter(
+        WatchlistEntry.user_id == user_id
+    )
+
+    # Apply filters
+    if genre:
+        # Indexed lookup through movie_genres instead of scanning the JSON
+        genre_id = select(Genre.id).where(Genre.name == genre).scalar_subquery()
+        query = query.filter(
+            exists().where(
+                movie_genres.c.movie_id == Movie.id,
+                movie_genres.c.genre_id == genre_id,
+            )
+        )
+
+    if year_start:
+        query = query.filter(Movie.year >= year_start)
+
+    if year_end:
+        query = query.filter(Movie.year <= year_end)
+
+    if min_rating:
+        query = query.filter(Movie.imdb_rating >= min_rating)
+
+    if min_average:
+        query = query.filter(Movie.average_score >= min_average)
+
+    if search:
+        matches = title_matches(search)
+        query = query.join(matches, matches.c.movie_id == Movie.id)
+
+    return query
+
+
+def title_matches(search: str):
+    """
+    Subquery of (movie_id, relevance) for movies whose title contains every
+    word of search as a word prefix, e.g. "matr rel" finds "The Matrix
+    Reloaded". Uses the FTS5 table on SQLite and the pg_trgm index on
+    PostgreSQL; other databases (or searches without words) fall back to
+    a LIKE scan.
+    """
+    words = re.findall(r"\w+", search)
+    dialect = db.session.get_bind().dialect.name
+
+    if words and dialect == "sqlite":
+        fts = table(MOVIE_TITLES_FTS, column("movie_id"))
+        match = " ".join(f'"{word}"*' for word in words)
+        matches = select(
+            fts.c.movie_id.label("movie_id"),
+            # FTS5 rank is bm25(), where lower is better
+            (-literal_column("rank", Float)).label("relevance"),
+        ).where(literal_column(MOVIE_TITLES_FTS).op("MATCH")(match))
+    elif words and dialect == "postgresql":
+        matches = select(
+            Movie.id.label("movie_id"),
+            func.word_similarity(search, Movie.title).label("relevance"),
+        ).where(*(Movie.title.op("~*")(rf"\m{re.escape(word)}") for word in words))
+    else:
+        matches = select(
+            Movie.id.label("movie_id"), literal(0.0, Float).label("relevance")
+        ).where(Movie.title.ilike(f"%{search}%"))
+
+    return matches.subquery("title_matches")
+
+
+def watchlist_genres(user_id: int) -> list:
+    """Sorted names of the genres found in a user's watchlist."""
+    rows = (
+        db.session.query(Genre.name)
+        .join(movie_genres, movie_genres.c.genre_id == Genre.id)
+        .join(WatchlistEntry, WatchlistEntry.movie_id == movie_genres.c.movie_id)
+        .filter(WatchlistEntry.user_id == user_id)
+        .distinct()
+        .order_by(Genre.name)
+        .all()
+    )
+    return [name for (name,) in rows]
+
+
+def watchlist_ids(user_id: int) -> list:
+    """Ids of the movies in a user's watchlist, read off the entries index."""
+    rows = (
+        db.session.query(WatchlistEntry.movie_id)
+        .filter(WatchlistEntry.user_id == user_id)
+        .all()
+    )
+    return [movie_id for (movie_id,) in rows]
+
+
+def parse_fields(fields: str = None) -> list:
+    """
+    Names in a comma separated fields param, in WATCHLIST_FIELDS order and
+    always with "id"; every field when fields is empty.
+    Raises InvalidFields for names that are not in WATCHLIST_FIELDS.
+    """
+    requested = {name.strip() for name in (fields or "").split(",")} - {""}
+    if not requested:
+        return list(WATCHLIST_FIELDS)
+    unknown = requested - WATCHLIST_FIELDS.keys()
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return [name for name in WATCHLIST_FIELDS if name in requested]
+
+
+def listing_columns(fields: list, sort_by: str) -> list:
+    """
+    Columns selecting fields, followed by the entry_id and sort_value
+    columns that cursors are built from.
+    """
+    columns = [WATCHLIST_FIELDS[name].label(name) for name in fields]
+    columns.append(WatchlistEntry.id.label("entry_id"))
+    if sort_by in SORT_COLUMNS:
+        columns.append(SORT_COLUMNS[sort_by].label("sort_value"))
+    return columns
+
+
+def normalize_sort(sort_by: str, sort_order: str, search: str = None):
+    """
+    Map request sort params to a known sort_by name and "asc"/"desc".
+    Searches sort by relevance unless another sort is asked for.
+    """
+    if search and sort_by in (None, RELEVANCE_SORT):
+        sort_by = RELEVANCE_SORT
+    elif sort_by not in SORT_COLUMNS:
+        sort_by = DEFAULT_SORT
+    return sort_by, "asc" if sort_order == "asc" else "desc"
+
+
+def apply_sort(query, sort_by: str, sort_order: str):
+    """
+    Order by the sort column, then by entry id so ties have a stable order.
+    Missing values sort last ascending and first descending, i.e. NULL
+    ranks above every value.
+    """
+    if sort_by == RELEVANCE_SORT:
+        column = RELEVANCE
+    else:
+        column = SORT_COLUMNS[sort_by]
+    if sort_order == "asc":
+        return query.order_by(column.asc().nullslast(), WatchlistEntry.id.asc())
+    return query.order_by(column.desc().nullsfirst(), WatchlistEntry.id.desc())
+
+
+def apply_cursor(query, sort_by: str, sort_order: str, value, entry_id: int):
+    """Keep only rows after (value, entry_id) in apply_sort order."""
+    column = SORT_COLUMNS[sort_by]
+    if sort_order == "asc":
+        id_after = WatchlistEntry.id > entry_id
+        if value is None:
+            return query.filter(column.is_(None), id_after)
+        return query.filter(
+            or_(column > value, and_(column == value, id_after), column.is_(None))
+        )
+
+    id_after = WatchlistEntry.id < entry_id
+    if value is None:
+        return query.filter(or_(and_(column.is_(None), id_after), column.isnot(None)))
+    return query.filter(or_(column < value, and_(column == value, id_after)))
+
+
+def with_window_total(query):
+    """
+    Add a "total" column counting every row matched before LIMIT/OFFSET,
+    so a page and its total come back from a single statement.
+    """
+    return query.add_columns(func.count().over().label("total"))
+
+
+def count_rows(query) -> int:
+    """Number of rows a Core select() matches."""
+    return db.session.scalar(select(func.count()).select_from(query.subquery()))
+
+
+def encode_cursor(
+    sort_by: str, sort_order: str, value, entry_id: int, total: int = None
+) -> str:
+    """Opaque cursor pointing just after a row, carrying the listing total."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps(
+        [sort_by, sort_order, value, entry_id, total], separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str):
+    """
+    Decode a cursor issued for the same sort.
+    Returns: (value, entry_id, total); raises InvalidCursor otherwise.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, value, entry_id, total = json.loads(
+            base64.urlsafe_b64decode(padded)
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exception:
+        raise InvalidCursor("Invalid cursor") from exception
+
+    if (cursor_sort, cursor_order) != (sort_by, sort_order):
+        raise InvalidCursor("Cursor does not match sort_by and sort_order")
+    if sort_by not in SORT_COLUMNS:
+        raise InvalidCursor(f"Cursors are not supported when sorting by {sort_by}")
+    if not _is_int(entry_id) or not (total is None or _is_int(total)):
+        raise InvalidCursor("Invalid cursor")
+    return _cursor_value(sort_by, value), entry_id, total
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _cursor_value(sort_by: str, value):
+    """A cursor's sort value, checked against the sort column's type."""
+    if value is None:
+        return None
+    python_type = SORT_COLUMNS[sort_by].type.python_type
+    if python_type is datetime and isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError as exception:
+            raise InvalidCursor("Invalid cursor") from exception
+    if python_type is float and _is_int(value):
+        return float(value)
+    if python_type is int and _is_int(value):
+        return value
+    if python_type in (float, str) and type(value) is python_type:
+        return value
+    raise InvalidCursor("Invalid cursor")
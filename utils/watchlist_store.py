@@ -0,0 +1,333 @@
+# Watchlist writes: upserts, set-based inserts and removals of watchlist entries
+from datetime import datetime
+
+from sqlalchemy import Float, literal
+
+from .models import (
+    Movie,
+    User,
+    WatchlistEntry,
+    average_score,
+    average_score_sql,
+    begin_write,
+    db,
+    dialect_insert,
+    insert_ignoring_conflicts,
+    sync_movie_genres,
+)
+
+# Movie fields accepted from request bodies (the id comes from "movie_id")
+MOVIE_FIELDS = (
+    "title",
+    "year",
+    "logo_url",
+    "backdrop_url",
+    "backdrop_url_hd",
+    "imdb_rating",
+    "imdb_page_url",
+    "tmdb_rating",
+    "tmdb_page_url",
+    "rt_tomatometer",
+    "rt_popcornmeter",
+    "rt_page_url",
+    "genres",
+)
+
+# Fields an add overwrites on a stored movie: scores when not None, the
+# rest when not empty. Title, year and poster are kept as first stored.
+UPDATED_SCORE_FIELDS = (
+    "imdb_rating",
+    "tmdb_rating",
+    "rt_tomatometer",
+    "rt_popcornmeter",
+)
+UPDATED_FIELDS = (
+    "imdb_page_url",
+    "tmdb_page_url",
+    "rt_page_url",
+    "backdrop_url",
+    "backdrop_url_hd",
+    "genres",
+)
+
+# Ids per IN (...) lookup, well below SQLite's bound parameter limit
+LOOKUP_CHUNK_SIZE = 1000
+
+ALREADY_LISTED = "Movie already in watchlist"
+TITLE_REQUIRED = "title is required"
+
+
+def _has_scores(data: dict) -> bool:
+    """Whether a request body carries any score (and so dates the ratings)."""
+    return any(data.get(field) is not None for field in UPDATED_SCORE_FIELDS)
+
+
+def movie_values(movie_id: str, data: dict) -> dict:
+    """
+    Column values for a new movies row from a request body. Movies added
+    without scores get no ratings timestamp, so the ratings refresh looks
+    them up.
+    """
+    values = {field: data.get(field) for field in MOVIE_FIELDS}
+    values["id"] = movie_id
+    values["ratings_updated_at"] = datetime.utcnow() if _has_scores(data) else None
+    values["average_score"] = average_score(
+        values["imdb_rating"], values["tmdb_rating"], values["rt_tomatometer"]
+    )
+    return values
+
+
+def movie_updates(data: dict) -> dict:
+    """
+    Column values an add sets on a stored movie, from a request body. The
+    ratings timestamp only moves when scores are given: an add without them
+    leaves stale ratings stale.
+    """
+    updates = {
+        field: data[field]
+        for field in UPDATED_SCORE_FIELDS
+        if data.get(field) is not None
+    }
+    updates.update({field: data[field] for field in UPDATED_FIELDS if data.get(field)})
+    if _has_scores(data):
+        updates["ratings_updated_at"] = datetime.utcnow()
+    return updates
+
+
+def _average_after(updates: dict, source):
+    """average_score_sql() of the ratings as they are once updates apply."""
+    return average_score_sql(
+        *(
+            source[field] if field in updates else getattr(Movie, field)
+            for field in ("imdb_rating", "tmdb_rating", "rt_tomatometer")
+        )
+    )
+
+
+def bump_watchlist_version(connection, user_id: int):
+    """Mark a user's watchlist as changed, in the caller's transaction."""
+    users = User.__table__
+    connection.execute(
+        users.update()
+        .where(users.c.id == user_id)
+        .values(watchlist_version=users.c.watchlist_version + 1)
+    )
+
+
+def add_movie_to_watchlist(user_id: int, movie_id: str, data: dict):
+    """
+    Add a movie to a user's watchlist, storing or updating the movie, in two
+    statements: an upsert of the movie (a plain UPDATE when no title is given
+    to create it with) and an INSERT ... ON CONFLICT DO NOTHING of the entry,
+    plus the genre links when genres are given and the watchlist version bump.
+    Concurrent adds of the same movie never conflict.
+    Returns (movie_dict, error_message); nothing is written on error.
+    """
+    connection = db.session.connection()
+    if dialect_insert(Movie.__table__, connection) is None:
+        return _add_movie_with_orm(user_id, movie_id, data)
+
+    begin_write(connection)
+    movies = Movie.__table__
+    entries = WatchlistEntry.__table__
+    updates = movie_updates(data)
+
+    if data.get("title"):
+        insert = dialect_insert(movies, connection).values(movie_values(movie_id, data))
+        statement = insert.on_conflict_do_update(
+            index_elements=[movies.c.id],
+            set_={
+                **{field: insert.excluded[field] for field in updates},
+                "average_score": _average_after(updates, insert.excluded),
+            },
+        )
+    else:
+        values = {
+            field: literal(updates[field], Float)
+            for field in UPDATED_SCORE_FIELDS
+            if field in updates
+        }
+        statement = (
+            movies.update()
+            .where(movies.c.id == movie_id)
+            .values(**updates, average_score=_average_after(updates, values))
+        )
+    movie = connection.execute(statement.returning(*movies.c)).one_or_none()
+    if movie is None:
+        db.session.rollback()
+        return None, TITLE_REQUIRED
+
+    entry = connection.execute(
+        insert_ignoring_conflicts(entries, connection)
+        .values(user_id=user_id, movie_id=movie_id)
+        .returning(entries.c.added_at)
+    ).one_or_none()
+    if entry is None:
+        db.session.rollback()
+        return None, ALREADY_LISTED
+
+    if data.get("genres"):
+        sync_movie_genres(connection, {movie_id: movie.genres})
+    bump_watchlist_version(connection, user_id)
+    db.session.commit()
+
+    movie_dict = Movie(**movie._mapping).to_dict()
+    movie_dict["added_at"] = entry.added_at.isoformat()
+    return movie_dict, None
+
+
+def _add_movie_with_orm(user_id: int, movie_id: str, data: dict):
+    """
+    add_movie_to_watchlist() on databases without ON CONFLICT clauses: look
+    the entry and movie up, then write through the ORM. Concurrent adds of
+    the same new movie can fail there with IntegrityError.
+    """
+    if WatchlistEntry.query.filter_by(user_id=user_id, movie_id=movie_id).first():
+        db.session.rollback()
+        return None, ALREADY_LISTED
+
+    movie = db.session.get(Movie, movie_id)
+    if movie is None:
+        if not data.get("title"):
+            db.session.rollback()
+            return None, TITLE_REQUIRED
+        movie = Movie(**movie_values(movie_id, data))
+        db.session.add(movie)
+    else:
+        for field, value in movie_updates(data).items():
+            setattr(movie, field, value)
+
+    entry = WatchlistEntry(user_id=user_id, movie_id=movie_id)
+    db.session.add(entry)
+    db.session.flush()
+    bump_watchlist_version(db.session.connection(), user_id)
+    db.session.commit()
+
+    movie_dict = movie.to_dict()
+    movie_dict["added_at"] = entry.added_at.isoformat()
+    return movie_dict, None
+
+
+def _chunks(items: list, size: int = LOOKUP_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def add_movies_to_watchlist(
+    user_id: int, movies_data: list, refresh_ratings: bool = False
+) -> dict:
+    """
+    Add many movies to a user's watchlist in a constant number of statements:
+    one IN lookup each for existing entries and movies, then one bulk insert
+    each for new movies and new entries (per LOOKUP_CHUNK_SIZE ids).
+    Movies already stored are linked as they are; new ones need a title.
+    With refresh_ratings, new movies are stored without a ratings timestamp,
+    so the background ratings refresh looks them up first.
+    Returns: {"added": [movie_id, ...], "skipped": [...], "errors": [...],
+    "created": [ids of the movies stored by this call]}
+    """
+    errors = []
+    requested = {}
+    skipped = []
+    for movie_data in movies_data:
+        movie_id = movie_data.get("movie_id") if isinstance(movie_data, dict) else None
+        if not movie_id:
+            errors.append({"movie_id": None, "error": "movie_id is required"})
+        elif movie_id in requested:
+            skipped.append(movie_id)
+        else:
+            requested[movie_id] = movie_data
+
+    connection = db.session.connection()
+    begin_write(connection)
+    entries = WatchlistEntry.__table__
+    movies = Movie.__table__
+
+    listed = set()
+    stored = set()
+    for ids in _chunks(list(requested)):
+        listed.update(
+            connection.execute(
+                db.select(entries.c.movie_id).where(
+                    entries.c.user_id == user_id, entries.c.movie_id.in_(ids)
+                )
+            ).scalars()
+        )
+        stored.update(
+            connection.execute(
+                db.select(movies.c.id).where(movies.c.id.in_(ids))
+            ).scalars()
+        )
+
+    to_add = []
+    new_movies = []
+    for movie_id, movie_data in requested.items():
+        if movie_id in listed:
+            skipped.append(movie_id)
+        elif movie_id in stored:
+            to_add.append(movie_id)
+        elif not movie_data.get("title"):
+            errors.append({"movie_id": movie_id, "error": "title is required"})
+        else:
+            values = movie_values(movie_id, movie_data)
+            if refresh_ratings:
+                values["ratings_updated_at"] = None
+            new_movies.append(values)
+            to_add.append(movie_id)
+
+    # Rows inserted concurrently by another request are left as they are
+    inserted = set()
+    if new_movies:
+        inserted = set(
+            connection.execute(
+                insert_ignoring_conflicts(movies, connection).returning(movies.c.id),
+                new_movies,
+            ).scalars()
+        )
+        sync_movie_genres(
+            connection,
+            {
+                row["id"]: row["genres"]
+                for row in new_movies
+                if row["id"] in inserted and row["genres"]
+            },
+        )
+
+    added = set()
+    if to_add:
+        added = set(
+            connection.execute(
+                insert_ignoring_conflicts(entries, connection).returning(
+                    entries.c.movie_id
+                ),
+                [{"user_id": user_id, "movie_id": movie_id} for movie_id in to_add],
+            ).scalars()
+        )
+    if added:
+        bump_watchlist_version(connection, user_id)
+    db.session.commit()
+
+    # Entries another request added first count as skipped
+    skipped += [movie_id for movie_id in to_add if movie_id not in added]
+    return {
+        "added": [movie_id for movie_id in to_add if movie_id in added],
+        "skipped": skipped,
+        "errors": errors,
+        "created": [movie_id for movie_id in to_add if movie_id in inserted],
+    }
+
+
+def remove_movie_from_watchlist(user_id: int, movie_id: str) -> bool:
+    """Remove a movie from a user's watchlist. Returns False if it was not there."""
+    connection = db.session.connection()
+    begin_write(connection)
+    entries = WatchlistEntry.__table__
+    removed = connection.execute(
+        entries.delete().where(
+            entries.c.user_id == user_id, entries.c.movie_id == movie_id
+        )
+    ).rowcount
+    if removed:
+        bump_watchlist_version(connection, user_id)
+    db.session.commit()
+    return bool(removed)